@@ -42,6 +42,31 @@ TEMP_DIR = Path("/tmp/excelsior")
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
 ALLOWED_EXTENSIONS = {'.csv', '.xlsx', '.xls', '.sav', '.txt'}
 
+# Directorio para los archivos de trabajo de las normalizaciones. Por defecto
+# el temporal del sistema; puede apuntarse a un tmpfs (p. ej. /dev/shm) para
+# evitar escrituras a disco, siempre que tenga espacio para los archivos
+PROC_TMPDIR = os.getenv("PROC_TMPDIR") or None
+
+# Nivel de compresión (1-9) de los CSV y TXT dentro de los ZIP de respuesta.
+# Vacío: se guardan sin comprimir y el ZIP solo agrupa los archivos
+def _leer_nivel_compresion_zip(valor: str):
+    """Valida ZIP_COMPRESSLEVEL al iniciar para no fallar en medio de una respuesta."""
+    if not valor:
+        return None
+    try:
+        nivel = int(valor)
+    except ValueError:
+        nivel = None
+    if nivel is None or not 1 <= nivel <= 9:
+        raise ValueError(f"ZIP_COMPRESSLEVEL debe ser un entero entre 1 y 9, se recibió {valor!r}")
+    return nivel
+
+ZIP_COMPRESSLEVEL = _leer_nivel_compresion_zip(os.getenv("ZIP_COMPRESSLEVEL"))
+
+# Tamaño máximo (bytes) de los archivos a normalizar. Vacío: sin límite
+_normalizacion_max_env = os.getenv("NORMALIZACION_MAX_FILE_SIZE")
+NORMALIZACION_MAX_FILE_SIZE = int(_normalizacion_max_env) if _normalizacion_max_env else None
+
 # Configuración de logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -212,6 +212,7 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Evento ejecutado al cerrar la aplicación."""
+    conversion.cerrar_pool_procesos()
     logger.info(
         f"Cerrando {APP_NAME}",
         extra={
@@ -4,9 +4,12 @@ Sigue principios SOLID y es fácil de entender y mantener.
 """
 
 import csv
+import io
+import itertools
 import os
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from contextlib import ExitStack, contextmanager
+from typing import Dict, List, Optional, Tuple, Any, BinaryIO, Iterable, Iterator
+from dataclasses import asdict, dataclass
 import logging
 from abc import ABC, abstractmethod
 
@@ -154,11 +157,16 @@ class CSVProcessor:
         """
         self.reference_headers = [h.upper().strip() for h in reference_headers]
         self.type_mapping = type_mapping
+        # Tipo esperado por columna; ante columnas repetidas gana el primer tipo del mapeo
+        self._column_types: Dict[str, str] = {}
+        for type_name, columns in type_mapping.items():
+            for column in columns:
+                self._column_types.setdefault(column, type_name)
         self.validators = validators or self._create_default_validators()
         self.delimiter = delimiter
         self.encoding = encoding
         
-        logger.info(f"CSVProcessor inicializado con {len(reference_headers)} headers de referencia")
+        logger.debug("CSVProcessor inicializado con %d headers de referencia", len(reference_headers))
     
     def _create_default_validators(self) -> Dict[str, DataValidator]:
         """Crea validadores por defecto."""
@@ -174,19 +182,25 @@ class CSVProcessor:
         """Detecta automáticamente el delimitador del archivo."""
         try:
             with open(file_path, 'r', encoding=self.encoding) as f:
-                first_line = f.readline().strip()
-            
-            delimiters = [',', ';', '|', '\t']
-            counts = {delim: first_line.count(delim) for delim in delimiters}
-            
-            detected = max(counts, key=counts.get)
-            if counts[detected] > 0:
-                logger.info(f"Delimitador detectado: '{detected}'")
-                return detected
+                return self._detect_delimiter_from_line(f.readline())
         except Exception as e:
-            logger.warning(f"Error detectando delimitador: {e}")
+            logger.warning("Error detectando delimitador: %s", e)
         
-        logger.info(f"Usando delimitador por defecto: '{DEFAULT_DELIMITER}'")
+        logger.debug("Usando delimitador por defecto: '%s'", DEFAULT_DELIMITER)
+        return DEFAULT_DELIMITER
+    
+    def _detect_delimiter_from_line(self, first_line: str) -> str:
+        """Detecta el delimitador a partir de la primera línea del archivo."""
+        first_line = first_line.strip()
+        delimiters = [',', ';', '|', '\t']
+        counts = {delim: first_line.count(delim) for delim in delimiters}
+        
+        detected = max(counts, key=counts.get)
+        if counts[detected] > 0:
+            logger.debug("Delimitador detectado: '%s'", detected)
+            return detected
+        
+        logger.debug("Usando delimitador por defecto: '%s'", DEFAULT_DELIMITER)
         return DEFAULT_DELIMITER
     
     def normalize_column_name(self, column_name: str) -> str:
@@ -242,23 +256,51 @@ class CSVProcessor:
     
     def read_csv(self, file_path: str) -> Tuple[List[str], List[List[str]]]:
         """Lee el archivo CSV y retorna headers y filas."""
+        with self._open_file(file_path) as (lines, delimiter):
+            return self._read_all(lines, delimiter)
+    
+    def read_stream(self, input_fp: BinaryIO) -> Tuple[List[str], List[List[str]]]:
+        """
+        Lee el CSV desde un archivo binario abierto (por ejemplo, el de un
+        UploadFile) sin copiarlo antes a disco.
+        """
+        with self._open_stream(input_fp) as (lines, delimiter):
+            return self._read_all(lines, delimiter)
+    
+    @contextmanager
+    def _open_file(self, file_path: str) -> Iterator[Tuple[Iterable[str], str]]:
+        """Abre el archivo y entrega sus líneas junto con el delimitador."""
         delimiter = self.delimiter or self.detect_delimiter(file_path)
-        
         with open(file_path, 'r', encoding=self.encoding) as f:
-            reader = csv.reader(f, delimiter=delimiter, quotechar='"')
-            data = list(reader)
-            
-            if not data:
-                return [], []
-            
-            headers = data[0]
-            rows = data[1:] if len(data) > 1 else []
-            
-            # Normalizar headers
-            normalized_headers = [self.normalize_column_name(h) for h in headers]
-            
-            logger.info(f"Archivo leído: {len(normalized_headers)} headers, {len(rows)} filas")
-            return normalized_headers, rows
+            yield f, delimiter
+    
+    @contextmanager
+    def _open_stream(self, input_fp: BinaryIO) -> Iterator[Tuple[Iterable[str], str]]:
+        """Entrega las líneas de un archivo binario abierto junto con el delimitador."""
+        text = io.TextIOWrapper(input_fp, encoding=self.encoding)
+        try:
+            first_line = text.readline()
+            delimiter = self.delimiter or self._detect_delimiter_from_line(first_line)
+            yield itertools.chain([first_line], text), delimiter
+        finally:
+            # Desacoplar para no cerrar el archivo del llamador
+            text.detach()
+    
+    def _split_header(self, lines: Iterable[str], delimiter: str) -> Tuple[List[str], Iterator[List[str]]]:
+        """Lee solo la fila de headers; las demás filas se entregan a medida que se leen."""
+        reader = csv.reader(lines, delimiter=delimiter, quotechar='"')
+        headers = next(reader, [])
+        
+        # Normalizar headers
+        return [self.normalize_column_name(h) for h in headers], reader
+    
+    def _read_all(self, lines: Iterable[str], delimiter: str) -> Tuple[List[str], List[List[str]]]:
+        """Lee todas las filas en memoria."""
+        headers, reader = self._split_header(lines, delimiter)
+        rows = list(reader)
+        
+        logger.debug("Archivo leído: %d headers, %d filas", len(headers), len(rows))
+        return headers, rows
     
     def validate_row(self, row: List[str], headers: List[str], row_number: int) -> Tuple[List[str], List[ValidationError]]:
         """
@@ -304,10 +346,7 @@ class CSVProcessor:
     
     def _get_expected_type(self, column_name: str) -> Optional[str]:
         """Obtiene el tipo esperado para una columna."""
-        for type_name, columns in self.type_mapping.items():
-            if column_name in columns:
-                return type_name
-        return None
+        return self._column_types.get(column_name)
     
     def reorganize_row(self, row: List[str], original_headers: List[str], 
                       final_headers: List[str]) -> List[str]:
@@ -330,96 +369,110 @@ class CSVProcessor:
         Returns:
             Diccionario con estadísticas del procesamiento
         """
-        logger.info(f"Iniciando procesamiento de {input_file}")
+        logger.debug("Iniciando procesamiento de %s", input_file)
         
         try:
-            # Leer archivo
-            headers, rows = self.read_csv(input_file)
-            if not headers:
-                raise ValueError("El archivo CSV está vacío o no tiene headers")
-            
-            # Organizar headers
-            organized_headers = self.organize_headers(headers)
-            logger.info(f"Headers organizados: {len(organized_headers)}")
-            
-            # Procesar filas
-            processed_rows = []
-            all_errors = []
+            with self._open_file(input_file) as (lines, delimiter):
+                headers, rows = self._split_header(lines, delimiter)
+                return self._process_rows(headers, rows, output_file, error_file)
+        except Exception as e:
+            logger.error("Error procesando archivo: %s", e)
+            raise
+    
+    def process_stream(self, input_fp: BinaryIO, output_file: str, error_file: str = None) -> Dict[str, Any]:
+        """
+        Procesa el CSV leído directamente de un archivo binario abierto, sin
+        archivo de entrada temporal.
+        
+        Returns:
+            Diccionario con estadísticas del procesamiento
+        """
+        logger.debug("Iniciando procesamiento desde stream")
+        
+        try:
+            with self._open_stream(input_fp) as (lines, delimiter):
+                headers, rows = self._split_header(lines, delimiter)
+                return self._process_rows(headers, rows, output_file, error_file)
+        except Exception as e:
+            logger.error("Error procesando archivo: %s", e)
+            raise
+    
+    def _process_rows(self, headers: List[str], rows: Iterable[List[str]],
+                      output_file: str, error_file: str = None) -> Dict[str, Any]:
+        """
+        Valida, reorganiza y escribe las filas a medida que se leen, de modo
+        que el archivo nunca se carga completo en memoria.
+        """
+        if not headers:
+            raise ValueError("El archivo CSV está vacío o no tiene headers")
+        
+        # Organizar headers
+        organized_headers = self.organize_headers(headers)
+        logger.debug("Headers organizados: %d", len(organized_headers))
+        
+        # Posición de cada header final en la fila original, calculada una sola vez
+        header_map = {h: i for i, h in enumerate(headers)}
+        source_indexes = [header_map[h] for h in organized_headers]
+        
+        processed_count = 0
+        validation_errors = 0
+        structure_errors = 0
+        
+        with ExitStack() as stack:
+            output = stack.enter_context(open(output_file, 'w', newline='', encoding=self.encoding))
+            writer = csv.writer(output, delimiter=self.delimiter or DEFAULT_DELIMITER)
+            writer.writerow(organized_headers)
+            # El archivo de errores se crea solo cuando aparece el primer error
+            error_writer = None
             
             for row_index, row in enumerate(rows, start=1):
                 if len(row) != len(headers):
                     # Error de estructura
-                    error = ValidationError(
+                    row_errors = [ValidationError(
                         columna="ESTRUCTURA",
                         valor=str(row),
                         fila=row_index,
                         tipo_esperado="ESTRUCTURA",
                         mensaje=f"Fila tiene {len(row)} columnas, se esperaban {len(headers)}"
-                    )
-                    all_errors.append(error)
-                    continue
-                
-                # Validar fila
-                processed_row, row_errors = self.validate_row(row, headers, row_index)
-                all_errors.extend(row_errors)
+                    )]
+                    structure_errors += 1
+                else:
+                    # Validar fila
+                    processed_row, row_errors = self.validate_row(row, headers, row_index)
+                    validation_errors += len(row_errors)
+                    
+                    # Reorganizar según headers finales
+                    writer.writerow([processed_row[i] for i in source_indexes])
+                    processed_count += 1
                 
-                # Reorganizar según headers finales
-                final_row = self.reorganize_row(processed_row, headers, organized_headers)
-                processed_rows.append(final_row)
-            
-            # Guardar archivo procesado
-            self._save_csv(output_file, organized_headers, processed_rows)
-            
-            # Guardar errores si los hay
-            if all_errors and error_file:
-                self._save_errors(error_file, all_errors)
-            
-            # Estadísticas
-            stats = {
-                'filas_procesadas': len(processed_rows),
-                'filas_con_errores': len([e for e in all_errors if e.columna != "ESTRUCTURA"]),
-                'errores_estructura': len([e for e in all_errors if e.columna == "ESTRUCTURA"]),
-                'total_errores': len(all_errors),
-                'headers_originales': len(headers),
-                'headers_finales': len(organized_headers)
-            }
-            
-            logger.info(f"Procesamiento completado: {stats}")
-            return stats
-            
-        except Exception as e:
-            logger.error(f"Error procesando archivo: {str(e)}")
-            raise
-    
-    def _save_csv(self, file_path: str, headers: List[str], rows: List[List[str]]) -> None:
-        """Guarda datos en formato CSV."""
-        with open(file_path, 'w', newline='', encoding=self.encoding) as f:
-            writer = csv.writer(f, delimiter=self.delimiter or DEFAULT_DELIMITER)
-            writer.writerow(headers)
-            writer.writerows(rows)
+                if row_errors and error_file:
+                    if error_writer is None:
+                        error_writer = self._open_error_writer(stack, error_file)
+                    error_writer.writerows(asdict(error) for error in row_errors)
+        
+        logger.debug("Archivo guardado: %s", output_file)
+        if error_writer is not None:
+            logger.debug("Archivo de errores guardado: %s", error_file)
+        
+        # Estadísticas
+        stats = {
+            'filas_procesadas': processed_count,
+            'filas_con_errores': validation_errors,
+            'errores_estructura': structure_errors,
+            'total_errores': validation_errors + structure_errors,
+            'headers_originales': len(headers),
+            'headers_finales': len(organized_headers)
+        }
         
-        logger.info(f"Archivo guardado: {file_path}")
+        logger.info("Procesamiento completado: %s", stats)
+        return stats
     
-    def _save_errors(self, file_path: str, errors: List[ValidationError]) -> None:
-        """Guarda errores en formato CSV."""
-        if not errors:
-            return
-        
-        with open(file_path, 'w', newline='', encoding=self.encoding) as f:
-            fieldnames = ['columna', 'valor', 'fila', 'tipo_esperado', 'mensaje']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for error in errors:
-                writer.writerow({
-                    'columna': error.columna,
-                    'valor': error.valor,
-                    'fila': error.fila,
-                    'tipo_esperado': error.tipo_esperado,
-                    'mensaje': error.mensaje
-                })
-        
-        logger.info(f"Archivo de errores guardado: {file_path}")
+    def _open_error_writer(self, stack: ExitStack, file_path: str) -> csv.DictWriter:
+        """Abre el archivo de errores dentro del stack y escribe su encabezado."""
+        f = stack.enter_context(open(file_path, 'w', newline='', encoding=self.encoding))
+        writer = csv.DictWriter(f, fieldnames=['columna', 'valor', 'fila', 'tipo_esperado', 'mensaje'])
+        writer.writeheader()
+        return writer
 
 
 # Funciones de conveniencia para uso directo
@@ -3,9 +3,10 @@ Configuración de validadores para diferentes proyectos y módulos.
 Centraliza la configuración de validadores para facilitar el mantenimiento.
 """
 
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Optional
 from .simple_csv_processor import (
-    DataValidator, DateValidator, NITValidator, 
+    CSVProcessor, DataValidator, DateValidator, NITValidator, 
     ChoiceValidator, StringValidator
 )
 
@@ -200,6 +201,148 @@ VALIDATORS_CONFIG = {
 }
 
 
+# Mapeo de tipos por columna, por proyecto y módulo
+TYPE_MAPPINGS_CONFIG = {
+    'DIAN': {
+        'disciplinarios': {
+            "datetime": ["FECHA_DE_RADICACION", "FECHA_DE_LOS_HECHOS", "FECHA_DE_INDAGACION_PRELIMINAR", 
+                        "FECHA_DE_INVESTIGACION_DISCIPLINARIA", "FECHA_DE_FALLO", "FECHA_CITACION", 
+                        "FECHA_DE_PLIEGO_DE__CARGOS", "FECHA_DE_CIERRE_INVESTIGACION"],
+            "str": ["NOMBRE_ARCHIVO", "MES_REPORTE", "EXPEDIENTE", "IMPLICADO", "DEPENDENCIA", "SUBPROCESO", 
+                   "PROCEDIMIENTO", "CARGO", "ORIGEN", "CONDUCTA", "ETAPA_PROCESAL", "SANCION_IMPUESTA", 
+                   "HECHOS", "DECISION_DE_LA_INVESTIGACION", "TIPO_DE_PROCESO_AFECTADO", 
+                   "SENALADOS_O_VINCULADOS_CON_LA_INVESTIGACION", "ADECUACION_TIPICA", "ABOGADO", 
+                   "SENTIDO_DEL_FALLO", "QUEJOSO", "TIPO_DE_PROCESO"],
+            "nit": ["DOCUMENTO_DEL_IMPLICADO", "DOC_QUEJOSO"],
+            "departamento": ["DEPARTAMENTO_DE_LOS_HECHOS"],
+            "ciudad": ["CIUDAD_DE_LOS_HECHOS"],
+            "direccion_seccional": ["DIRECCION_SECCIONAL"],
+            "proceso": ["PROCESO"]
+        },
+        'notificaciones': {
+            "datetime": ["FECHA_RADICADO_EN_DEFENSORIA", "FECHA_ASIGNACION"],
+            "str": ["ARCHIVO_FUENTE", "MES_REPORTE", "ID_CASO", "TIPO_SOLICITUD", "NOMBRE_O_RAZON_SOCIAL"],
+            "nit": ["NIT/CC"],
+            "estado_notificacion": ["ESTADO_NOTIFICACION"],
+            "proceso": ["PROCESO"],
+            "dependencia": ["DEPENDENCIA_DIAN"]
+        },
+        'PQR': {
+            'muisca': {
+                "date": ["FEC_CREACION"],
+                "str": ["IDE_EXPEDIENTE", "NUM_IDENT", "PRI_APELL", "SEG_APELL", "RAZ_SOCIAL"],
+                "nit": ["NUM_IDENT"],
+                "clasificacion": ["CLASIFICACION"],
+                "calidad_quien_solicito": ["CALIDAD_QUIEN_IN_SOLICI"],
+                "estado_solicitud": ["ESTADO_SOLICITUD"],
+                "direccion_seccional": ["DIR_SECCIONAL_INGRESO", "DIR_SECCIONAL_ASIGNADO"]
+            },
+            'dynamics': {
+                "date": ["FECHA_DE_CREACION_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)", "FECHA_DE_RADICACION_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)"],
+                "str": ["SOLICITUD", "CLIENTE_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)", "TIPO_DE_SOLICITUD_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)"],
+                "nit": ["NUMERO_DE_IDENTIFICACION_(CLIENTE)_(PERSONA_NATURAL)_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)"],
+                "direccion_seccional": ["AREA_DESDE_DONDE_SE_EJECUTO_LA_ACCION"]
+            }
+        }
+    },
+    'COLJUEGOS': {
+        'disciplinarios': {
+            "str": ["NOMBRE_ARCHIVO", "MES_REPORTE", "EXPEDIENTE"],
+            "direccion_seccional": ["DIRECCION_SECCIONAL"],
+            "proceso": ["PROCESO"]
+        },
+        'PQR': {
+            "str": ["NOMBRE_ARCHIVO", "MES_REPORTE", "EXPEDIENTE"],
+            "direccion_seccional": ["DIRECCION_SECCIONAL"]
+        }
+    },
+    'UGPP': {
+        'disciplinarios': {
+            "str": ["NOMBRE_ARCHIVO", "MES_REPORTE", "EXPEDIENTE"],
+            "direccion_seccional": ["DIRECCION_SECCIONAL"]
+        },
+        'PQR': {
+            "str": ["NOMBRE_ARCHIVO", "MES_REPORTE", "EXPEDIENTE"],
+            "direccion_seccional": ["DIRECCION_SECCIONAL"]
+        }
+    }
+}
+
+# Headers de referencia por proyecto y módulo
+REFERENCE_HEADERS_CONFIG = {
+    'DIAN': {
+        'disciplinarios': [
+            'NOMBRE_ARCHIVO', 'MES_REPORTE', 'EXPEDIENTE', 'FECHA_RADICACION',
+            'FECHA_HECHOS', 'INDAGACION_PRELIMINAR', 'INVESTIGACION_DISCIPLINARIA',
+            'IMPLICADO', 'IDENTIFICACION', 'DEPARTAMENTO', 'CIUDAD',
+            'DIRECCION_SECCIONAL', 'DEPENDENCIA', 'PROCESO', 'SUBPROCESO',
+            'PROCEDIMIENTO', 'CARGO', 'ORIGEN', 'CONDUCTA', 'ETAPA_PROCESAL',
+            'FECHA_FALLO', 'SANCION_IMPUESTA', 'HECHO', 'DECISION',
+            'PROCESO_AFECTADO', 'SENALADOS_O_VINCULADOS', 'ADECUACION_TIPICA',
+            'ABOGADO', 'SENTIDO_DEL_FALLO', 'QUEJOSO', 'IDENTIFICACION_QUEJOSO',
+            'TIPO_DE_PROCESO', 'FECHA_PLIEGO_DE_CARGOS', 'FECHA_CITACION',
+            'FECHA_CIERRE_DE_INVESTIGACION'
+        ],
+        'notificaciones': [
+            'ARCHIVO_FUENTE', 'MES_REPORTE', 'ID_CASO', 'TIPO_SOLICITUD',
+            'FECHA_RADICADO_EN_DEFENSORIA', 'NOMBRE_O_RAZON_SOCIAL',
+            'REPRESENTANTE_O_APODERADO', 'NIT/CC', 'DIRECCION', 'TELEFONO',
+            'E_MAIL', 'DEPENDENCIA_DIAN', 'MACROPROCESO', 'PROCESO',
+            'SUBPROCESO', 'PROCEDIMIENTO', 'RIESGO', 'MOTIVO_RIESGO',
+            'DESCRIPCION_DE_LA_SOLICITUD', 'ASIGNACION', 'CARGO',
+            'FECHA_ASIGNACION', 'ACTUACIONES', 'SOLUCIONADO_A_FAVOR'
+        ],
+        'PQR': {
+            'muisca': [
+                'NOMBRE_ARCHIVO', 'MES_REPORTE', 'IDE_EXPEDIENTE', 'NUM_IDENT',
+                'PRI_APELL', 'SEG_APELL', 'RAZ_SOCIAL', 'MUNICIPIO',
+                'FEC_CREACION', 'MEDIO_INGRESO', 'CLASIFICACION', 'TEMA',
+                'SUBTEMA', 'OTRA', 'TIPO', 'CALIDAD_QUIEN_IN_SOLICI',
+                'ESTADO_SOLICITUD', 'DIR_SECCIONAL_INGRESO', 'EVENTO_ACTUAL',
+                'FUNCI_QUE_LA_TIENE_ASIG', 'ROL_DEL_FUNCIONARIO',
+                'FEC_ASIGNACION_COMP', 'DIR_SECCIONAL_ASIGNADO',
+                'UNIDAD_ADM_QUE_GES', 'DIAS_HABILES_EVENTO', 'ESTADO_EVENTO',
+                'FEC_TERMINACION', 'FEC_MAX_TERMINACION', 'DIR_SECC_CERR_ASUNT',
+                'DIAS_HABILES_SOLICITUD', 'DESCRIPCION_LOS_HECHOS'
+            ],
+            'dynamics': [
+                'NOMBRE_ARCHIVO', 'MES_REPORTE', 'SOLICITUD',
+                'NUMERO_DE_IDENTIFICACION_(CLIENTE)_(PERSONA_NATURAL)',
+                'CLIENTE_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
+                'PERSONA_JURIDICA_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
+                'CIUDAD_MUNICIPIO_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
+                'FECHA_DE_CREACION_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
+                'FECHA_DE_RADICACION_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
+                'TIPO_DE_SOLICITUD_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
+                'TEMA_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
+                'ESTADO_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
+                'AREA_DESDE_DONDE_SE_EJECUTO_LA_ACCION'
+            ]
+        }
+    },
+    'COLJUEGOS': {
+        'disciplinarios': [
+            'NOMBRE_ARCHIVO', 'MES_REPORTE', 'EXPEDIENTE', 'DIRECCION_SECCIONAL',
+            'PROCESO', 'CARGO', 'ORIGEN', 'CONDUCTA', 'SANCION_IMPUESTA'
+        ],
+        'PQR': [
+            'NOMBRE_ARCHIVO', 'MES_REPORTE', 'EXPEDIENTE', 'DIRECCION_SECCIONAL',
+            'TIPO_SOLICITUD', 'ESTADO_SOLICITUD'
+        ]
+    },
+    'UGPP': {
+        'disciplinarios': [
+            'NOMBRE_ARCHIVO', 'MES_REPORTE', 'EXPEDIENTE', 'DIRECCION_SECCIONAL',
+            'PROCESO', 'CARGO', 'ORIGEN', 'CONDUCTA', 'SANCION_IMPUESTA'
+        ],
+        'PQR': [
+            'NOMBRE_ARCHIVO', 'MES_REPORTE', 'EXPEDIENTE', 'DIRECCION_SECCIONAL',
+            'TIPO_SOLICITUD', 'ESTADO_SOLICITUD'
+        ]
+    }
+}
+
+
 def get_validators_for_project(project_code: str, module_name: str) -> Dict[str, DataValidator]:
     """
     Obtiene los validadores específicos para un proyecto y módulo.
@@ -242,74 +385,7 @@ def get_type_mapping_for_project(project_code: str, module_name: str) -> Dict[st
     Returns:
         Mapeo de tipos por columna
     """
-    # Mapeos específicos por proyecto y módulo
-    type_mappings = {
-        'DIAN': {
-            'disciplinarios': {
-                "datetime": ["FECHA_DE_RADICACION", "FECHA_DE_LOS_HECHOS", "FECHA_DE_INDAGACION_PRELIMINAR", 
-                            "FECHA_DE_INVESTIGACION_DISCIPLINARIA", "FECHA_DE_FALLO", "FECHA_CITACION", 
-                            "FECHA_DE_PLIEGO_DE__CARGOS", "FECHA_DE_CIERRE_INVESTIGACION"],
-                "str": ["NOMBRE_ARCHIVO", "MES_REPORTE", "EXPEDIENTE", "IMPLICADO", "DEPENDENCIA", "SUBPROCESO", 
-                       "PROCEDIMIENTO", "CARGO", "ORIGEN", "CONDUCTA", "ETAPA_PROCESAL", "SANCION_IMPUESTA", 
-                       "HECHOS", "DECISION_DE_LA_INVESTIGACION", "TIPO_DE_PROCESO_AFECTADO", 
-                       "SENALADOS_O_VINCULADOS_CON_LA_INVESTIGACION", "ADECUACION_TIPICA", "ABOGADO", 
-                       "SENTIDO_DEL_FALLO", "QUEJOSO", "TIPO_DE_PROCESO"],
-                "nit": ["DOCUMENTO_DEL_IMPLICADO", "DOC_QUEJOSO"],
-                "departamento": ["DEPARTAMENTO_DE_LOS_HECHOS"],
-                "ciudad": ["CIUDAD_DE_LOS_HECHOS"],
-                "direccion_seccional": ["DIRECCION_SECCIONAL"],
-                "proceso": ["PROCESO"]
-            },
-            'notificaciones': {
-                "datetime": ["FECHA_RADICADO_EN_DEFENSORIA", "FECHA_ASIGNACION"],
-                "str": ["ARCHIVO_FUENTE", "MES_REPORTE", "ID_CASO", "TIPO_SOLICITUD", "NOMBRE_O_RAZON_SOCIAL"],
-                "nit": ["NIT/CC"],
-                "estado_notificacion": ["ESTADO_NOTIFICACION"],
-                "proceso": ["PROCESO"],
-                "dependencia": ["DEPENDENCIA_DIAN"]
-            },
-            'PQR': {
-                'muisca': {
-                    "date": ["FEC_CREACION"],
-                    "str": ["IDE_EXPEDIENTE", "NUM_IDENT", "PRI_APELL", "SEG_APELL", "RAZ_SOCIAL"],
-                    "nit": ["NUM_IDENT"],
-                    "clasificacion": ["CLASIFICACION"],
-                    "calidad_quien_solicito": ["CALIDAD_QUIEN_IN_SOLICI"],
-                    "estado_solicitud": ["ESTADO_SOLICITUD"],
-                    "direccion_seccional": ["DIR_SECCIONAL_INGRESO", "DIR_SECCIONAL_ASIGNADO"]
-                },
-                'dynamics': {
-                    "date": ["FECHA_DE_CREACION_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)", "FECHA_DE_RADICACION_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)"],
-                    "str": ["SOLICITUD", "CLIENTE_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)", "TIPO_DE_SOLICITUD_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)"],
-                    "nit": ["NUMERO_DE_IDENTIFICACION_(CLIENTE)_(PERSONA_NATURAL)_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)"],
-                    "direccion_seccional": ["AREA_DESDE_DONDE_SE_EJECUTO_LA_ACCION"]
-                }
-            }
-        },
-        'COLJUEGOS': {
-            'disciplinarios': {
-                "str": ["NOMBRE_ARCHIVO", "MES_REPORTE", "EXPEDIENTE"],
-                "direccion_seccional": ["DIRECCION_SECCIONAL"],
-                "proceso": ["PROCESO"]
-            },
-            'PQR': {
-                "str": ["NOMBRE_ARCHIVO", "MES_REPORTE", "EXPEDIENTE"],
-                "direccion_seccional": ["DIRECCION_SECCIONAL"]
-            }
-        },
-        'UGPP': {
-            'disciplinarios': {
-                "str": ["NOMBRE_ARCHIVO", "MES_REPORTE", "EXPEDIENTE"],
-                "direccion_seccional": ["DIRECCION_SECCIONAL"]
-            },
-            'PQR': {
-                "str": ["NOMBRE_ARCHIVO", "MES_REPORTE", "EXPEDIENTE"],
-                "direccion_seccional": ["DIRECCION_SECCIONAL"]
-            }
-        }
-    }
-    
-    return type_mappings.get(project_code.upper(), {}).get(module_name.lower(), {})
+    return TYPE_MAPPINGS_CONFIG.get(project_code.upper(), {}).get(module_name.lower(), {})
 
 
 def get_reference_headers_for_project(project_code: str, module_name: str) -> List[str]:
@@ -323,81 +399,7 @@ def get_reference_headers_for_project(project_code: str, module_name: str) -> Li
     Returns:
         Lista de headers de referencia
     """
-    # Headers de referencia por proyecto y módulo
-    reference_headers = {
-        'DIAN': {
-            'disciplinarios': [
-                'NOMBRE_ARCHIVO', 'MES_REPORTE', 'EXPEDIENTE', 'FECHA_RADICACION',
-                'FECHA_HECHOS', 'INDAGACION_PRELIMINAR', 'INVESTIGACION_DISCIPLINARIA',
-                'IMPLICADO', 'IDENTIFICACION', 'DEPARTAMENTO', 'CIUDAD',
-                'DIRECCION_SECCIONAL', 'DEPENDENCIA', 'PROCESO', 'SUBPROCESO',
-                'PROCEDIMIENTO', 'CARGO', 'ORIGEN', 'CONDUCTA', 'ETAPA_PROCESAL',
-                'FECHA_FALLO', 'SANCION_IMPUESTA', 'HECHO', 'DECISION',
-                'PROCESO_AFECTADO', 'SENALADOS_O_VINCULADOS', 'ADECUACION_TIPICA',
-                'ABOGADO', 'SENTIDO_DEL_FALLO', 'QUEJOSO', 'IDENTIFICACION_QUEJOSO',
-                'TIPO_DE_PROCESO', 'FECHA_PLIEGO_DE_CARGOS', 'FECHA_CITACION',
-                'FECHA_CIERRE_DE_INVESTIGACION'
-            ],
-            'notificaciones': [
-                'ARCHIVO_FUENTE', 'MES_REPORTE', 'ID_CASO', 'TIPO_SOLICITUD',
-                'FECHA_RADICADO_EN_DEFENSORIA', 'NOMBRE_O_RAZON_SOCIAL',
-                'REPRESENTANTE_O_APODERADO', 'NIT/CC', 'DIRECCION', 'TELEFONO',
-                'E_MAIL', 'DEPENDENCIA_DIAN', 'MACROPROCESO', 'PROCESO',
-                'SUBPROCESO', 'PROCEDIMIENTO', 'RIESGO', 'MOTIVO_RIESGO',
-                'DESCRIPCION_DE_LA_SOLICITUD', 'ASIGNACION', 'CARGO',
-                'FECHA_ASIGNACION', 'ACTUACIONES', 'SOLUCIONADO_A_FAVOR'
-            ],
-            'PQR': {
-                'muisca': [
-                    'NOMBRE_ARCHIVO', 'MES_REPORTE', 'IDE_EXPEDIENTE', 'NUM_IDENT',
-                    'PRI_APELL', 'SEG_APELL', 'RAZ_SOCIAL', 'MUNICIPIO',
-                    'FEC_CREACION', 'MEDIO_INGRESO', 'CLASIFICACION', 'TEMA',
-                    'SUBTEMA', 'OTRA', 'TIPO', 'CALIDAD_QUIEN_IN_SOLICI',
-                    'ESTADO_SOLICITUD', 'DIR_SECCIONAL_INGRESO', 'EVENTO_ACTUAL',
-                    'FUNCI_QUE_LA_TIENE_ASIG', 'ROL_DEL_FUNCIONARIO',
-                    'FEC_ASIGNACION_COMP', 'DIR_SECCIONAL_ASIGNADO',
-                    'UNIDAD_ADM_QUE_GES', 'DIAS_HABILES_EVENTO', 'ESTADO_EVENTO',
-                    'FEC_TERMINACION', 'FEC_MAX_TERMINACION', 'DIR_SECC_CERR_ASUNT',
-                    'DIAS_HABILES_SOLICITUD', 'DESCRIPCION_LOS_HECHOS'
-                ],
-                'dynamics': [
-                    'NOMBRE_ARCHIVO', 'MES_REPORTE', 'SOLICITUD',
-                    'NUMERO_DE_IDENTIFICACION_(CLIENTE)_(PERSONA_NATURAL)',
-                    'CLIENTE_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
-                    'PERSONA_JURIDICA_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
-                    'CIUDAD_MUNICIPIO_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
-                    'FECHA_DE_CREACION_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
-                    'FECHA_DE_RADICACION_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
-                    'TIPO_DE_SOLICITUD_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
-                    'TEMA_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
-                    'ESTADO_(SOLICITUD)_(REGISTRO_DE_SOLICITUD)',
-                    'AREA_DESDE_DONDE_SE_EJECUTO_LA_ACCION'
-                ]
-            }
-        },
-        'COLJUEGOS': {
-            'disciplinarios': [
-                'NOMBRE_ARCHIVO', 'MES_REPORTE', 'EXPEDIENTE', 'DIRECCION_SECCIONAL',
-                'PROCESO', 'CARGO', 'ORIGEN', 'CONDUCTA', 'SANCION_IMPUESTA'
-            ],
-            'PQR': [
-                'NOMBRE_ARCHIVO', 'MES_REPORTE', 'EXPEDIENTE', 'DIRECCION_SECCIONAL',
-                'TIPO_SOLICITUD', 'ESTADO_SOLICITUD'
-            ]
-        },
-        'UGPP': {
-            'disciplinarios': [
-                'NOMBRE_ARCHIVO', 'MES_REPORTE', 'EXPEDIENTE', 'DIRECCION_SECCIONAL',
-                'PROCESO', 'CARGO', 'ORIGEN', 'CONDUCTA', 'SANCION_IMPUESTA'
-            ],
-            'PQR': [
-                'NOMBRE_ARCHIVO', 'MES_REPORTE', 'EXPEDIENTE', 'DIRECCION_SECCIONAL',
-                'TIPO_SOLICITUD', 'ESTADO_SOLICITUD'
-            ]
-        }
-    }
-    
-    project_headers = reference_headers.get(project_code.upper(), {})
+    project_headers = REFERENCE_HEADERS_CONFIG.get(project_code.upper(), {})
     
     if module_name.lower() in project_headers:
         return project_headers[module_name.lower()]
@@ -410,10 +412,14 @@ def get_reference_headers_for_project(project_code: str, module_name: str) -> Li
 
 def create_processor_for_project(project_code: str, module_name: str, 
                                 custom_validators: Dict[str, DataValidator] = None,
-                                delimiter: str = None) -> 'CSVProcessor':
+                                delimiter: str = None) -> CSVProcessor:
     """
     Crea un procesador CSV configurado para un proyecto y módulo específico.
     
+    Sin validadores personalizados, la configuración es fija, así que se
+    reutiliza el mismo procesador para cada combinación de proyecto, módulo
+    y delimitador. El procesador no guarda estado entre archivos.
+    
     Args:
         project_code: Código del proyecto
         module_name: Nombre del módulo
@@ -423,8 +429,21 @@ def create_processor_for_project(project_code: str, module_name: str,
     Returns:
         Instancia de CSVProcessor configurada
     """
-    from .simple_csv_processor import CSVProcessor
-    
+    if custom_validators:
+        return _build_processor(project_code, module_name, custom_validators, delimiter)
+    return _cached_processor(project_code, module_name, delimiter)
+
+
+@lru_cache(maxsize=None)
+def _cached_processor(project_code: str, module_name: str, delimiter: Optional[str]) -> CSVProcessor:
+    """Procesador sin validadores personalizados, construido una sola vez."""
+    return _build_processor(project_code, module_name, None, delimiter)
+
+
+def _build_processor(project_code: str, module_name: str,
+                     custom_validators: Optional[Dict[str, DataValidator]],
+                     delimiter: Optional[str]) -> CSVProcessor:
+    """Construye el procesador a partir de la configuración del proyecto."""
     # Obtener configuración del proyecto
     reference_headers = get_reference_headers_for_project(project_code, module_name)
     type_mapping = get_type_mapping_for_project(project_code, module_name)
@@ -439,4 +458,4 @@ def create_processor_for_project(project_code: str, module_name: str,
         type_mapping=type_mapping,
         validators=validators,
         delimiter=delimiter
-    ) 
\ No newline at end of file
+    )
@@ -1,943 +1,1329 @@
-from fastapi import APIRouter, File, UploadFile, Body, Form
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, File, UploadFile, Body, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
 import os
 import pandas as pd
+import pyreadstat
 import tempfile
-import zipfile
 import csv
 import shutil
 import re
 import subprocess
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from typing import Iterable, Iterator, List
+from openpyxl import Workbook
+
+from utils.encoding_detector import encoding_detector
+from utils.zip_stream import eliminar_directorio, respuesta_zip
 
 router = APIRouter(prefix="/api/v1", tags=["Conversión de archivos"])
 
+# Tamaño de bloque para copiar los archivos subidos a disco
+TAMANO_BLOQUE = 1024 * 1024  # 1 MB
 
-@router.post("/csv-a-otro-separador/")
-def csv_a_otro_separador(body: dict = Body(...)):
-    """Convierte archivos CSV de un separador a otro"""
-    import io
+# Buffer de copia de los archivos subidos, uno por hilo
+_BUFFER_COPIA = threading.local()
+
+# Filas por bloque al convertir archivos .sav
+FILAS_POR_BLOQUE_SAV = 50_000
+
+# Motor para leer Excel: calamine (Rust) si python-calamine está instalado,
+# si no el motor por defecto de pandas (openpyxl)
+try:
+    import python_calamine  # noqa: F401
+    _MOTOR_EXCEL = "calamine"
+except ImportError:
+    _MOTOR_EXCEL = None
+
+# PyMuPDF (fitz, en C) para extraer el texto y renderizar las páginas de los
+# PDF; llega como dependencia de pdf2docx. Si no está, se usan pdfplumber y
+# pdf2image
+try:
+    import fitz
+except ImportError:
+    fitz = None
+_MOTOR_PDF = "PyMuPDF" if fitz is not None else "pdfplumber"
+
+# Resolución de las páginas renderizadas para OCR. Tesseract tarda según el
+# número de píxeles: 150 DPI es ~0.56 veces los de 200 (el valor por defecto
+# de pdf2image) y sigue siendo suficiente para texto impreso
+DPI_OCR = 150
+
+# Páginas que pdf2image convierte por llamada cuando no hay PyMuPDF
+PAGINAS_POR_BLOQUE_OCR = 10
+
+# Expresiones regulares para extraer el mes de reporte del nombre del archivo
+_RE_FECHA_I = re.compile(r"I(\d{8})")
+_RE_FECHA_DD_MM_YYYY = re.compile(r"(\d{2})-(\d{2})-(\d{4})")
+_RE_MES = re.compile(r"Mes_([A-Za-z]+)_(\d{4})")
+_RE_MES_DE = re.compile(r"Mes_de_([A-Za-z]+)_de_(\d{4})")
+_RE_PQR = re.compile(r"(\d{4})-(\d{2})")
+_RE_DYNAMICS = re.compile(r"_(\w+)_(\d{4})_")
+_RE_DD_MES_AAAA = re.compile(r"(\d{2})_([a-zA-Z]+)_(\d{4})")
+
+# Nombres de meses usados en los nombres de archivo
+_MESES = {
+    "Enero": "01",
+    "Febrero": "02",
+    "Marzo": "03",
+    "Abril": "04",
+    "Mayo": "05",
+    "Junio": "06",
+    "Julio": "07",
+    "Agosto": "08",
+    "Septiembre": "09",
+    "Octubre": "10",
+    "Noviembre": "11",
+    "Diciembre": "12",
+}
+_MESES_LOWER = {
+    "enero": "1",
+    "febrero": "2",
+    "marzo": "3",
+    "abril": "4",
+    "mayo": "5",
+    "junio": "6",
+    "julio": "7",
+    "agosto": "8",
+    "septiembre": "9",
+    "octubre": "10",
+    "noviembre": "11",
+    "diciembre": "12",
+}
+
+# Limpieza de extensiones en txt-a-csv
+_RE_EXTENSION_TXT = re.compile(r'\.(txt|TXT)(\.txt|\.TXT)*$')
+_RE_PUNTOS_FINALES = re.compile(r'\.+$')
+
+# Detección de fechas y números grandes en las columnas de Excel
+_RE_FECHA_ISO = re.compile(r'^\d{4}-\d{2}-\d{2}.*$')
+_RE_FECHA_EXCEL = re.compile(r'^\d{1,6}$')
+_PALABRAS_FECHA = (
+    'fecha', 'fechas', 'date', 'programacion', 'programaciones', 'programación', 'inicio', 'fin', 'vencimiento', 'vencimientos',
+    'creacion', 'creación', 'modificacion', 'modificación', 'ingreso', 'terminado', 'terminados'
+)
+# Una sola búsqueda por nombre de columna (coincidencia por subcadena, como antes)
+_RE_PALABRAS_FECHA = re.compile("|".join(map(re.escape, _PALABRAS_FECHA)))
+
+
+@lru_cache(maxsize=4096)
+def _nombre_csv_limpio(nombre_archivo_base: str) -> str:
+    """
+    Nombre del CSV de salida para un .xlsx: espacios y puntos a "_" y sin
+    "de". Los reemplazos se aplican en cadena y en este orden porque cada
+    uno actúa sobre el resultado del anterior (p. ej. "Mes de Enero" ->
+    "Mes_Enero", "Pedido" -> "Pedio"); un único regex no da lo mismo.
+    """
+    return (
+        nombre_archivo_base.replace(" ", "_")
+        .replace("de_", "")
+        .replace("de", "")
+        .replace(".", "_")
+        + ".csv"
+    )
+
+
+@lru_cache(maxsize=4096)
+def _extraer_mes_reporte(nombre: str) -> str:
+    """
+    Obtiene el mes de reporte a partir del nombre (ya limpio) del CSV de
+    salida de un .xlsx. Devuelve "Desconocido" si ningún patrón coincide.
+
+    Se cachea porque los mismos nombres de archivo se repiten entre cargas.
+    """
+    coincidencia = _RE_MES.search(nombre)
+    coincidencia_2 = _RE_MES_DE.search(nombre)
+
+    coincidencia_fecha = _RE_FECHA_I.search(nombre)
+    coincidencia_pqr = _RE_PQR.search(nombre)
+    coincidencia_dynamics = _RE_DYNAMICS.search(nombre)
+    coincidencia_fecha_dd_mm_yyyy = _RE_FECHA_DD_MM_YYYY.search(nombre)
+    coincidencia_dd_mes_aaaa = _RE_DD_MES_AAAA.search(nombre)
+    mes_reporte = "Desconocido"
+
+    if coincidencia_dd_mes_aaaa:
+        dia = coincidencia_dd_mes_aaaa.group(1)
+        mes_nombre = coincidencia_dd_mes_aaaa.group(2).lower()
+        anio = coincidencia_dd_mes_aaaa.group(3)
+        mes_numero = _MESES_LOWER.get(mes_nombre)
+        if mes_numero:
+            mes_reporte = f"{mes_numero}_{anio}"
+    elif coincidencia:
+        mes_nombre = coincidencia.group(1).capitalize()
+        anio = coincidencia.group(2)
+        mes_numero = _MESES.get(mes_nombre)
+        if mes_numero:
+            mes_reporte = f"{mes_numero}_{anio}"
+    elif coincidencia_2:
+        mes_nombre = coincidencia_2.group(1).capitalize()
+        anio = coincidencia_2.group(2)
+        mes_numero = _MESES.get(mes_nombre)
+        if mes_numero:
+            mes_reporte = f"{mes_numero}_{anio}"
+    elif coincidencia_fecha:
+        fecha_str = coincidencia_fecha.group(1)
+        anio = fecha_str[:4]
+        mes = fecha_str[4:6]
+        mes_reporte = f"{mes}_{anio}"
+    elif coincidencia_dynamics:
+        mes_nombre = coincidencia_dynamics.group(1).lower()
+        anio = coincidencia_dynamics.group(2)
+        mes_numero = _MESES_LOWER.get(mes_nombre)
+        if mes_numero:
+            mes_reporte = f"{mes_numero}_{anio}"
+    elif coincidencia_pqr:
+        anio = coincidencia_pqr.group(1)
+        mes_numero = coincidencia_pqr.group(2)
+        mes_numero_sin_cero = str(int(mes_numero))
+        mes_reporte = f"{mes_numero_sin_cero}_{anio}"
+    elif coincidencia_fecha_dd_mm_yyyy:
+        dia = coincidencia_fecha_dd_mm_yyyy.group(1)
+        mes = coincidencia_fecha_dd_mm_yyyy.group(2)
+        anio = coincidencia_fecha_dd_mm_yyyy.group(3)
+        mes_reporte = f"{dia}-{mes}-{anio}"
+
+    return mes_reporte
 
-    lista_archivos_csv_at = body.get("lista_archivos_csv_at", [])
-    antiguo_separador = body.get("antiguo_separador", "|@")
-    nuevo_separador = body.get("nuevo_separador", "|")
 
-    archivos_convertidos = []
+@contextmanager
+def _directorio_peticion() -> Iterator[str]:
+    """
+    Crea el directorio temporal de una petición. Si todo sale bien lo elimina
+    la respuesta al terminar el envío; si se lanza una excepción antes (p. ej.
+    al guardar un archivo o el 503 del pool de procesos), se elimina aquí.
+    """
     temp_dir = tempfile.mkdtemp()
-    for nombre_archivo_csv_at in lista_archivos_csv_at:
-        if not os.path.exists(nombre_archivo_csv_at):
-            continue
+    try:
+        yield temp_dir
+    except BaseException:
+        eliminar_directorio(temp_dir)
+        raise
+
+
+def _guardar_upload(file: UploadFile, ruta: str) -> None:
+    """
+    Copia un archivo subido a disco por bloques, sin cargarlo completo en memoria.
+
+    Cada hilo del threadpool reutiliza su propio buffer con readinto, en lugar
+    de crear un objeto bytes nuevo por bloque como hace shutil.copyfileobj.
+    """
+    buffer = getattr(_BUFFER_COPIA, "buffer", None)
+    if buffer is None:
+        buffer = _BUFFER_COPIA.buffer = memoryview(bytearray(TAMANO_BLOQUE))
+    origen = file.file
+    with open(ruta, "wb") as f:
+        # SpooledTemporaryFile implementa readinto desde Python 3.11
+        if not hasattr(origen, "readinto"):
+            shutil.copyfileobj(origen, f, TAMANO_BLOQUE)
+            return
+        while leidos := origen.readinto(buffer):
+            f.write(buffer[:leidos])
+
+
+async def _procesar_en_paralelo(funcion, lista_argumentos) -> list:
+    """
+    Ejecuta funcion(*argumentos) en el threadpool para cada archivo, con
+    como máximo os.cpu_count() conversiones simultáneas.
+
+    Conserva el orden de entrada y descarta los archivos que no se pudieron
+    convertir (la función devuelve None).
+    """
+    semaforo = asyncio.Semaphore(os.cpu_count() or 1)
+
+    async def _ejecutar(argumentos):
+        async with semaforo:
+            return await run_in_threadpool(funcion, *argumentos)
+
+    resultados = await asyncio.gather(*(_ejecutar(argumentos) for argumentos in lista_argumentos))
+    return [resultado for resultado in resultados if resultado]
+
+
+# Pool de procesos compartido para conversiones CPU-bound (pandas, openpyxl,
+# pyreadstat, extracción de texto de PDF); se crea en el primer uso para no
+# lanzar procesos al importar
+_pool_procesos = None
+TAMANO_POOL_PROCESOS = os.cpu_count() or 1
+
+
+def _obtener_pool_procesos() -> ProcessPoolExecutor:
+    """Devuelve el pool de procesos del módulo, creándolo si no existe"""
+    global _pool_procesos
+    if _pool_procesos is None:
+        _pool_procesos = ProcessPoolExecutor(max_workers=TAMANO_POOL_PROCESOS)
+    return _pool_procesos
+
+
+def _descartar_pool_procesos(pool: ProcessPoolExecutor) -> None:
+    """
+    Descarta el pool si sigue siendo el del módulo. Un pool con un proceso
+    caído (p. ej. por falta de memoria) queda roto para siempre; el siguiente
+    uso crea uno nuevo.
+    """
+    global _pool_procesos
+    if _pool_procesos is pool:
+        _pool_procesos = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def cerrar_pool_procesos() -> None:
+    """Cierra el pool de procesos del módulo; se llama al apagar la aplicación"""
+    if _pool_procesos is not None:
+        _descartar_pool_procesos(_pool_procesos)
+
+
+async def _procesar_en_procesos(funcion, lista_argumentos) -> list:
+    """
+    Igual que _procesar_en_paralelo pero en el pool de procesos, para que las
+    conversiones de varios archivos no compitan por el GIL.
+
+    La función debe estar definida a nivel de módulo y recibir solo
+    argumentos serializables (rutas y parámetros simples).
+
+    Si un proceso del pool muere, el pool se reemplaza y las conversiones se
+    reintentan una vez (pueden haber fallado por otra petición); si vuelve a
+    pasar se responde 503.
+    """
+    loop = asyncio.get_running_loop()
+    for _ in range(2):
+        pool = _obtener_pool_procesos()
         try:
-            nombre_archivo_base, _ = os.path.splitext(
-                os.path.basename(nombre_archivo_csv_at)
+            resultados = await asyncio.gather(
+                *(loop.run_in_executor(pool, funcion, *argumentos) for argumentos in lista_argumentos)
             )
-            nombre_archivo_csv = nombre_archivo_base + ".csv"
-            archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
-            with open(
-                nombre_archivo_csv_at, "r", newline="", encoding="utf-8"
-            ) as infile, open(
-                archivo_salida, "w", newline="", encoding="utf-8"
-            ) as outfile:
-                coincidencia_fecha = re.search(r"I(\d{8})", nombre_archivo_csv_at)
-                coincidencia_fecha_dd_mm_yyyy = re.search(r"(\d{2})-(\d{2})-(\d{4})", nombre_archivo_csv_at)
-                mes_reporte = "Desconocido"
-                if coincidencia_fecha:
-                    fecha_str = coincidencia_fecha.group(1)
-                    anio = fecha_str[:4]
-                    mes = fecha_str[4:6]
-                    mes_reporte = f"{mes}_{anio}"
-                elif coincidencia_fecha_dd_mm_yyyy:
-                    dia = coincidencia_fecha_dd_mm_yyyy.group(1)
-                    mes = coincidencia_fecha_dd_mm_yyyy.group(2)
-                    anio = coincidencia_fecha_dd_mm_yyyy.group(3)
-                    mes_reporte = f"{mes}_{anio}"
-                primera_linea = infile.readline().strip()
-                cabecera = primera_linea.split(antiguo_separador)
-                nueva_cabecera = ["nombre_archivo", "mes_reporte"] + cabecera
-                outfile.write(nuevo_separador.join(nueva_cabecera) + "\n")
-                for line in infile:
-                    campos = line.strip().split(antiguo_separador)
-                    nueva_linea = [
-                        os.path.basename(nombre_archivo_csv_at),
-                        mes_reporte,
-                    ] + campos
-                    outfile.write(nuevo_separador.join(nueva_linea) + "\n")
-            archivos_convertidos.append(archivo_salida)
+            return [resultado for resultado in resultados if resultado]
+        except BrokenProcessPool:
+            _descartar_pool_procesos(pool)
+    raise HTTPException(
+        status_code=503,
+        detail="No se pudo completar la conversión: el proceso de trabajo terminó inesperadamente"
+    )
+
+
+def _convertir_con_codificacion(ruta_entrada: str, convertir):
+    """
+    Ejecuta convertir(codificacion) con las codificaciones candidatas del
+    archivo hasta que una lo decodifique completo sin errores.
+
+    La detección usa solo una muestra del inicio; si más adelante aparece un
+    byte que no encaja, la conversión se repite con la siguiente codificación
+    en lugar de reemplazar los caracteres. convertir debe abrir la salida en
+    modo "w" para que cada intento empiece de cero.
+    """
+    candidatas = encoding_detector.candidate_encodings(ruta_entrada)
+    for codificacion in candidatas[:-1]:
+        try:
+            return convertir(codificacion)
         except UnicodeDecodeError:
-            try:
-                with open(
-                    nombre_archivo_csv_at, "r", newline="", encoding="latin-1"
-                ) as infile_latin, open(
-                    archivo_salida, "w", newline="", encoding="utf-8"
-                ) as outfile:
-                    coincidencia_fecha = re.search(r"I(\d{8})", nombre_archivo_csv_at)
-                    coincidencia_fecha_dd_mm_yyyy = re.search(r"(\d{2})-(\d{2})-(\d{4})", nombre_archivo_csv_at)
-                    mes_reporte = "Desconocido"
-                    if coincidencia_fecha:
-                        fecha_str = coincidencia_fecha.group(1)
-                        anio = fecha_str[:4]
-                        mes = fecha_str[4:6]
-                        mes_reporte = f"{mes}_{anio}"
-                    elif coincidencia_fecha_dd_mm_yyyy:
-                        dia = coincidencia_fecha_dd_mm_yyyy.group(1)
-                        mes = coincidencia_fecha_dd_mm_yyyy.group(2)
-                        anio = coincidencia_fecha_dd_mm_yyyy.group(3)
-                        mes_reporte = f"{mes}_{anio}"
-                    primera_linea = infile_latin.readline().strip()
-                    cabecera = primera_linea.split(antiguo_separador)
-                    nueva_cabecera = ["nombre_archivo", "mes_reporte"] + cabecera
-                    outfile.write(nuevo_separador.join(nueva_cabecera) + "\n")
-                    for line in infile_latin:
-                        campos = line.strip().split(antiguo_separador)
-                        nueva_linea = [
-                            os.path.basename(nombre_archivo_csv_at),
-                            mes_reporte,
-                        ] + campos
-                        outfile.write(nuevo_separador.join(nueva_linea) + "\n")
-                archivos_convertidos.append(archivo_salida)
-            except Exception as e_latin:
-                continue
-        except Exception as e:
             continue
-    if not archivos_convertidos:
-        return JSONResponse(
-            status_code=400, content={"error": "No se pudo convertir ningún archivo."}
-        )
-    # Crear ZIP
-    zip_path = os.path.join(temp_dir, "csv_convertidos.zip")
-    with zipfile.ZipFile(zip_path, "w") as zipf:
-        for file in archivos_convertidos:
-            zipf.write(file, os.path.basename(file))
-    return FileResponse(
-        zip_path, filename="csv_convertidos.zip", media_type="application/zip"
+    return convertir(candidatas[-1])
+
+
+def _escribir_csv(df: pd.DataFrame, archivo_salida: str, separador: str) -> None:
+    """
+    Escribe el DataFrame como CSV UTF-8 sin índice.
+
+    Si pyarrow está instalado y todas las columnas son texto, las filas se
+    escriben con pyarrow.csv (C++ multihilo). Se usa quoting_style="none",
+    así que si algún valor necesitara comillas pyarrow falla y se vuelve a
+    escribir con DataFrame.to_csv, que produce exactamente la misma salida
+    en el caso sin comillas.
+    """
+    if len(separador) == 1 and len(df.columns) > 1 and all(tipo == object for tipo in df.dtypes):
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+
+            tabla = pa.Table.from_pandas(df, preserve_index=False)
+            with open(archivo_salida, "wb") as f:
+                # La cabecera la escribe pandas para mantener su formato
+                f.write(df.iloc[:0].to_csv(index=False, sep=separador).encode("utf-8"))
+                pa_csv.write_csv(
+                    tabla,
+                    f,
+                    write_options=pa_csv.WriteOptions(
+                        include_header=False, delimiter=separador, quoting_style="none"
+                    ),
+                )
+            return
+        except ImportError:
+            pass
+        except Exception:
+            # Valores que requieren comillas o tipos mixtos: usar pandas
+            pass
+    df.to_csv(archivo_salida, index=False, sep=separador, encoding="utf-8")
+
+
+def _convertir_csv_con_columnas(
+    nombre_archivo_csv_at: str, temp_dir: str, antiguo_separador: str, nuevo_separador: str
+):
+    """Convierte un CSV del servidor agregando nombre_archivo y mes_reporte"""
+    if not os.path.exists(nombre_archivo_csv_at):
+        return None
+    nombre_archivo_base, _ = os.path.splitext(
+        os.path.basename(nombre_archivo_csv_at)
+    )
+    nombre_archivo_csv = nombre_archivo_base + ".csv"
+    archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
+    coincidencia_fecha = _RE_FECHA_I.search(nombre_archivo_csv_at)
+    coincidencia_fecha_dd_mm_yyyy = _RE_FECHA_DD_MM_YYYY.search(nombre_archivo_csv_at)
+    mes_reporte = "Desconocido"
+    if coincidencia_fecha:
+        fecha_str = coincidencia_fecha.group(1)
+        anio = fecha_str[:4]
+        mes = fecha_str[4:6]
+        mes_reporte = f"{mes}_{anio}"
+    elif coincidencia_fecha_dd_mm_yyyy:
+        mes = coincidencia_fecha_dd_mm_yyyy.group(2)
+        anio = coincidencia_fecha_dd_mm_yyyy.group(3)
+        mes_reporte = f"{mes}_{anio}"
+    # El prefijo es igual para todas las líneas del archivo
+    prefijo = nuevo_separador.join(
+        [os.path.basename(nombre_archivo_csv_at), mes_reporte, ""]
     )
 
+    def _escribir(codificacion: str) -> None:
+        with open(
+            nombre_archivo_csv_at, "r", newline="", encoding=codificacion
+        ) as infile, open(
+            archivo_salida, "w", newline="", encoding="utf-8"
+        ) as outfile:
+            # Cambiar el separador con str.replace (equivale a split + join
+            # pero sin crear la lista de campos por cada línea)
+            primera_linea = infile.readline().strip()
+            outfile.write(
+                nuevo_separador.join(["nombre_archivo", "mes_reporte"])
+                + nuevo_separador
+                + primera_linea.replace(antiguo_separador, nuevo_separador)
+                + "\n"
+            )
+            # Una sola escritura por bloque de líneas de ~1 MB
+            while bloque := infile.readlines(TAMANO_BLOQUE):
+                outfile.write("".join([
+                    prefijo + line.strip().replace(antiguo_separador, nuevo_separador) + "\n"
+                    for line in bloque
+                ]))
+
+    try:
+        _convertir_con_codificacion(nombre_archivo_csv_at, _escribir)
+        return archivo_salida
+    except Exception as e:
+        return None
+
+
+@router.post("/csv-a-otro-separador/")
+async def csv_a_otro_separador(body: dict = Body(...)):
+    """Convierte archivos CSV de un separador a otro"""
+    lista_archivos_csv_at = body.get("lista_archivos_csv_at", [])
+    antiguo_separador = body.get("antiguo_separador", "|@")
+    nuevo_separador = body.get("nuevo_separador", "|")
+
+    with _directorio_peticion() as temp_dir:
+        archivos_convertidos = await _procesar_en_paralelo(
+            _convertir_csv_con_columnas,
+            [
+                (nombre_archivo_csv_at, temp_dir, antiguo_separador, nuevo_separador)
+                for nombre_archivo_csv_at in lista_archivos_csv_at
+            ],
+        )
+        if not archivos_convertidos:
+            eliminar_directorio(temp_dir)
+            return JSONResponse(
+                status_code=400, content={"error": "No se pudo convertir ningún archivo."}
+            )
+        # Enviar ZIP
+        return respuesta_zip(archivos_convertidos, "csv_convertidos.zip", temp_dir)
+
+
+def _convertir_csv_simple(
+    temp_input_path: str, nombre_archivo: str, temp_dir: str,
+    antiguo_separador: str, nuevo_separador: str
+):
+    """Cambia el separador de un CSV subido sin agregar columnas"""
+    try:
+        # Crear nombre del archivo de salida
+        nombre_archivo_base, _ = os.path.splitext(os.path.basename(nombre_archivo))
+        nombre_archivo_csv = nombre_archivo_base + ".csv"
+        archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
+
+        def _escribir(codificacion: str) -> None:
+            # Leer por bloques de líneas completas (newline="\n": las líneas
+            # solo se cortan en "\n"); en cada bloque se quitan las líneas
+            # vacías y se cambia el separador con un único str.replace
+            with open(
+                temp_input_path, "r", newline="\n", encoding=codificacion
+            ) as infile, open(archivo_salida, "w", newline="", encoding="utf-8") as outfile:
+                while bloque := infile.readlines(TAMANO_BLOQUE):
+                    lineas = [linea.strip() for linea in bloque]
+                    salida = "\n".join(filter(None, lineas))
+                    if salida:
+                        outfile.write(salida.replace(antiguo_separador, nuevo_separador))
+                        outfile.write("\n")
+
+        _convertir_con_codificacion(temp_input_path, _escribir)
+
+        return archivo_salida
+
+    except Exception as e:
+        print(f"Error procesando {nombre_archivo}: {str(e)}")
+        return None
+
 
 @router.post("/csv-a-otro-separador-upload-simple/")
-def csv_a_otro_separador_upload_simple(
+async def csv_a_otro_separador_upload_simple(
     files: list[UploadFile] = File(...),
     antiguo_separador: str = Form("|@"),
     nuevo_separador: str = Form("|"),
 ):
     """Convierte archivos CSV subidos de un separador a otro (sin columnas adicionales)"""
-    temp_dir = tempfile.mkdtemp()
-    archivos_convertidos = []
-    
-    for file in files:
-        try:
-            # Leer el contenido del archivo directamente desde el UploadFile
-            contenido = file.file.read()
-            
-            # Crear archivo temporal de entrada
-            temp_input_path = os.path.join(temp_dir, file.filename)
-            with open(temp_input_path, "wb") as f:
-                f.write(contenido)
-            
-            # Crear nombre del archivo de salida
-            nombre_archivo_base, _ = os.path.splitext(os.path.basename(file.filename))
-            nombre_archivo_csv = nombre_archivo_base + ".csv"
-            archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
-            
-            # Procesar el archivo con manejo de codificación
-            try:
-                # Intentar con UTF-8 primero
-                with open(temp_input_path, "r", newline="", encoding="utf-8") as infile:
-                    contenido_archivo = infile.read()
-            except UnicodeDecodeError:
-                try:
-                    # Intentar con latin-1
-                    with open(temp_input_path, "r", newline="", encoding="latin-1") as infile:
-                        contenido_archivo = infile.read()
-                except UnicodeDecodeError:
-                    # Intentar con cp1252
-                    with open(temp_input_path, "r", newline="", encoding="cp1252") as infile:
-                        contenido_archivo = infile.read()
-            
-            # Procesar línea por línea
-            with open(archivo_salida, "w", newline="", encoding="utf-8") as outfile:
-                lineas = contenido_archivo.split('\n')
-                for linea in lineas:
-                    if linea.strip():  # Solo procesar líneas no vacías
-                        campos = linea.strip().split(antiguo_separador)
-                        nueva_linea = nuevo_separador.join(campos)
-                        outfile.write(nueva_linea + "\n")
-            
-            archivos_convertidos.append(archivo_salida)
-            
-        except Exception as e:
-            print(f"Error procesando {file.filename}: {str(e)}")
-            continue
-    
-    if not archivos_convertidos:
+    # Un separador vacío coincide entre cada par de caracteres
+    if not antiguo_separador:
         return JSONResponse(
-            status_code=400, 
-            content={"error": "No se pudo convertir ningún archivo. Verifique que los archivos no estén vacíos y tengan el formato correcto."}
+            status_code=400, content={"error": "El separador antiguo no puede estar vacío."}
         )
-    
-    # Crear ZIP
-    zip_path = os.path.join(temp_dir, "csv_convertidos.zip")
-    with zipfile.ZipFile(zip_path, "w") as zipf:
-        for archivo in archivos_convertidos:
-            zipf.write(archivo, os.path.basename(archivo))
-    
-    return FileResponse(
-        zip_path, 
-        filename="csv_convertidos.zip", 
-        media_type="application/zip"
-    )
+
+    with _directorio_peticion() as temp_dir:
+        # Las entradas van en un subdirectorio: la salida se llama igual (.csv)
+        # y se escribe mientras se lee la entrada
+        dir_entrada = os.path.join(temp_dir, "entrada")
+        os.makedirs(dir_entrada)
+
+        # Guardar los archivos subidos en disco por bloques
+        rutas_entrada = []
+        for file in files:
+            temp_input_path = os.path.join(dir_entrada, file.filename)
+            await run_in_threadpool(_guardar_upload, file, temp_input_path)
+            rutas_entrada.append((temp_input_path, file.filename))
+
+        archivos_convertidos = await _procesar_en_paralelo(
+            _convertir_csv_simple,
+            [
+                (temp_input_path, nombre_archivo, temp_dir, antiguo_separador, nuevo_separador)
+                for temp_input_path, nombre_archivo in rutas_entrada
+            ],
+        )
+
+        if not archivos_convertidos:
+            eliminar_directorio(temp_dir)
+            return JSONResponse(
+                status_code=400,
+                content={"error": "No se pudo convertir ningún archivo. Verifique que los archivos no estén vacíos y tengan el formato correcto."}
+            )
+
+        # Enviar ZIP
+        return respuesta_zip(archivos_convertidos, "csv_convertidos.zip", temp_dir)
+
+
+def _convertir_csv_upload(
+    temp_input_path: str, nombre_archivo: str, temp_dir: str,
+    antiguo_separador: str, nuevo_separador: str
+):
+    """Cambia el separador de un CSV subido agregando NOMBRE_ARCHIVO y MES_REPORTE"""
+    try:
+        # Crear nombre del archivo de salida
+        nombre_archivo_base, _ = os.path.splitext(os.path.basename(nombre_archivo))
+        nombre_archivo_csv = nombre_archivo_base + ".csv"
+        archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
+
+        # Extraer información del nombre del archivo
+        coincidencia_fecha = _RE_FECHA_I.search(nombre_archivo)
+        mes_reporte = "Desconocido"
+        if coincidencia_fecha:
+            fecha_str = coincidencia_fecha.group(1)
+            anio = fecha_str[:4]
+            mes = fecha_str[4:6]
+            mes_reporte = f"{mes}_{anio}"
+
+        def _escribir(codificacion: str) -> None:
+            # Procesar línea por línea leyendo el archivo de forma perezosa
+            # (newline="\n": las líneas solo se cortan en "\n", como antes)
+            with open(
+                temp_input_path, "r", newline="\n", encoding=codificacion
+            ) as infile, open(archivo_salida, "w", newline="", encoding="utf-8") as outfile:
+                # Cabecera: primera línea no vacía
+                for linea in infile:
+                    if linea.strip():
+                        cabecera = linea.strip().replace(antiguo_separador, nuevo_separador)
+                        nueva_cabecera = nuevo_separador.join(["NOMBRE_ARCHIVO", "MES_REPORTE", cabecera])
+                        outfile.write(nueva_cabecera + "\n")
+                        break
+
+                # Datos: se leen bloques de líneas de ~1 MB y cada bloque se
+                # escribe con una sola llamada, omitiendo las líneas vacías
+                prefijo = nuevo_separador.join([nombre_archivo, mes_reporte, ""])
+                while bloque := infile.readlines(TAMANO_BLOQUE):
+                    lineas = [linea.strip() for linea in bloque]
+                    outfile.write("".join([
+                        prefijo + linea.replace(antiguo_separador, nuevo_separador) + "\n"
+                        for linea in lineas if linea
+                    ]))
+
+        _convertir_con_codificacion(temp_input_path, _escribir)
+
+        return archivo_salida
+
+    except Exception as e:
+        print(f"Error procesando {nombre_archivo}: {str(e)}")
+        return None
 
 
 @router.post("/csv-a-otro-separador-upload/")
-def csv_a_otro_separador_upload(
+async def csv_a_otro_separador_upload(
     files: list[UploadFile] = File(...),
     antiguo_separador: str = Form("|@"),
     nuevo_separador: str = Form("|"),
 ):
     """Convierte archivos CSV subidos de un separador a otro"""
-    temp_dir = tempfile.mkdtemp()
-    archivos_convertidos = []
-    
-    for file in files:
-        try:
-            # Leer el contenido del archivo directamente desde el UploadFile
-            contenido = file.file.read()
-            
-            # Crear archivo temporal de entrada
-            temp_input_path = os.path.join(temp_dir, file.filename)
-            with open(temp_input_path, "wb") as f:
-                f.write(contenido)
-            
-            # Crear nombre del archivo de salida
-            nombre_archivo_base, _ = os.path.splitext(os.path.basename(file.filename))
-            nombre_archivo_csv = nombre_archivo_base + ".csv"
-            archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
-            
-            # Procesar el archivo con manejo de codificación
-            try:
-                # Intentar con UTF-8 primero
-                with open(temp_input_path, "r", newline="", encoding="utf-8") as infile:
-                    contenido_archivo = infile.read()
-            except UnicodeDecodeError:
-                try:
-                    # Intentar con latin-1
-                    with open(temp_input_path, "r", newline="", encoding="latin-1") as infile:
-                        contenido_archivo = infile.read()
-                except UnicodeDecodeError:
-                    # Intentar con cp1252
-                    with open(temp_input_path, "r", newline="", encoding="cp1252") as infile:
-                        contenido_archivo = infile.read()
-            
-            # Extraer información del nombre del archivo
-            coincidencia_fecha = re.search(r"I(\d{8})", file.filename)
-            mes_reporte = "Desconocido"
-            if coincidencia_fecha:
-                fecha_str = coincidencia_fecha.group(1)
-                anio = fecha_str[:4]
-                mes = fecha_str[4:6]
-                mes_reporte = f"{mes}_{anio}"
-            
-            # Procesar línea por línea
-            with open(archivo_salida, "w", newline="", encoding="utf-8") as outfile:
-                lineas = contenido_archivo.split('\n')
-                primera_linea = True
-                
-                for linea in lineas:
-                    if linea.strip():  # Solo procesar líneas no vacías
-                        if primera_linea:
-                            # Procesar cabecera
-                            cabecera = linea.strip().split(antiguo_separador)
-                            nueva_cabecera = ["NOMBRE_ARCHIVO", "MES_REPORTE"] + cabecera
-                            outfile.write(nuevo_separador.join(nueva_cabecera) + "\n")
-                            primera_linea = False
-                        else:
-                            # Procesar datos
-                            campos = linea.strip().split(antiguo_separador)
-                            nueva_linea = [file.filename, mes_reporte] + campos
-                            outfile.write(nuevo_separador.join(nueva_linea) + "\n")
-            
-            archivos_convertidos.append(archivo_salida)
-            
-        except Exception as e:
-            print(f"Error procesando {file.filename}: {str(e)}")
-            continue
-    
-    if not archivos_convertidos:
-        return JSONResponse(
-            status_code=400, 
-            content={"error": "No se pudo convertir ningún archivo. Verifique que los archivos no estén vacíos y tengan el formato correcto."}
+    with _directorio_peticion() as temp_dir:
+        # Las entradas van en un subdirectorio: la salida se llama igual (.csv)
+        # y se escribe mientras se lee la entrada
+        dir_entrada = os.path.join(temp_dir, "entrada")
+        os.makedirs(dir_entrada)
+
+        # Guardar los archivos subidos en disco por bloques
+        rutas_entrada = []
+        for file in files:
+            temp_input_path = os.path.join(dir_entrada, file.filename)
+            await run_in_threadpool(_guardar_upload, file, temp_input_path)
+            rutas_entrada.append((temp_input_path, file.filename))
+
+        archivos_convertidos = await _procesar_en_procesos(
+            _convertir_csv_upload,
+            [
+                (temp_input_path, nombre_archivo, temp_dir, antiguo_separador, nuevo_separador)
+                for temp_input_path, nombre_archivo in rutas_entrada
+            ],
         )
-    
-    # Crear ZIP
-    zip_path = os.path.join(temp_dir, "csv_otro_separador.zip")
-    with zipfile.ZipFile(zip_path, "w") as zipf:
-        for archivo in archivos_convertidos:
-            zipf.write(archivo, os.path.basename(archivo))
-    
-    return FileResponse(
-        zip_path, 
-        filename="csv_otro_separador.zip", 
-        media_type="application/zip"
-    )
+
+        if not archivos_convertidos:
+            eliminar_directorio(temp_dir)
+            return JSONResponse(
+                status_code=400,
+                content={"error": "No se pudo convertir ningún archivo. Verifique que los archivos no estén vacíos y tengan el formato correcto."}
+            )
+
+        # Enviar ZIP
+        return respuesta_zip(archivos_convertidos, "csv_otro_separador.zip", temp_dir)
+
+
+def _convertir_sav(temp_input_path: str, nombre_archivo: str, temp_dir: str):
+    """Convierte un archivo .sav a CSV separado por '|'"""
+    try:
+        nombre_archivo_base, _ = os.path.splitext(os.path.basename(nombre_archivo))
+        nombre_archivo_csv = nombre_archivo_base + ".csv"
+        archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
+        # Leer el .sav por bloques para no cargarlo completo en memoria
+        # (mismas opciones que pd.read_spss: etiquetas de valores aplicadas)
+        lector = pyreadstat.read_file_in_chunks(
+            pyreadstat.read_sav, temp_input_path,
+            chunksize=FILAS_POR_BLOQUE_SAV, apply_value_formats=True
+        )
+        with open(archivo_salida, "w", newline="", encoding="utf-8") as outfile:
+            primer_bloque = True
+            for df, _ in lector:
+                df.to_csv(outfile, index=False, sep="|", header=primer_bloque)
+                primer_bloque = False
+            if primer_bloque:
+                # Archivo sin filas: escribir solo la cabecera
+                df, _ = pyreadstat.read_sav(temp_input_path, metadataonly=True)
+                df.to_csv(outfile, index=False, sep="|")
+        return archivo_salida
+    except Exception as e:
+        return None
 
 
 @router.post("/sav-a-csv-upload/")
-def sav_a_csv_upload(files: list[UploadFile] = File(...)):
+async def sav_a_csv_upload(files: list[UploadFile] = File(...)):
     """Convierte archivos .sav a CSV"""
-    temp_dir = tempfile.mkdtemp()
-    archivos_convertidos = []
-    for file in files:
-        # Guardar archivo temporalmente
-        temp_input_path = os.path.join(temp_dir, file.filename)
-        with open(temp_input_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-        try:
-            nombre_archivo_base, _ = os.path.splitext(os.path.basename(file.filename))
-            nombre_archivo_csv = nombre_archivo_base + ".csv"
-            archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
-            df = pd.read_spss(temp_input_path)
-            df.to_csv(archivo_salida, index=False, sep="|")
-            archivos_convertidos.append(archivo_salida)
-        except Exception as e:
-            continue
-    if not archivos_convertidos:
-        return JSONResponse(
-            status_code=400,
-            content={"error": "No se pudo convertir ningún archivo .sav."},
+    with _directorio_peticion() as temp_dir:
+        rutas_entrada = []
+        for file in files:
+            # Guardar archivo temporalmente
+            temp_input_path = os.path.join(temp_dir, file.filename)
+            await run_in_threadpool(_guardar_upload, file, temp_input_path)
+            rutas_entrada.append((temp_input_path, file.filename))
+        archivos_convertidos = await _procesar_en_procesos(
+            _convertir_sav,
+            [
+                (temp_input_path, nombre_archivo, temp_dir)
+                for temp_input_path, nombre_archivo in rutas_entrada
+            ],
         )
-    # Crear ZIP
-    zip_path = os.path.join(temp_dir, "csv_convertidos.zip")
-    with zipfile.ZipFile(zip_path, "w") as zipf:
-        for file in archivos_convertidos:
-            zipf.write(file, os.path.basename(file))
-    return FileResponse(
-        zip_path, filename="csv_convertidos.zip", media_type="application/zip"
-    )
+        if not archivos_convertidos:
+            eliminar_directorio(temp_dir)
+            return JSONResponse(
+                status_code=400,
+                content={"error": "No se pudo convertir ningún archivo .sav."},
+            )
+        # Enviar ZIP
+        return respuesta_zip(archivos_convertidos, "csv_convertidos.zip", temp_dir)
+
+
+def _convertir_txt(temp_input_path: str, nombre_archivo: str, temp_dir: str):
+    """Copia un archivo .txt con extensión .csv (sin modificar su contenido)"""
+    try:
+        # Limpiar el nombre del archivo de extensiones extrañas
+        nombre_archivo = os.path.basename(nombre_archivo)
+
+        # Remover todas las extensiones .txt, .TXT, .txt.txt, etc.
+        nombre_limpio = nombre_archivo
+        while True:
+            nombre_anterior = nombre_limpio
+            # Remover extensiones .txt y .TXT (case insensitive)
+            nombre_limpio = _RE_EXTENSION_TXT.sub('', nombre_limpio)
+            # Remover puntos dobles al final
+            nombre_limpio = _RE_PUNTOS_FINALES.sub('', nombre_limpio)
+            # Si no cambió nada, salir del bucle
+            if nombre_limpio == nombre_anterior:
+                break
+
+        # Agregar extensión .csv
+        nombre_archivo_csv = nombre_limpio + ".csv"
+        archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
+
+        # Copiar el archivo sin modificar, solo cambiar nombre
+        shutil.copy2(temp_input_path, archivo_salida)
+        return archivo_salida
+    except Exception as e:
+        return None
 
 
 @router.post("/txt-a-csv-upload/")
-def txt_a_csv_upload(
+async def txt_a_csv_upload(
     files: list[UploadFile] = File(...),
 ):
     """Convierte archivos .txt a CSV (solo cambia la extensión)"""
-    temp_dir = tempfile.mkdtemp()
-    archivos_convertidos = []
-    for file in files:
-        # Guardar archivo temporalmente
-        temp_input_path = os.path.join(temp_dir, file.filename)
-        with open(temp_input_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-        try:
-            # Limpiar el nombre del archivo de extensiones extrañas
-            nombre_archivo = os.path.basename(file.filename)
-            
-            # Remover todas las extensiones .txt, .TXT, .txt.txt, etc.
-            nombre_limpio = nombre_archivo
-            while True:
-                nombre_anterior = nombre_limpio
-                # Remover extensiones .txt y .TXT (case insensitive)
-                nombre_limpio = re.sub(r'\.(txt|TXT)(\.txt|\.TXT)*$', '', nombre_limpio)
-                # Remover puntos dobles al final
-                nombre_limpio = re.sub(r'\.+$', '', nombre_limpio)
-                # Si no cambió nada, salir del bucle
-                if nombre_limpio == nombre_anterior:
-                    break
-            
-            # Agregar extensión .csv
-            nombre_archivo_csv = nombre_limpio + ".csv"
-            archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
-            
-            # Copiar el archivo sin modificar, solo cambiar nombre
-            shutil.copy2(temp_input_path, archivo_salida)
-            archivos_convertidos.append(archivo_salida)
-        except Exception as e:
-            continue
-    if not archivos_convertidos:
-        return JSONResponse(
-            status_code=400,
-            content={"error": "No se pudo convertir ningún archivo .txt."},
+    with _directorio_peticion() as temp_dir:
+        rutas_entrada = []
+        for file in files:
+            # Guardar archivo temporalmente
+            temp_input_path = os.path.join(temp_dir, file.filename)
+            await run_in_threadpool(_guardar_upload, file, temp_input_path)
+            rutas_entrada.append((temp_input_path, file.filename))
+        archivos_convertidos = await _procesar_en_paralelo(
+            _convertir_txt,
+            [
+                (temp_input_path, nombre_archivo, temp_dir)
+                for temp_input_path, nombre_archivo in rutas_entrada
+            ],
         )
-    # Crear ZIP
-    zip_path = os.path.join(temp_dir, "csv_convertidos.zip")
-    with zipfile.ZipFile(zip_path, "w") as zipf:
-        for file in archivos_convertidos:
-            zipf.write(file, os.path.basename(file))
-    return FileResponse(
-        zip_path, filename="csv_convertidos.zip", media_type="application/zip"
-    )
+        if not archivos_convertidos:
+            eliminar_directorio(temp_dir)
+            return JSONResponse(
+                status_code=400,
+                content={"error": "No se pudo convertir ningún archivo .txt."},
+            )
+        # Enviar ZIP
+        return respuesta_zip(archivos_convertidos, "csv_convertidos.zip", temp_dir)
 
 
-@router.post("/xlsx-a-csv-con-columna-mes-de-reporte-upload/")
-def xlsx_a_csv_upload(
-    files: list[UploadFile] = File(...), 
-    separador_salida: str = Form("|"),
-    fila_inicio: int = Form(1)
+def _convertir_xlsx_con_mes_reporte(
+    temp_input_path: str, nombre_archivo: str, temp_dir: str,
+    separador_salida: str, fila_inicio: int
 ):
-    """Convierte archivos .xlsx a CSV con columna de mes de reporte"""
-    temp_dir = tempfile.mkdtemp()
-    archivos_convertidos = []
-    MESES = {
-        "Enero": "01",
-        "Febrero": "02",
-        "Marzo": "03",
-        "Abril": "04",
-        "Mayo": "05",
-        "Junio": "06",
-        "Julio": "07",
-        "Agosto": "08",
-        "Septiembre": "09",
-        "Octubre": "10",
-        "Noviembre": "11",
-        "Diciembre": "12",
-    }
-    MESES_LOWER = {
-        "enero": "1",
-        "febrero": "2",
-        "marzo": "3",
-        "abril": "4",
-        "mayo": "5",
-        "junio": "6",
-        "julio": "7",
-        "agosto": "8",
-        "septiembre": "9",
-        "octubre": "10",
-        "noviembre": "11",
-        "diciembre": "12",
-    }
-    for file in files:
-        temp_input_path = os.path.join(temp_dir, file.filename)
-        with open(temp_input_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-        try:
-            nombre_archivo_base, _ = os.path.splitext(os.path.basename(file.filename))
-            
-            nombre_archivo_csv = (
-                nombre_archivo_base.replace(" ", "_")
-                .replace("de_", "")
-                .replace("de", "")
-                .replace(".", "_")
-                + ".csv"
-            )
-            
-            archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
-            coincidencia = re.search(r"Mes_([A-Za-z]+)_(\d{4})", nombre_archivo_csv)
-            coincidencia_2 = re.search(
-                r"Mes_de_([A-Za-z]+)_de_(\d{4})", nombre_archivo_csv
-            )
-            
-            coincidencia_fecha = re.search(r"I(\d{8})", nombre_archivo_csv)
-            coincidencia_pqr = re.search(r"(\d{4})-(\d{2})", nombre_archivo_csv)
-            coincidencia_dynamics = re.search(r"_(\w+)_(\d{4})_", nombre_archivo_csv)
-            coincidencia_fecha_dd_mm_yyyy = re.search(r"(\d{2})-(\d{2})-(\d{4})", nombre_archivo_csv)
-            coincidencia_dd_mes_aaaa = re.search(r"(\d{2})_([a-zA-Z]+)_(\d{4})", nombre_archivo_csv)
-            mes_reporte = "Desconocido"
-            
-            if coincidencia_dd_mes_aaaa:
-                dia = coincidencia_dd_mes_aaaa.group(1)
-                mes_nombre = coincidencia_dd_mes_aaaa.group(2).lower()
-                anio = coincidencia_dd_mes_aaaa.group(3)
-                mes_numero = MESES_LOWER.get(mes_nombre)
-                if mes_numero:
-                    mes_reporte = f"{mes_numero}_{anio}"
-            elif coincidencia:
-                mes_nombre = coincidencia.group(1).capitalize()
-                anio = coincidencia.group(2)
-                mes_numero = MESES.get(mes_nombre)
-                if mes_numero:
-                    mes_reporte = f"{mes_numero}_{anio}"
-            elif coincidencia_2:
-                mes_nombre = coincidencia_2.group(1).capitalize()
-                anio = coincidencia_2.group(2)
-                mes_numero = MESES.get(mes_nombre)
-                if mes_numero:
-                    mes_reporte = f"{mes_numero}_{anio}"
-            elif coincidencia_fecha:
-                fecha_str = coincidencia_fecha.group(1)
-                anio = fecha_str[:4]
-                mes = fecha_str[4:6]
-                mes_reporte = f"{mes}_{anio}"
-            elif coincidencia_dynamics:
-                mes_nombre = coincidencia_dynamics.group(1).lower()
-                anio = coincidencia_dynamics.group(2)
-                mes_numero = MESES_LOWER.get(mes_nombre)
-                if mes_numero:
-                    mes_reporte = f"{mes_numero}_{anio}"
-            elif coincidencia_pqr:
-                anio = coincidencia_pqr.group(1)
-                mes_numero = coincidencia_pqr.group(2)
-                mes_numero_sin_cero = str(int(mes_numero))
-                mes_reporte = f"{mes_numero_sin_cero}_{anio}"
-            elif coincidencia_fecha_dd_mm_yyyy:
-                dia = coincidencia_fecha_dd_mm_yyyy.group(1)
-                mes = coincidencia_fecha_dd_mm_yyyy.group(2)
-                anio = coincidencia_fecha_dd_mm_yyyy.group(3)
-                mes_reporte = f"{dia}-{mes}-{anio}"
-            
-            df = pd.read_excel(temp_input_path, dtype=str)
-            if not df.empty and len(df) > 0 and fila_inicio > 0:
-                df = df.iloc[fila_inicio:]
-            
-            for col in df.columns:
-                df[col] = df[col].astype(str).apply(lambda x: 
-                    x.replace('.0', '') if x.endswith('.0') and x.replace('.0', '').isdigit() 
-                    else x
-                )
-            
-            # Detectar y convertir fechas de Excel
-            for col in df.columns:
-                sample_values = df[col].dropna().head(10)
-                if len(sample_values) > 0:
-                    fecha_pattern_iso = r'^\d{4}-\d{2}-\d{2}.*$'
-                    
-                    fecha_pattern_excel = r'^\d{1,6}$'
-                    
-                    col_name_lower = col.lower()
-                    is_likely_date_column = any(keyword in col_name_lower for keyword in [
-                        'fecha', 'fechas', 'date', 'programacion', 'programaciones', 'programación', 'inicio', 'fin', 'vencimiento','vencimientos',
-                        'creacion', 'creación', 'modificacion', 'modificación', 'ingreso', 'terminado', 'terminados'
-                    ])
-                    
-                    if is_likely_date_column:
-                        print(f"🔍 Columna '{col}': Probablemente contiene fechas")
-                        
-                        # Verificar formato ISO
-                        if any(re.match(fecha_pattern_iso, str(val)) for val in sample_values):
+    """Convierte un .xlsx a CSV agregando nombre_archivo y mes_reporte"""
+    try:
+        nombre_archivo_base, _ = os.path.splitext(os.path.basename(nombre_archivo))
+
+        nombre_archivo_csv = _nombre_csv_limpio(nombre_archivo_base)
+
+        archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
+        mes_reporte = _extraer_mes_reporte(nombre_archivo_csv)
+
+        df = pd.read_excel(temp_input_path, dtype=str, engine=_MOTOR_EXCEL)
+        if not df.empty and len(df) > 0 and fila_inicio > 0:
+            df = df.iloc[fila_inicio:]
+
+        # Quitar el '.0' de los enteros leídos como flotantes (operaciones
+        # vectorizadas de .str en lugar de una lambda por celda)
+        for col in df.columns:
+            valores = df[col].astype(str)
+            sin_cero = valores.str.replace('.0', '', regex=False)
+            es_entero = valores.str.endswith('.0') & sin_cero.str.isdigit()
+            df[col] = sin_cero.where(es_entero, valores)
+
+        # Detectar y convertir fechas de Excel
+        for col in df.columns:
+            sample_values = df[col].dropna().head(10).astype(str)
+            if len(sample_values) > 0:
+                col_name_lower = col.lower()
+                is_likely_date_column = _RE_PALABRAS_FECHA.search(col_name_lower) is not None
+
+                if is_likely_date_column:
+                    print(f"🔍 Columna '{col}': Probablemente contiene fechas")
+
+                    # Verificar formato ISO
+                    if sample_values.str.match(_RE_FECHA_ISO).any():
+                        try:
+                            df[col] = pd.to_datetime(df[col], errors='coerce').dt.strftime('%d/%m/%Y')
+                            df[col] = df[col].fillna('')
+                            print(f"   ✅ {col}: Convertido de ISO a DD/MM/YYYY")
+                        except:
+                            pass
+
+                    # Verificar formato Excel (solo si es probable que sea fecha)
+                    elif (coincide_excel := sample_values.str.match(_RE_FECHA_EXCEL)).any():
+                        all_in_range = bool(
+                            coincide_excel.all() and
+                            pd.to_numeric(sample_values).between(1, 999999).all()
+                        )
+
+                        if all_in_range:
                             try:
-                                df[col] = pd.to_datetime(df[col], errors='coerce').dt.strftime('%d/%m/%Y')
+                                numeric_values = pd.to_numeric(df[col], errors='coerce')
+                                df[col] = pd.to_datetime(numeric_values, unit='D', origin='1900-01-01', errors='coerce').dt.strftime('%d/%m/%Y')
                                 df[col] = df[col].fillna('')
-                                print(f"   ✅ {col}: Convertido de ISO a DD/MM/YYYY")
+                                print(f"   ✅ {col}: Convertido de Excel a DD/MM/YYYY")
                             except:
                                 pass
-                        
-                        # Verificar formato Excel (solo si es probable que sea fecha)
-                        elif any(re.match(fecha_pattern_excel, str(val)) for val in sample_values):
-                            all_in_range = all(
-                                re.match(fecha_pattern_excel, str(val)) and 
-                                1 <= int(float(str(val))) <= 999999 
-                                for val in sample_values
-                            )
-                            
-                            if all_in_range:
-                                try:
-                                    numeric_values = pd.to_numeric(df[col], errors='coerce')
-                                    df[col] = pd.to_datetime(numeric_values, unit='D', origin='1900-01-01', errors='coerce').dt.strftime('%d/%m/%Y')
-                                    df[col] = df[col].fillna('')
-                                    print(f"   ✅ {col}: Convertido de Excel a DD/MM/YYYY")
-                                except:
-                                    pass
-                    
-                    # Si NO es una columna de fechas, NO convertir números a fechas
-                    else:
-                        print(f"🔍 Columna '{col}': Probablemente NO contiene fechas")
-                        # Aquí NO se hace conversión de fechas, se mantienen como números
-            
-            for col in df.columns:
-                sample_values = df[col].dropna().head(10)
-                if len(sample_values) > 0:
-                    large_number_pattern = r'^\d{16,}$'
-                    
-                    if any(re.match(large_number_pattern, str(val)) for val in sample_values):
-                        df[col] = df[col].apply(lambda x: f"'{x}" if re.match(large_number_pattern, str(x)) else x)
-            
-            for col in df.columns:
-                df[col] = df[col].replace(['nan', 'NaN', 'NAN', 'None', 'none', 'NONE'], '')
-                df[col] = df[col].apply(lambda x: '' if str(x).strip() == '' else x)
-            
-            df.insert(0, "nombre_archivo", nombre_archivo_base)
-            df.insert(1, "mes_reporte", mes_reporte)
-            df.to_csv(
-                archivo_salida, index=False, sep=separador_salida, encoding="utf-8"
-            )
-            archivos_convertidos.append(archivo_salida)
-        except Exception as e:
-            continue
-    if not archivos_convertidos:
-        return JSONResponse(
-            status_code=400,
-            content={"error": "No se pudo convertir ningún archivo .xlsx."},
+
+                # Si NO es una columna de fechas, NO convertir números a fechas
+                else:
+                    print(f"🔍 Columna '{col}': Probablemente NO contiene fechas")
+                    # Aquí NO se hace conversión de fechas, se mantienen como números
+
+        # Números de 16 o más dígitos: se marcan con "'" para que no se
+        # pierda precisión al abrir el CSV (isdecimal equivale a \d)
+        for col in df.columns:
+            valores = df[col].astype(str)
+            es_grande = (valores.str.len() >= 16) & valores.str.isdecimal()
+            if es_grande.head(10).any():
+                df[col] = df[col].where(~es_grande, "'" + valores)
+
+        # Limpiar nulos textuales y celdas solo con espacios
+        df = df.replace(['nan', 'NaN', 'NAN', 'None', 'none', 'NONE'], '')
+        for col in df.columns:
+            en_blanco = df[col].astype(str).str.strip() == ''
+            df[col] = df[col].mask(en_blanco, '')
+
+        df.insert(0, "nombre_archivo", nombre_archivo_base)
+        df.insert(1, "mes_reporte", mes_reporte)
+        _escribir_csv(df, archivo_salida, separador_salida)
+        return archivo_salida
+    except Exception as e:
+        return None
+
+
+@router.post("/xlsx-a-csv-con-columna-mes-de-reporte-upload/")
+async def xlsx_a_csv_upload(
+    files: list[UploadFile] = File(...),
+    separador_salida: str = Form("|"),
+    fila_inicio: int = Form(1)
+):
+    """Convierte archivos .xlsx a CSV con columna de mes de reporte"""
+    with _directorio_peticion() as temp_dir:
+        rutas_entrada = []
+        for file in files:
+            temp_input_path = os.path.join(temp_dir, file.filename)
+            await run_in_threadpool(_guardar_upload, file, temp_input_path)
+            rutas_entrada.append((temp_input_path, file.filename))
+        archivos_convertidos = await _procesar_en_procesos(
+            _convertir_xlsx_con_mes_reporte,
+            [
+                (temp_input_path, nombre_archivo, temp_dir, separador_salida, fila_inicio)
+                for temp_input_path, nombre_archivo in rutas_entrada
+            ],
         )
-    # Crear ZIP
-    zip_path = os.path.join(temp_dir, "csv_convertidos.zip")
-    with zipfile.ZipFile(zip_path, "w") as zipf:
-        for file in archivos_convertidos:
-            zipf.write(file, os.path.basename(file))
-    return FileResponse(
-        zip_path, filename="csv_convertidos.zip", media_type="application/zip"
-    )
+        if not archivos_convertidos:
+            eliminar_directorio(temp_dir)
+            return JSONResponse(
+                status_code=400,
+                content={"error": "No se pudo convertir ningún archivo .xlsx."},
+            )
+        # Enviar ZIP
+        return respuesta_zip(archivos_convertidos, "csv_convertidos.zip", temp_dir)
+
+
+def _convertir_xlsx(
+    temp_input_path: str, nombre_archivo: str, temp_dir: str, separador_salida: str
+):
+    """Convierte un .xlsx a CSV sin columnas adicionales"""
+    try:
+        nombre_archivo_base, _ = os.path.splitext(os.path.basename(nombre_archivo))
+        nombre_archivo_csv = _nombre_csv_limpio(nombre_archivo_base)
+        archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
+        df = pd.read_excel(temp_input_path, engine=_MOTOR_EXCEL)
+        _escribir_csv(df, archivo_salida, separador_salida)
+        return archivo_salida
+    except Exception as e:
+        return None
 
 
 @router.post("/xlsx-a-csv-upload/")
-def xlsx_a_csv_con_columna_mes_de_reporte_upload(
+async def xlsx_a_csv_con_columna_mes_de_reporte_upload(
     files: list[UploadFile] = File(...), separador_salida: str = Form("|")
 ):
     """Convierte archivos .xlsx a CSV simple"""
-    temp_dir = tempfile.mkdtemp()
-    archivos_convertidos = []
-    for file in files:
-        temp_input_path = os.path.join(temp_dir, file.filename)
-        with open(temp_input_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-        try:
-            nombre_archivo_base, _ = os.path.splitext(os.path.basename(file.filename))
-            nombre_archivo_csv = (
-                nombre_archivo_base.replace(" ", "_")
-                .replace("de_", "")
-                .replace("de", "")
-                .replace(".", "_")
-                + ".csv"
-            )
-            archivo_salida = os.path.join(temp_dir, nombre_archivo_csv)
-            df = pd.read_excel(temp_input_path)
-            df.to_csv(
-                archivo_salida, index=False, sep=separador_salida, encoding="utf-8"
+    with _directorio_peticion() as temp_dir:
+        rutas_entrada = []
+        for file in files:
+            temp_input_path = os.path.join(temp_dir, file.filename)
+            await run_in_threadpool(_guardar_upload, file, temp_input_path)
+            rutas_entrada.append((temp_input_path, file.filename))
+        archivos_convertidos = await _procesar_en_procesos(
+            _convertir_xlsx,
+            [
+                (temp_input_path, nombre_archivo, temp_dir, separador_salida)
+                for temp_input_path, nombre_archivo in rutas_entrada
+            ],
+        )
+        if not archivos_convertidos:
+            eliminar_directorio(temp_dir)
+            return JSONResponse(
+                status_code=400,
+                content={"error": "No se pudo convertir ningún archivo .xlsx."},
             )
-            archivos_convertidos.append(archivo_salida)
+        # Enviar ZIP
+        return respuesta_zip(archivos_convertidos, "csv_convertidos.zip", temp_dir)
+
+
+def _unir_csv_en_xlsx(rutas_csv: list, archivo_excel_salida: str, separador_salida: str) -> None:
+    """
+    Escribe cada CSV en una o varias hojas de un mismo libro de Excel.
+
+    Usa el modo write_only de openpyxl: las filas se pasan directamente del
+    csv.reader a la hoja y se vuelcan a disco, sin armar un DataFrame.
+    """
+    max_filas = 1048576  # Límite de filas en Excel
+    libro = Workbook(write_only=True)
+    for ruta in rutas_csv:
+        hojas_archivo = []
+        try:
+            nombre_base = os.path.basename(ruta).replace(".csv", "")[:25]
+            with open(ruta, "r", encoding="utf-8") as archivo_csv:
+                lector_csv = csv.reader(archivo_csv, delimiter=separador_salida)
+                hoja = libro.create_sheet(f"{nombre_base}_part1"[:31])
+                hojas_archivo.append(hoja)
+                filas_hoja = 0
+                for fila in lector_csv:
+                    hoja.append(fila)
+                    filas_hoja += 1
+                    if filas_hoja == max_filas:
+                        # Continuar en una nueva hoja al llegar al límite
+                        nombre_hoja = f"{nombre_base}_part{len(hojas_archivo) + 1}"[:31]
+                        hoja = libro.create_sheet(nombre_hoja)
+                        hojas_archivo.append(hoja)
+                        filas_hoja = 0
         except Exception as e:
+            # Descartar las hojas parciales del archivo que falló
+            for hoja in hojas_archivo:
+                hoja.close()
+                libro.remove(hoja)
             continue
-    if not archivos_convertidos:
-        return JSONResponse(
-            status_code=400,
-            content={"error": "No se pudo convertir ningún archivo .xlsx."},
-        )
-    # Crear ZIP
-    zip_path = os.path.join(temp_dir, "csv_convertidos.zip")
-    with zipfile.ZipFile(zip_path, "w") as zipf:
-        for file in archivos_convertidos:
-            zipf.write(file, os.path.basename(file))
-    return FileResponse(
-        zip_path, filename="csv_convertidos.zip", media_type="application/zip"
-    )
+    if not libro.worksheets:
+        raise ValueError("No se pudo leer ningún archivo CSV")
+    libro.save(archivo_excel_salida)
 
 
 @router.post("/unir-archivos-csv-en-xlsx-upload/")
-def unir_archivos_csv_en_xlsx_upload(
+async def unir_archivos_csv_en_xlsx_upload(
     files: list[UploadFile] = File(...), separador_salida: str = Form("|")
 ):
     """Une archivos CSV en un archivo Excel"""
-    temp_dir = tempfile.mkdtemp()
-    rutas_csv = []
-    for file in files:
-        temp_input_path = os.path.join(temp_dir, file.filename)
-        with open(temp_input_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-        rutas_csv.append(temp_input_path)
-    archivo_excel_salida = os.path.join(temp_dir, "Consolidado_Final.xlsx")
+    with _directorio_peticion() as temp_dir:
+        rutas_csv = []
+        for file in files:
+            temp_input_path = os.path.join(temp_dir, file.filename)
+            await run_in_threadpool(_guardar_upload, file, temp_input_path)
+            rutas_csv.append(temp_input_path)
+        archivo_excel_salida = os.path.join(temp_dir, "Consolidado_Final.xlsx")
+        try:
+            await run_in_threadpool(
+                _unir_csv_en_xlsx, rutas_csv, archivo_excel_salida, separador_salida
+            )
+        except Exception as e:
+            eliminar_directorio(temp_dir)
+            return JSONResponse(status_code=500, content={"error": f"Error general: {e}"})
+        # Enviar ZIP
+        return respuesta_zip([archivo_excel_salida], "consolidado_xlsx.zip", temp_dir)
+
+
+def _extraer_texto_pdf(temp_input_path: str) -> str:
+    """
+    Extrae el texto de las páginas del PDF, separadas por una línea en blanco.
+    Usa PyMuPDF si está instalado y si no pdfplumber.
+    """
+    if fitz is not None:
+        with fitz.open(temp_input_path) as documento:
+            textos = [pagina.get_text() for pagina in documento]
+    else:
+        import pdfplumber
+        with pdfplumber.open(temp_input_path) as pdf:
+            textos = [page.extract_text() for page in pdf.pages]
+    return "".join(texto + "\n\n" for texto in textos if texto)
+
+
+def _imagenes_paginas_pdf(temp_input_path: str, num_hilos: int = 1) -> Iterator:
+    """
+    Imágenes (PIL, en escala de grises) de las páginas del PDF para OCR. Con
+    PyMuPDF cada página se renderiza al pedirla.
+
+    Sin PyMuPDF, pdf2image escribe las páginas en disco en lugar de tenerlas
+    todas en memoria y se devuelven sus rutas, que tesseract lee directamente.
+    Las páginas se convierten por bloques, así que el OCR empieza con el
+    primer bloque y en disco solo quedan las páginas aún no procesadas.
+    """
+    if fitz is None:
+        import pdf2image
+        carpeta_paginas = tempfile.mkdtemp(prefix="paginas_", dir=os.path.dirname(temp_input_path))
+        num_paginas = pdf2image.pdfinfo_from_path(temp_input_path)["Pages"]
+        for primera in range(1, num_paginas + 1, PAGINAS_POR_BLOQUE_OCR):
+            yield from pdf2image.convert_from_path(
+                temp_input_path, dpi=DPI_OCR, grayscale=True, thread_count=num_hilos,
+                output_folder=carpeta_paginas, paths_only=True,
+                first_page=primera, last_page=min(primera + PAGINAS_POR_BLOQUE_OCR - 1, num_paginas)
+            )
+        return
+
+    from PIL import Image
+    with fitz.open(temp_input_path) as documento:
+        for pagina in documento:
+            pixmap = pagina.get_pixmap(dpi=DPI_OCR, colorspace=fitz.csGRAY)
+            yield Image.frombytes("L", (pixmap.width, pixmap.height), pixmap.samples)
+
+
+def _hilos_ocr(num_archivos: int) -> int:
+    """
+    Hilos de OCR para cada PDF: los núcleos se reparten entre los PDF que el
+    pool convierte a la vez. Un solo PDF usa todos los núcleos; con tantos PDF
+    como procesos, cada uno usa un hilo.
+    """
+    simultaneos = max(1, min(num_archivos, TAMANO_POOL_PROCESOS))
+    return max(1, (os.cpu_count() or 1) // simultaneos)
+
+
+def _ocr_pagina(image_to_string, imagen) -> str:
+    """OCR de una página; si la página es una ruta en disco, la elimina al terminar"""
+    texto = image_to_string(imagen, lang='spa+eng')
+    if isinstance(imagen, str):
+        os.remove(imagen)
+    return texto
+
+
+def _ocr_paginas(imagenes: Iterable, num_hilos: int = 1) -> List[str]:
+    """
+    Aplica OCR (Tesseract) a las imágenes (o rutas) de las páginas y devuelve
+    los textos en orden.
+
+    pytesseract lanza un proceso de tesseract por página y el hilo solo espera
+    a que termine, así que las páginas se procesan en paralelo. Las imágenes
+    se piden a medida que hay hilos libres, de modo que solo unas pocas están
+    en memoria a la vez.
+
+    Con varias páginas a la vez, cada tesseract usa un solo hilo
+    (OMP_THREAD_LIMIT, que heredan sus procesos) salvo que ya esté
+    configurado; con una sola, tesseract usa sus propios hilos. El proceso
+    del pool ejecuta una conversión a la vez, así que cambiar el entorno
+    mientras dura el OCR no afecta a otras.
+    """
+    import pytesseract
+    ocr = partial(_ocr_pagina, pytesseract.image_to_string)
+    limitar_omp = num_hilos > 1 and "OMP_THREAD_LIMIT" not in os.environ
+    if limitar_omp:
+        os.environ["OMP_THREAD_LIMIT"] = "1"
+
+    textos = []
+    pendientes = deque()
     try:
-        max_filas = 1048576  # Límite de filas en Excel
-        excel_data = {}
-        for ruta in rutas_csv:
-            try:
-                nombre_base = os.path.basename(ruta).replace(".csv", "")[:25]
-                data = []
-                with open(ruta, "r", encoding="utf-8") as archivo_csv:
-                    lector_csv = csv.reader(archivo_csv, delimiter=separador_salida)
-                    for fila in lector_csv:
-                        data.append(fila)
-                df = pd.DataFrame(data)
-                num_partes = (len(df) // max_filas) + 1
-                for i in range(num_partes):
-                    inicio = i * max_filas
-                    fin = (i + 1) * max_filas
-                    nombre_hoja = f"{nombre_base}_part{i+1}"[:31]
-                    excel_data[nombre_hoja] = df.iloc[inicio:fin]
-            except Exception as e:
-                continue
-        with pd.ExcelWriter(archivo_excel_salida) as writer:
-            for sheet_name, df in excel_data.items():
-                df.to_excel(writer, sheet_name=sheet_name, index=False, header=False)
-    except Exception as e:
-        return JSONResponse(status_code=500, content={"error": f"Error general: {e}"})
-    # Crear ZIP
-    zip_path = os.path.join(temp_dir, "consolidado_xlsx.zip")
-    with zipfile.ZipFile(zip_path, "w") as zipf:
-        zipf.write(archivo_excel_salida, os.path.basename(archivo_excel_salida))
-    return FileResponse(
-        zip_path, filename="consolidado_xlsx.zip", media_type="application/zip"
-    ) 
+        with ThreadPoolExecutor(max_workers=num_hilos) as executor:
+            for imagen in imagenes:
+                if len(pendientes) >= num_hilos:
+                    textos.append(pendientes.popleft().result())
+                pendientes.append(executor.submit(ocr, imagen))
+            textos.extend(pendiente.result() for pendiente in pendientes)
+    finally:
+        if limitar_omp:
+            os.environ.pop("OMP_THREAD_LIMIT", None)
+    return textos
+
+
+def _convertir_pdf_a_word(temp_input_path: str, nombre_archivo: str, temp_dir: str):
+    """Extrae el texto de un PDF y lo guarda como .docx (o .txt si falta python-docx)"""
+    try:
+        # Crear nombre del archivo de salida
+        nombre_archivo_base, _ = os.path.splitext(os.path.basename(nombre_archivo))
+        nombre_archivo_docx = nombre_archivo_base + ".docx"
+        archivo_salida = os.path.join(temp_dir, nombre_archivo_docx)
+
+        # Intentar extraer texto del PDF usando múltiples métodos
+        texto_extraido = ""
 
-@router.post("/pdf-a-word-upload/")
-def pdf_a_word_upload(files: list[UploadFile] = File(...)):
-    """Convierte archivos PDF a Word (.docx) extrayendo el texto real"""
-    temp_dir = tempfile.mkdtemp()
-    archivos_convertidos = []
-    
-    for file in files:
         try:
-            # Verificar que sea un archivo PDF
-            if not file.filename.lower().endswith('.pdf'):
-                continue
-                
-            # Guardar archivo PDF temporalmente
-            temp_input_path = os.path.join(temp_dir, file.filename)
-            with open(temp_input_path, "wb") as f:
-                shutil.copyfileobj(file.file, f)
-            
-            # Crear nombre del archivo de salida
-            nombre_archivo_base, _ = os.path.splitext(os.path.basename(file.filename))
-            nombre_archivo_docx = nombre_archivo_base + ".docx"
-            archivo_salida = os.path.join(temp_dir, nombre_archivo_docx)
-            
-            # Intentar extraer texto del PDF usando múltiples métodos
-            texto_extraido = ""
-            
-            try:
-                # Método 1: Intentar con pdfplumber (más robusto)
-                import pdfplumber
-                with pdfplumber.open(temp_input_path) as pdf:
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            texto_extraido += page_text + "\n\n"
-                print(f"✅ Texto extraído con pdfplumber: {len(texto_extraido)} caracteres")
-                
-            except Exception as e:
-                print(f"❌ Error con pdfplumber: {e}")
-                try:
-                    # Método 2: Intentar con PyPDF2
-                    import PyPDF2
-                    with open(temp_input_path, 'rb') as pdf_file:
-                        pdf_reader = PyPDF2.PdfReader(pdf_file)
-                        for page_num in range(len(pdf_reader.pages)):
-                            page = pdf_reader.pages[page_num]
-                            page_text = page.extract_text()
-                            if page_text:
-                                texto_extraido += page_text + "\n\n"
-                    print(f"✅ Texto extraído con PyPDF2: {len(texto_extraido)} caracteres")
-                    
-                except Exception as e2:
-                    print(f"❌ Error con PyPDF2: {e2}")
-                    # Método 3: Intentar con LibreOffice
-                    try:
-                        result = subprocess.run([
-                            'libreoffice', '--headless', '--convert-to', 'docx', 
-                            '--outdir', temp_dir, temp_input_path
-                        ], capture_output=True, text=True, timeout=60)
-                        
-                        if result.returncode == 0 and os.path.exists(archivo_salida):
-                            archivos_convertidos.append(archivo_salida)
-                            continue
-                        else:
-                            print("❌ LibreOffice no disponible o falló")
-                    except Exception as e3:
-                        print(f"❌ Error con LibreOffice: {e3}")
-            
-            # Si se extrajo texto, crear documento Word
-            if texto_extraido.strip():
-                try:
-                    from docx import Document
-                    doc = Document()
-                    
-                    # Agregar título
-                    doc.add_heading(f'Documento convertido: {file.filename}', 0)
-                    doc.add_paragraph(f'Archivo original: {file.filename}')
-                    doc.add_paragraph(f'Fecha de conversión: {pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")}')
-                    doc.add_paragraph('─' * 50)
-                    
-                    # Dividir el texto en párrafos y agregarlos al documento
-                    parrafos = texto_extraido.split('\n\n')
-                    for parrafo in parrafos:
-                        if parrafo.strip():
-                            # Limpiar el texto
-                            parrafo_limpio = parrafo.strip().replace('\n', ' ')
-                            if len(parrafo_limpio) > 0:
-                                doc.add_paragraph(parrafo_limpio)
-                    
-                    # Guardar el documento
-                    doc.save(archivo_salida)
-                    archivos_convertidos.append(archivo_salida)
-                    print(f"✅ Documento Word creado exitosamente: {archivo_salida}")
-                    
-                except ImportError:
-                    # Si no está disponible python-docx, crear archivo de texto
-                    archivo_salida_txt = archivo_salida.replace('.docx', '.txt')
-                    with open(archivo_salida_txt, 'w', encoding='utf-8') as txt_file:
-                        txt_file.write(f"DOCUMENTO CONVERTIDO: {file.filename}\n")
-                        txt_file.write("=" * 50 + "\n\n")
-                        txt_file.write(texto_extraido)
-                    archivos_convertidos.append(archivo_salida_txt)
-                    print(f"✅ Archivo de texto creado: {archivo_salida_txt}")
-                    
-            else:
-                # Si no se pudo extraer texto, crear un documento informativo
-                try:
-                    from docx import Document
-                    doc = Document()
-                    doc.add_heading(f'Archivo PDF: {file.filename}', 0)
-                    doc.add_paragraph('No se pudo extraer texto de este archivo PDF.')
-                    doc.add_paragraph('Posibles causas:')
-                    doc.add_paragraph('• El PDF está protegido con contraseña')
-                    doc.add_paragraph('• El PDF contiene solo imágenes (escaneado)')
-                    doc.add_paragraph('• El archivo está corrupto')
-                    doc.add_paragraph('• Formato no compatible')
-                    doc.save(archivo_salida)
-                    archivos_convertidos.append(archivo_salida)
-                    print(f"⚠️ Documento informativo creado: {archivo_salida}")
-                    
-                except ImportError:
-                    archivo_salida_txt = archivo_salida.replace('.docx', '.txt')
-                    with open(archivo_salida_txt, 'w', encoding='utf-8') as txt_file:
-                        txt_file.write(f"ARCHIVO PDF: {file.filename}\n")
-                        txt_file.write("No se pudo extraer texto de este archivo PDF.\n")
-                    archivos_convertidos.append(archivo_salida_txt)
-                    
+            # Método 1: Intentar con PyMuPDF o pdfplumber
+            texto_extraido = _extraer_texto_pdf(temp_input_path)
+            print(f"✅ Texto extraído con {_MOTOR_PDF}: {len(texto_extraido)} caracteres")
+
         except Exception as e:
-            print(f"❌ Error general procesando {file.filename}: {str(e)}")
-            continue
-    
-    if not archivos_convertidos:
-        return JSONResponse(
-            status_code=400,
-            content={"error": "No se pudo convertir ningún archivo PDF. Verifique que los archivos sean PDFs válidos y no estén protegidos."}
-        )
-    
-    # Crear ZIP con los archivos convertidos
-    zip_path = os.path.join(temp_dir, "pdf_a_word_convertidos.zip")
-    with zipfile.ZipFile(zip_path, "w") as zipf:
-        for archivo in archivos_convertidos:
-            zipf.write(archivo, os.path.basename(archivo))
-    
-    return FileResponse(
-        zip_path,
-        filename="pdf_a_word_convertidos.zip",
-        media_type="application/zip"
-    )
-@router.post("/pdf-a-word-ocr-upload/")
-def pdf_a_word_ocr_upload(files: list[UploadFile] = File(...)):
-    """Convierte archivos PDF escaneados a Word usando OCR"""
-    temp_dir = tempfile.mkdtemp()
-    archivos_convertidos = []
-    
-    for file in files:
-        try:
-            # Verificar que sea un archivo PDF
-            if not file.filename.lower().endswith('.pdf'):
-                continue
-                
-            # Guardar archivo PDF temporalmente
-            temp_input_path = os.path.join(temp_dir, file.filename)
-            with open(temp_input_path, "wb") as f:
-                shutil.copyfileobj(file.file, f)
-            
-            # Crear nombre del archivo de salida
-            nombre_archivo_base, _ = os.path.splitext(os.path.basename(file.filename))
-            nombre_archivo_docx = nombre_archivo_base + "_ocr.docx"
-            archivo_salida = os.path.join(temp_dir, nombre_archivo_docx)
-            
-            texto_extraido = ""
-            
-            # Primero intentar extracción normal de texto
+            print(f"❌ Error con {_MOTOR_PDF}: {e}")
             try:
-                import pdfplumber
-                with pdfplumber.open(temp_input_path) as pdf:
-                    for page in pdf.pages:
+                # Método 2: Intentar con PyPDF2
+                import PyPDF2
+                with open(temp_input_path, 'rb') as pdf_file:
+                    pdf_reader = PyPDF2.PdfReader(pdf_file)
+                    for page_num in range(len(pdf_reader.pages)):
+                        page = pdf_reader.pages[page_num]
                         page_text = page.extract_text()
                         if page_text:
                             texto_extraido += page_text + "\n\n"
-                print(f"✅ Texto extraído normalmente: {len(texto_extraido)} caracteres")
-                
-            except Exception as e:
-                print(f"❌ Error extracción normal: {e}")
-            
-            # Si no se extrajo suficiente texto, usar OCR
-            if len(texto_extraido.strip()) < 100:  # Menos de 100 caracteres = probablemente escaneado
-                print("🔍 PDF parece escaneado, aplicando OCR...")
-                
+                print(f"✅ Texto extraído con PyPDF2: {len(texto_extraido)} caracteres")
+
+            except Exception as e2:
+                print(f"❌ Error con PyPDF2: {e2}")
+                # Método 3: Intentar con LibreOffice
                 try:
-                    # Intentar usar OCR si las dependencias están disponibles
-                    try:
-                        import pdf2image
-                        import pytesseract
-                        
-                        # Convertir PDF a imágenes
-                        images = pdf2image.convert_from_path(temp_input_path)
-                        print(f"📄 PDF convertido a {len(images)} imágenes para OCR")
-                        
-                        texto_ocr = ""
-                        for i, image in enumerate(images):
-                            print(f"   🔍 Procesando página {i+1} con OCR...")
-                            
-                            # Extraer texto usando Tesseract OCR
-                            page_text = pytesseract.image_to_string(image, lang='spa+eng')
-                            
-                            if page_text.strip():
-                                texto_ocr += f"--- PÁGINA {i+1} ---\n{page_text}\n\n"
-                                print(f"   ✅ Página {i+1}: {len(page_text)} caracteres extraídos con OCR")
-                            else:
-                                print(f"   ⚠️  Página {i+1}: No se pudo extraer texto con OCR")
-                        
-                        if texto_ocr.strip():
-                            texto_extraido = texto_ocr
-                            print(f"✅ Texto extraído con OCR: {len(texto_ocr)} caracteres")
-                        else:
-                            print("❌ OCR no pudo extraer texto")
-                            
-                    except ImportError:
-                        print("❌ Dependencias de OCR no disponibles")
-                        texto_extraido = "OCR no disponible. Se requieren: pdf2image, pytesseract, tesseract-ocr"
-                        
-                except Exception as e:
-                    print(f"❌ Error en OCR: {e}")
-                    texto_extraido = f"Error en OCR: {str(e)}"
-            
-            # Crear documento Word con el texto extraído
+                    result = subprocess.run([
+                        'libreoffice', '--headless', '--convert-to', 'docx',
+                        '--outdir', temp_dir, temp_input_path
+                    ], capture_output=True, text=True, timeout=60)
+
+                    if result.returncode == 0 and os.path.exists(archivo_salida):
+                        return archivo_salida
+                    else:
+                        print("❌ LibreOffice no disponible o falló")
+                except Exception as e3:
+                    print(f"❌ Error con LibreOffice: {e3}")
+
+        # Si se extrajo texto, crear documento Word
+        if texto_extraido.strip():
             try:
                 from docx import Document
                 doc = Document()
-                
+
                 # Agregar título
-                doc.add_heading(f'Documento convertido: {file.filename}', 0)
-                doc.add_paragraph(f'Archivo original: {file.filename}')
+                doc.add_heading(f'Documento convertido: {nombre_archivo}', 0)
+                doc.add_paragraph(f'Archivo original: {nombre_archivo}')
                 doc.add_paragraph(f'Fecha de conversión: {pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")}')
                 doc.add_paragraph('─' * 50)
-                
-                if texto_extraido.strip():
-                    # Procesar el texto extraído
-                    lineas = texto_extraido.split('\n')
-                    for linea in lineas:
-                        if linea.strip() and not linea.startswith('--- PÁGINA'):
-                            doc.add_paragraph(linea.strip())
-                else:
-                    doc.add_paragraph('No se pudo extraer texto del PDF.')
-                    doc.add_paragraph('Posibles causas:')
-                    doc.add_paragraph('• El PDF está protegido con contraseña')
-                    doc.add_paragraph('• El PDF contiene solo imágenes (escaneado)')
-                    doc.add_paragraph('• El archivo está corrupto')
-                    doc.add_paragraph('• Formato no compatible')
-                
+
+                # Dividir el texto en párrafos y agregarlos al documento
+                parrafos = texto_extraido.split('\n\n')
+                for parrafo in parrafos:
+                    if parrafo.strip():
+                        # Limpiar el texto
+                        parrafo_limpio = parrafo.strip().replace('\n', ' ')
+                        if len(parrafo_limpio) > 0:
+                            doc.add_paragraph(parrafo_limpio)
+
                 # Guardar el documento
                 doc.save(archivo_salida)
-                archivos_convertidos.append(archivo_salida)
-                print(f"✅ Documento Word creado: {archivo_salida}")
-                
+                print(f"✅ Documento Word creado exitosamente: {archivo_salida}")
+                return archivo_salida
+
             except ImportError:
                 # Si no está disponible python-docx, crear archivo de texto
                 archivo_salida_txt = archivo_salida.replace('.docx', '.txt')
                 with open(archivo_salida_txt, 'w', encoding='utf-8') as txt_file:
-                    txt_file.write(f"DOCUMENTO CONVERTIDO: {file.filename}\n")
+                    txt_file.write(f"DOCUMENTO CONVERTIDO: {nombre_archivo}\n")
                     txt_file.write("=" * 50 + "\n\n")
-                    if texto_extraido:
-                        txt_file.write(texto_extraido)
-                    else:
-                        txt_file.write("No se pudo extraer texto del PDF.\n")
-                archivos_convertidos.append(archivo_salida_txt)
+                    txt_file.write(texto_extraido)
                 print(f"✅ Archivo de texto creado: {archivo_salida_txt}")
-                
+                return archivo_salida_txt
+
+        else:
+            # Si no se pudo extraer texto, crear un documento informativo
+            try:
+                from docx import Document
+                doc = Document()
+                doc.add_heading(f'Archivo PDF: {nombre_archivo}', 0)
+                doc.add_paragraph('No se pudo extraer texto de este archivo PDF.')
+                doc.add_paragraph('Posibles causas:')
+                doc.add_paragraph('• El PDF está protegido con contraseña')
+                doc.add_paragraph('• El PDF contiene solo imágenes (escaneado)')
+                doc.add_paragraph('• El archivo está corrupto')
+                doc.add_paragraph('• Formato no compatible')
+                doc.save(archivo_salida)
+                print(f"⚠️ Documento informativo creado: {archivo_salida}")
+                return archivo_salida
+
+            except ImportError:
+                archivo_salida_txt = archivo_salida.replace('.docx', '.txt')
+                with open(archivo_salida_txt, 'w', encoding='utf-8') as txt_file:
+                    txt_file.write(f"ARCHIVO PDF: {nombre_archivo}\n")
+                    txt_file.write("No se pudo extraer texto de este archivo PDF.\n")
+                return archivo_salida_txt
+
+    except Exception as e:
+        print(f"❌ Error general procesando {nombre_archivo}: {str(e)}")
+        return None
+
+
+@router.post("/pdf-a-word-upload/")
+async def pdf_a_word_upload(files: list[UploadFile] = File(...)):
+    """Convierte archivos PDF a Word (.docx) extrayendo el texto real"""
+    with _directorio_peticion() as temp_dir:
+
+        rutas_entrada = []
+        for file in files:
+            # Verificar que sea un archivo PDF
+            if not file.filename.lower().endswith('.pdf'):
+                continue
+
+            # Guardar archivo PDF temporalmente
+            temp_input_path = os.path.join(temp_dir, file.filename)
+            await run_in_threadpool(_guardar_upload, file, temp_input_path)
+            rutas_entrada.append((temp_input_path, file.filename))
+
+        archivos_convertidos = await _procesar_en_procesos(
+            _convertir_pdf_a_word,
+            [
+                (temp_input_path, nombre_archivo, temp_dir)
+                for temp_input_path, nombre_archivo in rutas_entrada
+            ],
+        )
+
+        if not archivos_convertidos:
+            eliminar_directorio(temp_dir)
+            return JSONResponse(
+                status_code=400,
+                content={"error": "No se pudo convertir ningún archivo PDF. Verifique que los archivos sean PDFs válidos y no estén protegidos."}
+            )
+
+        # Enviar ZIP con los archivos convertidos
+        return respuesta_zip(archivos_convertidos, "pdf_a_word_convertidos.zip", temp_dir)
+
+
+def _convertir_pdf_a_word_ocr(
+    temp_input_path: str, nombre_archivo: str, temp_dir: str, hilos_ocr: int = 1
+):
+    """
+    Extrae el texto de un PDF (con OCR si parece escaneado) y lo guarda como
+    .docx. hilos_ocr es el número de páginas a las que se aplica OCR a la vez.
+    """
+    try:
+        # Crear nombre del archivo de salida
+        nombre_archivo_base, _ = os.path.splitext(os.path.basename(nombre_archivo))
+        nombre_archivo_docx = nombre_archivo_base + "_ocr.docx"
+        archivo_salida = os.path.join(temp_dir, nombre_archivo_docx)
+
+        texto_extraido = ""
+
+        # Primero intentar extracción normal de texto
+        try:
+            texto_extraido = _extraer_texto_pdf(temp_input_path)
+            print(f"✅ Texto extraído normalmente: {len(texto_extraido)} caracteres")
+
         except Exception as e:
-            print(f"❌ Error general procesando {file.filename}: {str(e)}")
-            continue
-    
-    if not archivos_convertidos:
-        return JSONResponse(
-            status_code=400,
-            content={"error": "No se pudo convertir ningún archivo PDF. Verifique que los archivos sean PDFs válidos."}
+            print(f"❌ Error extracción normal: {e}")
+
+        # Si no se extrajo suficiente texto, usar OCR
+        if len(texto_extraido.strip()) < 100:  # Menos de 100 caracteres = probablemente escaneado
+            print("🔍 PDF parece escaneado, aplicando OCR...")
+
+            try:
+                # Intentar usar OCR si las dependencias están disponibles
+                try:
+                    # Renderizar las páginas y extraer su texto con Tesseract OCR
+                    textos_paginas = _ocr_paginas(
+                        _imagenes_paginas_pdf(temp_input_path, hilos_ocr), hilos_ocr
+                    )
+                    print(f"📄 OCR aplicado a {len(textos_paginas)} páginas")
+
+                    texto_ocr = ""
+                    for i, page_text in enumerate(textos_paginas):
+                        if page_text.strip():
+                            texto_ocr += f"--- PÁGINA {i+1} ---\n{page_text}\n\n"
+                            print(f"   ✅ Página {i+1}: {len(page_text)} caracteres extraídos con OCR")
+                        else:
+                            print(f"   ⚠️  Página {i+1}: No se pudo extraer texto con OCR")
+
+                    if texto_ocr.strip():
+                        texto_extraido = texto_ocr
+                        print(f"✅ Texto extraído con OCR: {len(texto_ocr)} caracteres")
+                    else:
+                        print("❌ OCR no pudo extraer texto")
+
+                except ImportError:
+                    print("❌ Dependencias de OCR no disponibles")
+                    texto_extraido = "OCR no disponible. Se requieren: pytesseract, tesseract-ocr y PyMuPDF o pdf2image"
+
+            except Exception as e:
+                print(f"❌ Error en OCR: {e}")
+                texto_extraido = f"Error en OCR: {str(e)}"
+
+        # Crear documento Word con el texto extraído
+        try:
+            from docx import Document
+            doc = Document()
+
+            # Agregar título
+            doc.add_heading(f'Documento convertido: {nombre_archivo}', 0)
+            doc.add_paragraph(f'Archivo original: {nombre_archivo}')
+            doc.add_paragraph(f'Fecha de conversión: {pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")}')
+            doc.add_paragraph('─' * 50)
+
+            if texto_extraido.strip():
+                # Procesar el texto extraído
+                lineas = texto_extraido.split('\n')
+                for linea in lineas:
+                    if linea.strip() and not linea.startswith('--- PÁGINA'):
+                        doc.add_paragraph(linea.strip())
+            else:
+                doc.add_paragraph('No se pudo extraer texto del PDF.')
+                doc.add_paragraph('Posibles causas:')
+                doc.add_paragraph('• El PDF está protegido con contraseña')
+                doc.add_paragraph('• El PDF contiene solo imágenes (escaneado)')
+                doc.add_paragraph('• El archivo está corrupto')
+                doc.add_paragraph('• Formato no compatible')
+
+            # Guardar el documento
+            doc.save(archivo_salida)
+            print(f"✅ Documento Word creado: {archivo_salida}")
+            return archivo_salida
+
+        except ImportError:
+            # Si no está disponible python-docx, crear archivo de texto
+            archivo_salida_txt = archivo_salida.replace('.docx', '.txt')
+            with open(archivo_salida_txt, 'w', encoding='utf-8') as txt_file:
+                txt_file.write(f"DOCUMENTO CONVERTIDO: {nombre_archivo}\n")
+                txt_file.write("=" * 50 + "\n\n")
+                if texto_extraido:
+                    txt_file.write(texto_extraido)
+                else:
+                    txt_file.write("No se pudo extraer texto del PDF.\n")
+            print(f"✅ Archivo de texto creado: {archivo_salida_txt}")
+            return archivo_salida_txt
+
+    except Exception as e:
+        print(f"❌ Error general procesando {nombre_archivo}: {str(e)}")
+        return None
+
+
+@router.post("/pdf-a-word-ocr-upload/")
+async def pdf_a_word_ocr_upload(files: list[UploadFile] = File(...)):
+    """Convierte archivos PDF escaneados a Word usando OCR"""
+    with _directorio_peticion() as temp_dir:
+
+        rutas_entrada = []
+        for file in files:
+            # Verificar que sea un archivo PDF
+            if not file.filename.lower().endswith('.pdf'):
+                continue
+
+            # Guardar archivo PDF temporalmente
+            temp_input_path = os.path.join(temp_dir, file.filename)
+            await run_in_threadpool(_guardar_upload, file, temp_input_path)
+            rutas_entrada.append((temp_input_path, file.filename))
+
+        hilos_ocr = _hilos_ocr(len(rutas_entrada))
+        archivos_convertidos = await _procesar_en_procesos(
+            _convertir_pdf_a_word_ocr,
+            [
+                (temp_input_path, nombre_archivo, temp_dir, hilos_ocr)
+                for temp_input_path, nombre_archivo in rutas_entrada
+            ],
         )
-    
-    # Crear ZIP con los archivos convertidos
-    zip_path = os.path.join(temp_dir, "pdf_a_word_ocr_convertidos.zip")
-    with zipfile.ZipFile(zip_path, "w") as zipf:
-        for archivo in archivos_convertidos:
-            zipf.write(archivo, os.path.basename(archivo))
-    
-    return FileResponse(
-        zip_path,
-        filename="pdf_a_word_ocr_convertidos.zip",
-        media_type="application/zip"
-    )
+
+        if not archivos_convertidos:
+            eliminar_directorio(temp_dir)
+            return JSONResponse(
+                status_code=400,
+                content={"error": "No se pudo convertir ningún archivo PDF. Verifique que los archivos sean PDFs válidos."}
+            )
+
+        # Enviar ZIP con los archivos convertidos
+        return respuesta_zip(archivos_convertidos, "pdf_a_word_ocr_convertidos.zip", temp_dir)
@@ -8,14 +8,20 @@ diccionarios de tipos de datos automáticamente.
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+import csv
+import hashlib
 import re
 import os
-import shutil
 import tempfile
+import time
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
@@ -24,9 +30,18 @@ from utils.exceptions import handle_exception
 from utils.dynamic_data_types import data_type_manager
 from utils.csv_separator_detector import separator_detector
 from utils.column_cleaner import column_cleaner
+from utils.encoding_detector import encoding_detector
 from repository.processors.csv_processor import CSVProcessor
 from config.settings import get_project_config
 
+# Kernels de Arrow para columnas string[pyarrow], si pyarrow está instalado
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
 logger = get_logger(__name__)
 router = APIRouter(prefix="/csv-analyzer", tags=["CSV Analyzer"])
 
@@ -49,31 +64,40 @@ class CSVAnalysisResponse(BaseModel):
     validation_results: Dict[str, Any]
     available_types: List[Dict[str, Any]]  # Nuevo campo para tipos disponibles
 
+# Tabla de reemplazos para normalizar nombres de columnas (un solo translate)
+_NORMALIZE_TABLE = str.maketrans({
+    ' ': '_', '-': '_', 'Á': 'A', 'É': 'E', 'Í': 'I',
+    'Ó': 'O', 'Ú': 'U', 'Ñ': 'N', '.': None, '/': '_',
+})
+
+@lru_cache(maxsize=4096)
 def normalize_column_name(column_name: str) -> str:
     """Normaliza nombres de columnas reemplazando espacios y caracteres especiales."""
-    column_name = column_name.strip().upper()
-    replacements = [
-        (' ', '_'), ('-', '_'), ('Á', 'A'), ('É', 'E'), ('Í', 'I'),
-        ('Ó', 'O'), ('Ú', 'U'), ('Ñ', 'N'), ('.', ''), ('/', '_'),
-    ]
-    for old, new in replacements:
-        column_name = column_name.replace(old, new)
-    return column_name
+    return column_name.strip().upper().translate(_NORMALIZE_TABLE)
 
 class DataTypeDetector:
     """Detector automático de tipos de datos para columnas CSV."""
     
+    # Patrones compilados una sola vez por proceso (no por instancia)
+    date_patterns = (
+        r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
+        r'\d{2}/\d{2}/\d{4}',  # MM/DD/YYYY
+        r'\d{2}-\d{2}-\d{4}',  # MM-DD-YYYY
+        r'\d{4}/\d{2}/\d{2}',  # YYYY/MM/DD
+        r'\d{2}/\d{2}/\d{2}',  # DD/MM/YY
+        r'\d{2}-\d{2}-\d{2}',  # DD-MM-YY
+    )
+    date_regex = re.compile('|'.join(date_patterns))
+    integer_regex = re.compile(r'\s*[+-]?\d+(?:_\d+)*\s*')
+    boolean_values = frozenset({'true', 'false', 'yes', 'no', '1', '0', 'si', 'verdadero', 'falso'})
+    
+    # Muestra previa para decidir sin recorrer columnas largas
+    probe_min_rows = 128
+    probe_size = 64
+    
     def __init__(self, use_dynamic_types: bool = True):
         self.use_dynamic_types = use_dynamic_types
         self.null_values = {"", "nan", "null", "n/a", "none", "undefined"}
-        self.date_patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-            r'\d{2}/\d{2}/\d{4}',  # MM/DD/YYYY
-            r'\d{2}-\d{2}-\d{4}',  # MM-DD-YYYY
-            r'\d{4}/\d{2}/\d{2}',  # YYYY/MM/DD
-            r'\d{2}/\d{2}/\d{2}',  # DD/MM/YY
-            r'\d{2}-\d{2}-\d{2}',  # DD-MM-YY
-        ]
         
     def detect_column_type(self, column_data: pd.Series, column_name: str) -> Dict[str, Any]:
         """
@@ -96,7 +120,7 @@ class DataTypeDetector:
         
         # Si se usan tipos dinámicos, intentar detectar primero
         if self.use_dynamic_types:
-            dynamic_result = data_type_manager.detect_type(str_data.tolist(), column_name)
+            dynamic_result = data_type_manager.detect_type_series(str_data, column_name)
             if dynamic_result["confidence"] > 0.7:
                 return dynamic_result
         
@@ -104,87 +128,105 @@ class DataTypeDetector:
         return self._detect_basic_types(str_data, column_name)
     
     def _detect_basic_types(self, str_data: pd.Series, column_name: str) -> Dict[str, Any]:
-        """Detecta tipos básicos de datos."""
-        
-        # Detectar fechas
-        if self._detect_date_type(str_data):
-            return {"type": "date", "confidence": 0.8, "reason": "Patrones de fecha detectados"}
-        
-        # Detectar números enteros
-        if self._detect_integer_type(str_data):
-            return {"type": "integer", "confidence": 0.9, "reason": "Números enteros detectados"}
-        
-        # Detectar números decimales
-        if self._detect_float_type(str_data):
-            return {"type": "float", "confidence": 0.85, "reason": "Números decimales detectados"}
+        """
+        Detecta tipos básicos de datos.
         
-        # Detectar booleanos
-        if self._detect_boolean_type(str_data):
-            return {"type": "boolean", "confidence": 0.9, "reason": "Valores booleanos detectados"}
+        Los valores vacíos se descartan una sola vez y el texto sin comas se
+        comparte entre enteros y decimales; se respeta el orden de prioridad
+        fecha, entero, decimal y booleano.
+        """
+        valid_data = str_data[str_data != '']
+        if len(valid_data) > 0:
+            # Detectar fechas
+            if self._detect_by_fraction(valid_data, self._date_fraction, 0.7):
+                return {"type": "date", "confidence": 0.8, "reason": "Patrones de fecha detectados"}
+            
+            without_commas = valid_data.str.replace(',', '', regex=False)
+            
+            # Detectar números enteros
+            if self._detect_by_fraction(without_commas, self._integer_fraction, 0.8):
+                return {"type": "integer", "confidence": 0.9, "reason": "Números enteros detectados"}
+            
+            # Detectar números decimales
+            if self._detect_by_fraction(without_commas, self._float_fraction, 0.8):
+                return {"type": "float", "confidence": 0.85, "reason": "Números decimales detectados"}
+            
+            # Detectar booleanos
+            if self._detect_by_fraction(valid_data, self._boolean_fraction, 0.8):
+                return {"type": "boolean", "confidence": 0.9, "reason": "Valores booleanos detectados"}
         
         # Por defecto, es string
         return {"type": "string", "confidence": 0.5, "reason": "Texto detectado"}
     
-    def _detect_date_type(self, str_data: pd.Series) -> bool:
-        """Detecta si la columna contiene fechas."""
-        date_count = 0
-        total_valid = 0
-        
-        for value in str_data:
-            if value and str(value).strip():
-                total_valid += 1
-                for pattern in self.date_patterns:
-                    if re.search(pattern, str(value)):
-                        date_count += 1
-                        break
-        
-        return total_valid > 0 and (date_count / total_valid) > 0.7
-    
-    def _detect_integer_type(self, str_data: pd.Series) -> bool:
-        """Detecta si la columna contiene números enteros."""
-        int_count = 0
-        total_valid = 0
-        
-        for value in str_data:
-            if value and str(value).strip():
-                total_valid += 1
-                try:
-                    int(str(value).replace(',', '').replace('.', ''))
-                    int_count += 1
-                except ValueError:
-                    pass
-        
-        return total_valid > 0 and (int_count / total_valid) > 0.8
-    
-    def _detect_float_type(self, str_data: pd.Series) -> bool:
-        """Detecta si la columna contiene números decimales."""
-        float_count = 0
-        total_valid = 0
-        
-        for value in str_data:
-            if value and str(value).strip():
-                total_valid += 1
-                try:
-                    float(str(value).replace(',', ''))
-                    float_count += 1
-                except ValueError:
-                    pass
-        
-        return total_valid > 0 and (float_count / total_valid) > 0.8
-    
-    def _detect_boolean_type(self, str_data: pd.Series) -> bool:
-        """Detecta si la columna contiene valores booleanos."""
-        boolean_values = {'true', 'false', 'yes', 'no', '1', '0', 'si', 'no', 'verdadero', 'falso'}
-        bool_count = 0
-        total_valid = 0
-        
-        for value in str_data:
-            if value and str(value).strip():
-                total_valid += 1
-                if str(value).lower().strip() in boolean_values:
-                    bool_count += 1
-        
-        return total_valid > 0 and (bool_count / total_valid) > 0.8
+    def _detect_by_fraction(self, valid_data: pd.Series, fraction_function, threshold: float) -> bool:
+        """
+        Decide si la fracción de valores que cumplen un criterio supera el umbral.
+        
+        En columnas largas primero se evalúa una muestra de los primeros
+        valores: si el resultado es claro (< 0.3 o > 0.95) no se recorre
+        la columna completa.
+        
+        Args:
+            valid_data: Serie con los valores no vacíos como texto sin espacios
+            fraction_function: Función que recibe los valores y devuelve la fracción
+            threshold: Umbral sobre la columna completa
+            
+        Returns:
+            True si la columna cumple el criterio
+        """
+        if len(valid_data) > self.probe_min_rows:
+            probe_fraction = fraction_function(valid_data.iloc[:self.probe_size])
+            if probe_fraction < 0.3:
+                return False
+            if probe_fraction > 0.95:
+                return True
+        
+        return fraction_function(valid_data) > threshold
+    
+    def _date_fraction(self, valid_data: pd.Series) -> float:
+        """Fracción de valores con algún patrón de fecha."""
+        # Una sola búsqueda vectorizada con la alternancia de patrones
+        return valid_data.str.contains(self.date_regex, regex=True, na=False).mean()
+    
+    def _integer_fraction(self, without_commas: pd.Series) -> float:
+        """Fracción de enteros: mismos valores que acepta int() tras quitar ',' y '.'."""
+        digits = without_commas.str.replace('.', '', regex=False)
+        return digits.str.fullmatch(self.integer_regex).mean()
+    
+    def _float_fraction(self, without_commas: pd.Series) -> float:
+        """Fracción de decimales, con un único parseo vectorizado en lugar de float() por valor."""
+        numbers = pd.to_numeric(without_commas, errors='coerce')
+        # "nan" escrito como texto también lo acepta float()
+        nan_text = without_commas.str.fullmatch(r'[+-]?nan', case=False)
+        return (numbers.notna() | nan_text).mean()
+    
+    def _boolean_fraction(self, valid_data: pd.Series) -> float:
+        """Fracción de valores booleanos."""
+        # Los valores ya vienen sin espacios: no hace falta strip() por valor
+        return valid_data.str.lower().isin(self.boolean_values).mean()
+
+def _is_arrow_backed(column_data: pd.Series) -> bool:
+    """Indica si la columna está almacenada en memoria Arrow."""
+    dtype = column_data.dtype
+    if isinstance(dtype, pd.ArrowDtype):
+        return True
+    return isinstance(dtype, pd.StringDtype) and dtype.storage == 'pyarrow'
+
+def _extract_unique_values_arrow(column_data: pd.Series, max_values: Optional[int]) -> List[str]:
+    """
+    Valores únicos de una columna Arrow sin pasar por objetos de Python:
+    recorte de espacios, filtro de vacíos y deduplicación en C++.
+    """
+    values = pa.array(column_data)
+    if not pa.types.is_string(values.type) and not pa.types.is_large_string(values.type):
+        values = pc.cast(values, pa.large_string())
+    values = pc.utf8_trim_whitespace(values.drop_null())
+    values = values.filter(pc.not_equal(values, ''))
+    # Solo se ordena la lista de únicos, que suele ser mucho más corta
+    unique_values = sorted(pc.unique(values).to_pylist())
+    if max_values is not None and max_values > 0:
+        unique_values = unique_values[:max_values]
+    return unique_values
 
 def extract_unique_values(column_data: pd.Series, max_values: Optional[int] = None) -> List[str]:
     """
@@ -198,103 +240,325 @@ def extract_unique_values(column_data: pd.Series, max_values: Optional[int] = No
         Lista de valores únicos
     """
     try:
-        # Limpiar datos nulos y vacíos
-        clean_data = column_data.dropna()
-        clean_data = clean_data[clean_data.astype(str).str.strip() != '']
+        # Columnas respaldadas por Arrow: deduplicación con kernels de Arrow
+        if pc is not None and _is_arrow_backed(column_data):
+            return _extract_unique_values_arrow(column_data, max_values)
+        
+        # Limpiar datos nulos y vacíos, con una sola conversión a texto
+        clean_data = column_data.dropna().astype(str).str.strip()
+        clean_data = clean_data[clean_data.ne('')]
         
         if len(clean_data) == 0:
             return []
         
-        # Obtener valores únicos
-        unique_values = clean_data.astype(str).str.strip().unique()
+        # Obtener valores únicos ordenados; solo se ordena la lista de únicos
+        unique_values = sorted(clean_data.unique())
         
-        # Ordenar y limitar solo si se especifica un límite
+        # Limitar solo si se especifica un límite
         if max_values is not None and max_values > 0:
-            unique_values = sorted(unique_values)[:max_values]
-        else:
-            # Sin límite - ordenar todos los valores únicos
-            unique_values = sorted(unique_values)
+            unique_values = unique_values[:max_values]
         
-        # Convertir a lista de strings
-        return [str(value) for value in unique_values]
+        return unique_values
     except Exception as e:
         logger.warning(f"Error extrayendo valores únicos: {str(e)}")
         return []
 
+# Caché de DataFrames ya leídos, por contenido del archivo: el cliente suele
+# subir el mismo CSV a /analyze y luego a /get-column-choices. Cada entrada
+# guarda (DataFrame, bytes en memoria, instante de expiración); el total en
+# memoria se limita y las entradas caducan poco después de la lectura
+_DATAFRAME_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_DATAFRAME_CACHE_MAX_ENTRIES = 4
+_DATAFRAME_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB por proceso
+_DATAFRAME_CACHE_TTL_SECONDS = 600
+_UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Archivos desde este tamaño se leen por bloques en /get-column-choices
+_CHUNKED_READ_MIN_FILE_SIZE = 100 * 1024 * 1024  # 100MB
+_CHUNK_ROWS = 256_000
+
+# Mínimo de columnas para analizarlas en paralelo
+_MIN_COLUMNS_FOR_PARALLEL = 4
+
+# Valores que pd.read_csv toma como nulos por defecto; la lectura con pyarrow
+# usa los mismos para producir el mismo DataFrame
+_DEFAULT_NA_VALUES = (
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null',
+)
+
+def _upload_filename(filename: Optional[str]) -> str:
+    """Nombre del archivo subido sin componentes de ruta, con un valor por defecto si viene vacío."""
+    return os.path.basename(filename or '') or 'upload.csv'
+
+def _save_upload(file: UploadFile, temp_path: str) -> str:
+    """
+    Guarda el archivo subido en disco por bloques de 1MB y calcula su huella.
+    Se ejecuta en el threadpool para no bloquear el event loop.
+    
+    Args:
+        file: Archivo subido
+        temp_path: Ruta de destino
+        
+    Returns:
+        Huella blake2b (hex) del contenido
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(temp_path, "wb") as f:
+        while chunk := file.file.read(_UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            f.write(chunk)
+    return digest.hexdigest()
+
+def _get_cached_dataframe(file_digest: str, separator: str) -> Optional[pd.DataFrame]:
+    """Devuelve el DataFrame leído previamente para el mismo contenido, si existe."""
+    _expire_cached_dataframes()
+    key = (file_digest, separator)
+    entry = _DATAFRAME_CACHE.get(key)
+    if entry is None:
+        return None
+    _DATAFRAME_CACHE.move_to_end(key)
+    logger.info(f"CSV reutilizado desde caché ({file_digest})")
+    return entry[0]
+
+def _expire_cached_dataframes() -> None:
+    """Elimina de la caché las entradas vencidas."""
+    now = time.monotonic()
+    for key in [key for key, (_, _, expires_at) in _DATAFRAME_CACHE.items() if expires_at <= now]:
+        del _DATAFRAME_CACHE[key]
+
+def _dataframe_nbytes(df: pd.DataFrame, file_size: int) -> Optional[int]:
+    """
+    Memoria que ocupa el DataFrame, o None si no cabe en la caché.
+    
+    memory_usage(deep=True) recorre cada string de las columnas object, así
+    que se calcula en el threadpool junto con la lectura, nunca en el event loop.
+    """
+    # Un DataFrame de texto ocupa al menos lo que el archivo: evitar medirlo
+    if file_size > _DATAFRAME_CACHE_MAX_BYTES:
+        return None
+    nbytes = int(df.memory_usage(deep=True).sum())
+    return nbytes if nbytes <= _DATAFRAME_CACHE_MAX_BYTES else None
+
+def _cache_dataframe(file_digest: str, separator: str, df: pd.DataFrame, nbytes: Optional[int]) -> None:
+    """
+    Guarda el DataFrame leído, con la memoria medida por _dataframe_nbytes
+    (None: no se cachea). Se descartan las entradas menos usadas hasta que el
+    total en memoria quede dentro del límite.
+    """
+    if nbytes is None:
+        return
+    _expire_cached_dataframes()
+    key = (file_digest, separator)
+    _DATAFRAME_CACHE[key] = (df, nbytes, time.monotonic() + _DATAFRAME_CACHE_TTL_SECONDS)
+    _DATAFRAME_CACHE.move_to_end(key)
+    total_bytes = sum(entry[1] for entry in _DATAFRAME_CACHE.values())
+    while len(_DATAFRAME_CACHE) > _DATAFRAME_CACHE_MAX_ENTRIES or total_bytes > _DATAFRAME_CACHE_MAX_BYTES:
+        _, (_, evicted_bytes, _) = _DATAFRAME_CACHE.popitem(last=False)
+        total_bytes -= evicted_bytes
+
+def _read_csv_pyarrow(temp_path: str, separator: str, encoding: str) -> Optional[pd.DataFrame]:
+    """
+    Lee el CSV con pyarrow.csv (multihilo) y columnas string[pyarrow],
+    que ocupan menos memoria que los objetos str de Python.
+    
+    Todas las columnas se declaran como texto a partir de la cabecera, así
+    que pyarrow no infiere tipos y los valores se conservan tal cual ('00001',
+    '1.50'), igual que con dtype=str en pandas. Los valores nulos son los
+    mismos que reconoce pandas por defecto.
+    
+    Args:
+        temp_path: Ruta al archivo CSV
+        separator: Separador detectado
+        encoding: Codificación detectada
+        
+    Returns:
+        DataFrame leído, o None si pyarrow no está instalado o el archivo
+        necesita el lector de pandas (líneas irregulares, bytes inválidos,
+        separador de varios caracteres, nombres de columna vacíos o repetidos)
+    """
+    if pa is None or len(separator) != 1:
+        return None
+    try:
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return None
+    try:
+        with open(temp_path, newline='', encoding=encoding) as f:
+            header = next(csv.reader(f, delimiter=separator), [])
+        # pandas renombra las columnas vacías o repetidas; en ese caso se usa su lector
+        if not header or '' in header or len(set(header)) != len(header):
+            return None
+        table = pa_csv.read_csv(
+            temp_path,
+            read_options=pa_csv.ReadOptions(encoding=encoding),
+            parse_options=pa_csv.ParseOptions(delimiter=separator),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in header},
+                null_values=list(_DEFAULT_NA_VALUES),
+                strings_can_be_null=True,
+            ),
+        )
+        df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+        logger.info(f"CSV leído exitosamente con separador '{separator}' y motor pyarrow")
+        return df
+    except Exception as e:
+        logger.info(f"Motor pyarrow no pudo leer el CSV, usando pandas: {str(e)}")
+        return None
+
+def _read_csv_with_fallbacks(temp_path: str, detected_separator: str) -> pd.DataFrame:
+    """
+    Lee el CSV con la codificación detectada sobre una muestra inicial.
+    
+    La lectura es estricta: si más adelante aparece un byte que la codificación
+    no admite, se repite con la siguiente codificación candidata en lugar de
+    reemplazar caracteres.
+    
+    Args:
+        temp_path: Ruta al archivo CSV
+        detected_separator: Separador detectado
+        
+    Returns:
+        DataFrame con todas las columnas como texto
+    """
+    encodings = encoding_detector.candidate_encodings(temp_path)
+    for encoding in encodings[:-1]:
+        try:
+            return _read_csv_with_encoding(temp_path, detected_separator, encoding)
+        except UnicodeDecodeError as e:
+            logger.info(f"Encoding {encoding} no decodifica el archivo completo: {str(e)}")
+    return _read_csv_with_encoding(temp_path, detected_separator, encodings[-1])
+
+def _read_csv_for_cache(temp_path: str, detected_separator: str) -> Tuple[pd.DataFrame, Optional[int]]:
+    """
+    Lee el CSV y mide su memoria para la caché; ambas cosas en el threadpool.
+    
+    Returns:
+        Tupla (DataFrame, bytes en memoria o None si no se debe cachear)
+    """
+    df = _read_csv_with_fallbacks(temp_path, detected_separator)
+    return df, _dataframe_nbytes(df, os.path.getsize(temp_path))
+
+def _read_csv_with_encoding(temp_path: str, detected_separator: str, encoding: str) -> pd.DataFrame:
+    """
+    Lee el CSV con la codificación indicada.
+    
+    Se hace una sola lectura (pyarrow si está disponible, si no el motor C
+    ignorando líneas problemáticas); solo si el parser falla se reintenta con
+    el motor python y separador automático.
+    
+    Raises:
+        UnicodeDecodeError: Si el archivo no se puede decodificar con encoding
+    """
+    # Lectura rápida con pyarrow si está disponible
+    df = _read_csv_pyarrow(temp_path, detected_separator, encoding)
+    if df is not None:
+        return df
+    
+    try:
+        df = pd.read_csv(
+            temp_path, dtype=str, sep=detected_separator, encoding=encoding, on_bad_lines='skip'
+        )
+        logger.info(f"CSV leído exitosamente con separador '{detected_separator}' y encoding {encoding}")
+    except pd.errors.ParserError as e:
+        logger.warning(f"Separador '{detected_separator}' falló: {str(e)}; usando separador automático")
+        try:
+            df = pd.read_csv(
+                temp_path, dtype=str, sep=None, engine='python', encoding=encoding, on_bad_lines='skip'
+            )
+            logger.info("CSV leído exitosamente con separador automático")
+        except UnicodeDecodeError:
+            raise
+        except Exception as e2:
+            raise Exception(f"No se pudo leer el archivo CSV. Errores: {str(e)}; {str(e2)}")
+    
+    return df
+
+def _analyze_column(detector: DataTypeDetector, column: str, column_data: pd.Series,
+                    extract_choices: bool, sample_size: int = 0) -> tuple:
+    """
+    Analiza una columna: tipo detectado y, si se solicita, sus valores únicos.
+    
+    El tipo se detecta sobre las primeras sample_size filas (todas si es 0);
+    los valores únicos siempre se extraen de la columna completa.
+    
+    Returns:
+        Tupla (análisis, valores únicos o None si no se extrajeron)
+    """
+    try:
+        sample_data = column_data.iloc[:sample_size] if sample_size > 0 else column_data
+        analysis = detector.detect_column_type(sample_data, column)
+        
+        # Extraer valores únicos si se solicita - SIN LÍMITE MÁXIMO
+        choices = None
+        if extract_choices:
+            choices = extract_unique_values(column_data, max_values=None)  # Sin límite
+            logger.info(f"Columna '{column}': {len(choices)} valores únicos extraídos (sin límite)")
+        return analysis, choices
+        
+    except Exception as e:
+        logger.warning(f"Error analizando columna {column}: {str(e)}")
+        # Usar tipo por defecto si hay error
+        return {
+            "type": "string",
+            "confidence": 0.0,
+            "reason": f"Error en análisis: {str(e)}"
+        }, []
+
+def _analyze_columns(detector: DataTypeDetector, df: pd.DataFrame, extract_choices: bool,
+                     sample_size: int = 0) -> List[tuple]:
+    """
+    Analiza todas las columnas del DataFrame, en paralelo si hay suficientes
+    columnas (las operaciones vectorizadas de pandas liberan el GIL).
+    
+    Returns:
+        Lista de tuplas (análisis, choices) en el orden de las columnas
+    """
+    columns = list(df.columns)
+    if len(columns) >= _MIN_COLUMNS_FOR_PARALLEL:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(executor.map(
+                lambda column: _analyze_column(detector, column, df[column], extract_choices, sample_size),
+                columns
+            ))
+    return [_analyze_column(detector, column, df[column], extract_choices, sample_size) for column in columns]
+
 @router.post("/analyze")
 async def analyze_csv(
     file: UploadFile = File(...),
     use_dynamic_types: bool = Form(True),
-    extract_choices: bool = Form(True)  # Nuevo parámetro para extraer choices
+    extract_choices: bool = Form(True),  # Nuevo parámetro para extraer choices
+    sample_size: int = Form(1000)  # Filas usadas para detectar tipos (0 = todas)
 ):
+    # Directorio temporal que se elimina al terminar, también si hay errores
+    temp_dir = tempfile.TemporaryDirectory()
     try:
-        # Crear directorio temporal
-        temp_dir = tempfile.mkdtemp()
-        temp_path = os.path.join(temp_dir, file.filename)
+        temp_path = os.path.join(temp_dir.name, _upload_filename(file.filename))
         
         # Guardar archivo temporalmente
-        with open(temp_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+        file_digest = await run_in_threadpool(_save_upload, file, temp_path)
         
         # Detectar separador automáticamente
-        separator_info = separator_detector.get_separator_info(temp_path)
+        separator_info = await run_in_threadpool(separator_detector.get_separator_info, temp_path)
         detected_separator = separator_info["detected_separator"]
         separator_confidence = separator_info["confidence"]
         
         logger.info(f"Separador detectado: '{detected_separator}' (confianza: {separator_confidence:.2f})")
         
         try:
-            # Intentar leer con diferentes configuraciones usando el separador detectado
-            df = None
-            error_messages = []
-            
-            # Configuración 1: Lectura básica con separador detectado
-            try:
-                df = pd.read_csv(temp_path, dtype=str, encoding='utf-8', sep=detected_separator)
-                logger.info(f"CSV leído exitosamente con separador '{detected_separator}'")
-            except Exception as e1:
-                error_messages.append(f"Separador '{detected_separator}' falló: {str(e1)}")
-                
-                # Configuración 2: Con encoding latin-1
-                try:
-                    df = pd.read_csv(temp_path, dtype=str, encoding='latin-1', sep=detected_separator)
-                    logger.info(f"CSV leído exitosamente con separador '{detected_separator}' y encoding latin-1")
-                except Exception as e2:
-                    error_messages.append(f"Encoding latin-1 falló: {str(e2)}")
-                    
-                    # Configuración 3: Con encoding cp1252
-                    try:
-                        df = pd.read_csv(temp_path, dtype=str, encoding='cp1252', sep=detected_separator)
-                        logger.info(f"CSV leído exitosamente con separador '{detected_separator}' y encoding cp1252")
-                    except Exception as e3:
-                        error_messages.append(f"Encoding cp1252 falló: {str(e3)}")
-                        
-                        # Configuración 4: Con engine python
-                        try:
-                            df = pd.read_csv(temp_path, dtype=str, engine='python', sep=detected_separator)
-                            logger.info(f"CSV leído exitosamente con separador '{detected_separator}' y engine python")
-                        except Exception as e4:
-                            error_messages.append(f"Engine python falló: {str(e4)}")
-                            
-                            # Configuración 5: Ignorar líneas problemáticas
-                            try:
-                                df = pd.read_csv(temp_path, dtype=str, on_bad_lines='skip', sep=detected_separator)
-                                logger.info(f"CSV leído exitosamente con separador '{detected_separator}' ignorando líneas problemáticas")
-                            except Exception as e5:
-                                error_messages.append(f"Ignorar líneas problemáticas falló: {str(e5)}")
-                                
-                                # Configuración 6: Último intento con separador automático
-                                try:
-                                    df = pd.read_csv(temp_path, dtype=str, sep=None, engine='python')
-                                    logger.info("CSV leído exitosamente con separador automático")
-                                except Exception as e6:
-                                    error_messages.append(f"Separador automático falló: {str(e6)}")
-                                    raise Exception(f"No se pudo leer el archivo CSV. Errores: {'; '.join(error_messages)}")
+            # Reutilizar la lectura si el mismo archivo ya se analizó
+            df = _get_cached_dataframe(file_digest, detected_separator)
+            if df is None:
+                df, nbytes = await run_in_threadpool(_read_csv_for_cache, temp_path, detected_separator)
+                _cache_dataframe(file_digest, detected_separator, df, nbytes)
             
             if df is None or df.empty:
                 raise Exception("El archivo CSV está vacío o no se pudo leer correctamente")
             
-            # Limpiar columnas con nombres problemáticos
+            # Limpiar columnas con nombres problemáticos (sobre una copia
+            # superficial para no modificar el DataFrame cacheado)
+            df = df.copy(deep=False)
             df.columns = [str(col).strip() for col in df.columns]
             
             # Eliminar columnas completamente vacías
@@ -317,37 +581,25 @@ async def analyze_csv(
         # Inicializar detector
         detector = DataTypeDetector(use_dynamic_types=use_dynamic_types)
         
-        # Analizar cada columna
+        # Analizar cada columna fuera del event loop
         column_analysis = {}
         column_choices = {}  # Nuevo diccionario para almacenar choices
         
-        for column in df.columns:
-            try:
-                analysis = detector.detect_column_type(df[column], column)
-                column_analysis[column] = analysis
-                
-                # Extraer valores únicos si se solicita - SIN LÍMITE MÁXIMO
-                if extract_choices:
-                    unique_values = extract_unique_values(df[column], max_values=None)  # Sin límite
-                    column_choices[column] = unique_values
-                    logger.info(f"Columna '{column}': {len(unique_values)} valores únicos extraídos (sin límite)")
-                
-            except Exception as e:
-                logger.warning(f"Error analizando columna {column}: {str(e)}")
-                # Usar tipo por defecto si hay error
-                column_analysis[column] = {
-                    "type": "string",
-                    "confidence": 0.0,
-                    "reason": f"Error en análisis: {str(e)}"
-                }
-                column_choices[column] = []
+        columns = list(df.columns)
+        results = await run_in_threadpool(_analyze_columns, detector, df, extract_choices, sample_size)
+        
+        for column, (analysis, choices) in zip(columns, results):
+            column_analysis[column] = analysis
+            if choices is not None:
+                column_choices[column] = choices
         
         # Normalizar nombres de columnas para el JSON de respuesta
         normalized_column_analysis = {}
         normalized_column_choices = {}
         
+        normalized_names = {col: normalize_column_name(col) for col in df.columns}
         for original_name, analysis in column_analysis.items():
-            normalized_name = normalize_column_name(original_name)
+            normalized_name = normalized_names[original_name]
             normalized_column_analysis[normalized_name] = analysis
             if extract_choices and original_name in column_choices:
                 normalized_column_choices[normalized_name] = column_choices[original_name]
@@ -357,7 +609,7 @@ async def analyze_csv(
             "filename": file.filename,
             "total_rows": len(df),
             "total_columns": len(df.columns),
-            "sample_size": min(1000, len(df)),
+            "sample_size": min(sample_size, len(df)) if sample_size > 0 else len(df),
             "detected_separator": detected_separator,
             "separator_confidence": separator_confidence,
             "column_mapping": column_mapping
@@ -378,7 +630,7 @@ async def analyze_csv(
             "separator_info": separator_info,
             "column_mapping": column_mapping,
             "original_columns": list(df.columns),  # Agregar nombres originales de columnas
-            "normalized_columns": [normalize_column_name(col) for col in df.columns],  # Agregar nombres normalizados
+            "normalized_columns": list(normalized_names.values()),  # Agregar nombres normalizados
             "recommendations": {
                 "total_columns_analyzed": len(df.columns),
                 "types_detected": len(set(analysis["type"] for analysis in column_analysis.values())),
@@ -388,12 +640,6 @@ async def analyze_csv(
             }
         }
         
-        # Limpiar archivo temporal
-        try:
-            os.remove(temp_path)
-            os.rmdir(temp_dir)
-        except:
-            pass  # Ignorar errores de limpieza
         
         logger.info(f"Análisis completado para {file.filename}")
         return response_data
@@ -403,6 +649,155 @@ async def analyze_csv(
     except Exception as e:
         logger.error(f"Error analizando CSV: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error analizando archivo: {str(e)}")
+    finally:
+        temp_dir.cleanup()
+
+def _resolve_column(columns: List[str], column_name: str) -> str:
+    """
+    Busca una columna por nombre original o normalizado.
+    
+    Args:
+        columns: Columnas del archivo
+        column_name: Nombre solicitado (original o normalizado)
+        
+    Returns:
+        Nombre original de la columna
+        
+    Raises:
+        HTTPException: Si la columna no existe en el archivo
+    """
+    # Primero buscar por nombre original
+    if column_name in columns:
+        logger.info(f"Columna encontrada por nombre original: {column_name}")
+        return column_name
+    
+    # Luego buscar por nombre normalizado (calculado una sola vez por columna)
+    available_normalized = [normalize_column_name(col) for col in columns]
+    normalized_to_original = dict(zip(available_normalized, columns))
+    if column_name in normalized_to_original:
+        target_column = normalized_to_original[column_name]
+        logger.info(f"Columna encontrada por nombre normalizado: {column_name} -> {target_column}")
+        return target_column
+    
+    # Si no se encuentra, mostrar todas las columnas disponibles para debugging
+    logger.error(f"   Columna '{column_name}' no encontrada. Columnas disponibles:")
+    logger.error(f"      Originales: {columns}")
+    logger.error(f"      Normalizadas: {available_normalized}")
+    raise HTTPException(
+        status_code=400, 
+        detail=f"La columna '{column_name}' no existe en el archivo. Columnas disponibles: {columns}"
+    )
+
+def _extract_unique_values_chunked(temp_path: str, target_column: str, read_config: Dict[str, Any],
+                                   max_values: Optional[int] = None) -> tuple:
+    """
+    Extrae los valores únicos de una columna leyendo el archivo por bloques,
+    de modo que en memoria solo hay un bloque y el conjunto de únicos.
+    
+    Args:
+        temp_path: Ruta al archivo CSV
+        target_column: Columna de la que extraer valores
+        read_config: Opciones de lectura (encoding, sep, engine)
+        max_values: Máximo número de valores únicos a retornar (None para sin límite)
+        
+    Returns:
+        Tupla (valores únicos ordenados, filas leídas)
+    """
+    unique_set = set()
+    total_rows = 0
+    chunks = pd.read_csv(
+        temp_path, dtype=str, usecols=[target_column], chunksize=_CHUNK_ROWS, **read_config
+    )
+    for chunk in chunks:
+        total_rows += len(chunk)
+        unique_set.update(chunk[target_column].dropna().astype(str).str.strip())
+    unique_set.discard('')
+    
+    unique_values = sorted(unique_set)
+    if max_values is not None and max_values > 0:
+        unique_values = unique_values[:max_values]
+    return unique_values, total_rows
+
+def _read_target_column(temp_path: str, column_name: str, separator: str, file_size: int,
+                        max_values: Optional[int]) -> tuple:
+    """
+    Lee solo la columna solicitada del CSV, o sus valores únicos por bloques
+    si el archivo es grande.
+    
+    Args:
+        temp_path: Ruta al archivo CSV
+        column_name: Nombre de columna solicitado
+        separator: Separador detectado
+        file_size: Tamaño del archivo en bytes
+        max_values: Máximo de valores únicos (solo lectura por bloques)
+        
+    Returns:
+        Tupla (columna, DataFrame con la columna o None, (valores, filas) o None)
+    """
+    df = None
+    target_column = None
+    
+    # Archivos grandes: valores únicos por bloques, sin cargar la columna
+    read_in_chunks = file_size > _CHUNKED_READ_MIN_FILE_SIZE
+    chunked_result = None
+    last_error = None
+    # La codificación se detecta con una muestra del inicio; si más adelante
+    # aparece un byte que no encaja, la lectura se repite con la siguiente
+    # codificación candidata en lugar de reemplazar caracteres
+    for encoding in encoding_detector.candidate_encodings(temp_path):
+        read_configs = [
+            {'encoding': encoding, 'sep': separator},
+            {'encoding': encoding, 'engine': 'python', 'sep': separator},
+            {'encoding': encoding, 'sep': None, 'engine': 'python'},  # Último intento con separador automático
+        ]
+        for read_config in read_configs:
+            try:
+                header = pd.read_csv(temp_path, dtype=str, nrows=0, **read_config)
+            except UnicodeDecodeError as e:
+                last_error = e
+                break
+            except Exception as e:
+                last_error = e
+                continue
+            target_column = _resolve_column(list(header.columns), column_name)
+            try:
+                if read_in_chunks:
+                    chunked_result = _extract_unique_values_chunked(
+                        temp_path, target_column, read_config, max_values
+                    )
+                else:
+                    df = pd.read_csv(temp_path, dtype=str, usecols=[target_column], **read_config)
+                logger.info(f"   ✅ Columna '{target_column}' leída con {read_config}")
+                break
+            except UnicodeDecodeError as e:
+                logger.info(f"   Encoding {encoding} no decodifica el archivo completo: {str(e)}")
+                last_error = e
+                break
+            except Exception as e:
+                logger.warning(f"   ⚠️  Lectura con {read_config} falló: {str(e)}")
+                last_error = e
+        # Solo se prueba otra codificación si esta no decodificó el archivo
+        if df is not None or chunked_result is not None or not isinstance(last_error, UnicodeDecodeError):
+            break
+    
+    if df is None and chunked_result is None:
+        raise Exception(f"No se pudo leer el archivo CSV: {str(last_error)}")
+    return target_column, df, chunked_result
+
+def _build_choices_response(target_column: str, unique_values: List[str], max_values: Optional[int],
+                            total_rows: int, file_size: Optional[int], separator: str) -> Dict[str, Any]:
+    """Arma la respuesta de /get-column-choices."""
+    return {
+        "success": True,
+        "column_name": target_column,  # Nombre original de la columna
+        "normalized_column_name": normalize_column_name(target_column),
+        "unique_values": unique_values,
+        "total_unique_values": len(unique_values),
+        "max_values_requested": max_values if max_values else "Sin límite",
+        "total_rows_processed": total_rows,
+        "file_size_bytes": file_size,
+        "separator_used": separator
+    }
 
 @router.post("/get-column-choices")
 async def get_column_choices(
@@ -410,14 +805,13 @@ async def get_column_choices(
     column_name: str = Form(...),
     max_values: Optional[int] = Form(None)
 ):
+    # Directorio temporal que se elimina al terminar, también si hay errores
+    temp_dir = tempfile.TemporaryDirectory()
     try:
-        # Crear directorio temporal
-        temp_dir = tempfile.mkdtemp()
-        temp_path = os.path.join(temp_dir, file.filename)
+        temp_path = os.path.join(temp_dir.name, _upload_filename(file.filename))
         
         # Guardar archivo temporalmente
-        with open(temp_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+        file_digest = await run_in_threadpool(_save_upload, file, temp_path)
         
         # Verificar que el archivo se guardó correctamente
         if os.path.exists(temp_path):
@@ -427,29 +821,30 @@ async def get_column_choices(
             raise Exception("El archivo temporal no se creó correctamente")
         
         # Detectar separador automáticamente
-        separator_info = separator_detector.get_separator_info(temp_path)
+        separator_info = await run_in_threadpool(separator_detector.get_separator_info, temp_path)
         detected_separator = separator_info["detected_separator"]
         
-        # Leer CSV
-        try:
-            df = pd.read_csv(temp_path, dtype=str, encoding='utf-8', sep=detected_separator)
-            logger.info(f"   ✅ CSV leído exitosamente con separador '{detected_separator}' y encoding utf-8")
-        except Exception as e1:
-            logger.warning(f"   ⚠️  Separador '{detected_separator}' con utf-8 falló: {str(e1)}")
+        # Reutilizar la lectura de /analyze del mismo archivo si existe; si no,
+        # leer solo la cabecera para ubicar la columna y luego solo esa columna
+        df = _get_cached_dataframe(file_digest, detected_separator)
+        if df is not None:
+            target_column = _resolve_column(list(df.columns), column_name)
+            df = df[[target_column]]
+        else:
+            target_column, df, chunked_result = await run_in_threadpool(
+                _read_target_column, temp_path, column_name, detected_separator, file_size, max_values
+            )
             
-            # Configuración 2: Con encoding latin-1
-            try:
-                df = pd.read_csv(temp_path, dtype=str, encoding='latin-1', sep=detected_separator)
-            except Exception as e2:
-                # Configuración 3: Con engine python
-                try:
-                    df = pd.read_csv(temp_path, dtype=str, engine='python', sep=detected_separator)
-                except Exception as e3:
-                    # Configuración 4: Último intento con separador automático
-                    try:
-                        df = pd.read_csv(temp_path, dtype=str, sep=None, engine='python')
-                    except Exception as e4:
-                        raise Exception(f"No se pudo leer el archivo CSV: {str(e4)}")
+            if chunked_result is not None:
+                unique_values, total_rows = chunked_result
+                if total_rows == 0:
+                    raise Exception("El archivo CSV no contiene datos o no se pudo leer correctamente")
+                logger.info(f"   ✅ {len(unique_values)} valores únicos extraídos por bloques de {total_rows:,} filas")
+                
+                
+                return _build_choices_response(
+                    target_column, unique_values, max_values, total_rows, file.size, detected_separator
+                )
         
         # Verificar que se leyó todo el archivo
         logger.info(f"   📊 Archivo leído completamente:")
@@ -480,14 +875,8 @@ async def get_column_choices(
         
         # 🔍 VERIFICACIÓN ADICIONAL: Verificar que no haya truncamiento
         if len(df) > 0:
-            logger.info(f"      - Primera fila: {df.iloc[0].tolist()[:3]}...")  # Primeras 3 columnas
-            logger.info(f"      - Última fila: {df.iloc[-1].tolist()[:3]}...")  # Primeras 3 columnas
-            
-            # Verificar que la última fila no esté truncada
-            last_row = df.iloc[-1]
-            if last_row.isna().sum() > len(last_row) * 0.5:  # Si más del 50% son NaN
-                logger.warning(f"      ⚠️  ADVERTENCIA: Última fila parece estar truncada")
-                logger.warning(f"      ⚠️  Verificar separador y encoding del archivo")
+            logger.info(f"      - Primer valor: {df.iloc[0].tolist()}")
+            logger.info(f"      - Último valor: {df.iloc[-1].tolist()}")
         
         # 🔍 VERIFICACIÓN ADICIONAL: Intentar lectura alternativa si hay sospechas
         if file_size_mb > 100 and len(df) < 500000:  # Archivo grande con pocas filas
@@ -496,10 +885,14 @@ async def get_column_choices(
             
             try:
                 # Intentar lectura con diferentes configuraciones
-                df_alt1 = pd.read_csv(temp_path, dtype=str, sep=None, engine='python')
+                df_alt1 = await run_in_threadpool(
+                    pd.read_csv, temp_path, dtype=str, sep=None, engine='python', usecols=[target_column]
+                )
                 logger.info(f"      - Lectura alternativa 1: {len(df_alt1):,} filas")
                 
-                df_alt2 = pd.read_csv(temp_path, dtype=str, sep=None, engine='c')
+                df_alt2 = await run_in_threadpool(
+                    pd.read_csv, temp_path, dtype=str, sep=None, engine='c', usecols=[target_column]
+                )
                 logger.info(f"      - Lectura alternativa 2: {len(df_alt2):,} filas")
                 
                 # Usar el que tenga más filas
@@ -525,35 +918,6 @@ async def get_column_choices(
         if len(df) == 0:
             raise Exception("El archivo CSV no contiene datos o no se pudo leer correctamente")
         
-        # Crear mapeo de nombres normalizados a nombres originales
-        normalized_to_original = {}
-        for original_col in df.columns:
-            normalized_col = normalize_column_name(original_col)
-            normalized_to_original[normalized_col] = original_col
-        
-        # Buscar la columna (puede ser nombre original o normalizado)
-        target_column = None
-        
-        # Primero buscar por nombre original
-        if column_name in df.columns:
-            target_column = column_name
-            logger.info(f"Columna encontrada por nombre original: {column_name}")
-        # Luego buscar por nombre normalizado
-        elif column_name in normalized_to_original:
-            target_column = normalized_to_original[column_name]
-            logger.info(f"Columna encontrada por nombre normalizado: {column_name} -> {target_column}")
-        else:
-            # Si no se encuentra, mostrar todas las columnas disponibles para debugging
-            available_columns = list(df.columns)
-            available_normalized = [normalize_column_name(col) for col in df.columns]
-            logger.error(f"   Columna '{column_name}' no encontrada. Columnas disponibles:")
-            logger.error(f"      Originales: {available_columns}")
-            logger.error(f"      Normalizadas: {available_normalized}")
-            raise HTTPException(
-                status_code=400, 
-                detail=f"La columna '{column_name}' no existe en el archivo. Columnas disponibles: {available_columns}"
-            )
-        
         # Verificar datos de la columna objetivo
         column_data = df[target_column]
         
@@ -561,58 +925,39 @@ async def get_column_choices(
         logger.info(f"   🔍 Extrayendo valores únicos para columna '{target_column}'")
         logger.info(f"   🔍 Parámetro max_values recibido: {max_values} (tipo: {type(max_values)})")
         
-        unique_values = extract_unique_values(column_data, max_values=max_values)
+        unique_values = await run_in_threadpool(extract_unique_values, column_data, max_values=max_values)
         
         logger.info(f"   ✅ Valores únicos extraídos exitosamente:")
         logger.info(f"      - Total extraído: {len(unique_values)}")
         logger.info(f"      - Primeros 5 valores: {unique_values[:5] if unique_values else 'Ninguno'}")
         logger.info(f"      - Últimos 5 valores: {unique_values[-5:] if len(unique_values) > 5 else unique_values}")
         
-        # Limpiar archivo temporal
-        try:
-            os.remove(temp_path)
-            os.rmdir(temp_dir)
-        except:
-            pass
         
-        return {
-            "success": True,
-            "column_name": target_column,  # Nombre original de la columna
-            "normalized_column_name": normalize_column_name(target_column),
-            "unique_values": unique_values,
-            "total_unique_values": len(unique_values),
-            "max_values_requested": max_values if max_values else "Sin límite",
-            "total_rows_processed": len(df),
-            "file_size_bytes": file.size,
-            "separator_used": detected_separator
-        }
+        return _build_choices_response(
+            target_column, unique_values, max_values, len(df), file.size, detected_separator
+        )
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error extrayendo choices de columna: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error extrayendo choices: {str(e)}")
+    finally:
+        temp_dir.cleanup()
 
 @router.post("/detect-separator")
 async def detect_csv_separator(file: UploadFile = File(...)):
+    # Directorio temporal que se elimina al terminar, también si hay errores
+    temp_dir = tempfile.TemporaryDirectory()
     try:
-        # Crear directorio temporal
-        temp_dir = tempfile.mkdtemp()
-        temp_path = os.path.join(temp_dir, file.filename)
+        temp_path = os.path.join(temp_dir.name, _upload_filename(file.filename))
         
         # Guardar archivo temporalmente
-        with open(temp_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+        await run_in_threadpool(_save_upload, file, temp_path)
         
         # Detectar separador
-        separator_info = separator_detector.get_separator_info(temp_path)
+        separator_info = await run_in_threadpool(separator_detector.get_separator_info, temp_path)
         
-        # Limpiar archivo temporal
-        try:
-            os.remove(temp_path)
-            os.rmdir(temp_dir)
-        except:
-            pass
         
         return {
             "success": True,
@@ -622,6 +967,8 @@ async def detect_csv_separator(file: UploadFile = File(...)):
     except Exception as e:
         logger.error(f"Error detectando separador: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error detectando separador: {str(e)}")
+    finally:
+        temp_dir.cleanup()
 
 @router.get("/generate-type-dictionary")
 async def generate_type_dictionary():
@@ -5,211 +5,296 @@ Permite agregar, modificar y eliminar tipos de datos personalizados
 antes del análisis de CSV.
 """
 
-from fastapi import APIRouter, HTTPException, Body
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Body, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing import List, Dict, Any, Optional, Callable
 
-from utils.dynamic_data_types import data_type_manager, CustomDataType
+from utils.dynamic_data_types import data_type_manager, CustomDataType, ValidationFunctionName
+from utils.json_response import FastJSONResponse
 from utils.logger import get_logger
 
+# Respuestas de lectura ya serializadas. Se descartan en cuanto cambia la
+# versión del gestor de tipos, así que solo se vuelven a serializar después
+# de una modificación (hecha por estos endpoints o desde otro módulo)
+_RESPONSE_CACHE: Dict[str, bytes] = {}
+_response_cache_version = -1
+_ALL_TYPES_KEY = "all"
+_TYPE_KEY_PREFIX = "type:"
+
+def _cached_response(key: str) -> Optional[Response]:
+    """Devuelve la respuesta cacheada si los tipos no han cambiado."""
+    global _response_cache_version
+    if _response_cache_version != data_type_manager.version:
+        _RESPONSE_CACHE.clear()
+        _response_cache_version = data_type_manager.version
+        return None
+    body = _RESPONSE_CACHE.get(key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+    return None
+
+def _cache_response(key: str, payload: Any) -> FastJSONResponse:
+    """Serializa la respuesta y guarda el cuerpo en la caché."""
+    response = FastJSONResponse(payload)
+    _RESPONSE_CACHE[key] = response.body
+    return response
+
 logger = get_logger(__name__)
-router = APIRouter(prefix="/dynamic-types", tags=["Dynamic Data Types"])
+
+class _InternalErrorRoute(APIRoute):
+    """
+    Ruta que convierte cualquier error inesperado del endpoint en un 500
+    genérico, sin repetir try/except en cada handler. Los HTTPException y
+    los errores de validación se propagan sin cambios.
+    """
+    
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+        endpoint_name = self.name
+        
+        async def handler(request: Request) -> Response:
+            try:
+                return await route_handler(request)
+            except (StarletteHTTPException, RequestValidationError):
+                raise
+            except Exception as e:
+                logger.error("Error en %s: %s", endpoint_name, e)
+                raise HTTPException(status_code=500, detail="Error interno del servidor")
+        
+        return handler
+
+router = APIRouter(
+    prefix="/dynamic-types",
+    tags=["Dynamic Data Types"],
+    default_response_class=FastJSONResponse,
+    route_class=_InternalErrorRoute
+)
 
 class CustomDataTypeRequest(BaseModel):
     """Modelo para solicitudes de tipos de datos personalizados."""
     name: str
     description: str
     pattern: Optional[str] = None  # Regex opcional
-    validation_function: Optional[str] = None
+    validation_function: Optional[ValidationFunctionName] = None  # Solo funciones registradas
     confidence_threshold: float = 0.7
     priority: int = 1
     examples: List[str] = []
 
+# Los cuerpos JSON se validan crudos, en una sola pasada de pydantic, sin
+# convertirlos antes a objetos de Python. El validador del lote se construye
+# una sola vez
+_BATCH_ADAPTER = TypeAdapter(List[CustomDataTypeRequest])
+_TYPE_REQUEST_SCHEMA = CustomDataTypeRequest.model_json_schema()
+
+def _json_body_doc(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Documentación OpenAPI del cuerpo para endpoints que leen el JSON crudo."""
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
+
+async def _validate_json_body(raw_request: Request, validate_json: Callable[[bytes], Any]) -> Any:
+    """
+    Valida el cuerpo crudo de la solicitud.
+    
+    Raises:
+        RequestValidationError: Con el mismo formato 422 que FastAPI
+    """
+    try:
+        return validate_json(await raw_request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+
+def _not_found(type_name: str) -> FastJSONResponse:
+    """
+    Respuesta 404 construida directamente, con el mismo cuerpo que produciría
+    HTTPException, para no lanzar y propagar una excepción en cada búsqueda fallida.
+    """
+    return FastJSONResponse({"detail": f"Tipo de datos '{type_name}' no encontrado"}, status_code=404)
+
+def _build_type(request: CustomDataTypeRequest) -> CustomDataType:
+    """Crea el tipo de datos leyendo los campos de la solicitud directamente."""
+    return CustomDataType(
+        request.name,
+        request.description,
+        request.pattern,
+        request.validation_function,
+        request.confidence_threshold,
+        request.priority,
+        request.examples
+    )
+
 class CustomDataTypeResponse(BaseModel):
     """Modelo para respuestas de tipos de datos personalizados."""
     success: bool
     message: str
     data_type: Optional[Dict[str, Any]] = None
 
-@router.get("/types", response_model=List[Dict[str, Any]])
+@router.get("/types", responses={200: {"model": List[Dict[str, Any]]}})
 async def get_all_types():
     """Obtiene todos los tipos de datos disponibles."""
-    try:
-        types = data_type_manager.get_all_types()
-        logger.info(f"Obtenidos {len(types)} tipos de datos")
-        return types
-    except Exception as e:
-        logger.error(f"Error obteniendo tipos de datos: {e}")
-        raise HTTPException(status_code=500, detail="Error interno del servidor")
-
-@router.get("/types/single/{type_name}", response_model=Dict[str, Any])
+    cached = _cached_response(_ALL_TYPES_KEY)
+    if cached is not None:
+        return cached
+    
+    types = data_type_manager.get_all_types()
+    logger.info("Obtenidos %d tipos de datos", len(types))
+    return _cache_response(_ALL_TYPES_KEY, types)
+
+@router.get("/types/single/{type_name}", responses={200: {"model": Dict[str, Any]}})
 async def get_type(type_name: str):
     """Obtiene un tipo de datos específico."""
-    try:
-        data_type = data_type_manager.get_custom_type(type_name)
-        if not data_type:
-            raise HTTPException(status_code=404, detail=f"Tipo de datos '{type_name}' no encontrado")
-        
-        type_dict = data_type.__dict__.copy()
-        type_dict['name'] = type_name
-        return type_dict
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error obteniendo tipo de datos: {e}")
-        raise HTTPException(status_code=500, detail="Error interno del servidor")
-
-@router.post("/types", response_model=CustomDataTypeResponse)
-async def add_custom_type(request: CustomDataTypeRequest):
+    cached = _cached_response(_TYPE_KEY_PREFIX + type_name)
+    if cached is not None:
+        return cached
+    
+    data_type = data_type_manager.get_custom_type(type_name)
+    if not data_type:
+        return _not_found(type_name)
+    
+    # Los tipos se registran con su propio nombre como clave, así que el
+    # diccionario del dataclass ya incluye 'name' y se serializa sin copiarlo
+    return _cache_response(_TYPE_KEY_PREFIX + type_name, data_type.__dict__)
+
+@router.post(
+    "/types",
+    responses={200: {"model": CustomDataTypeResponse}},
+    openapi_extra=_json_body_doc(_TYPE_REQUEST_SCHEMA)
+)
+async def add_custom_type(raw_request: Request):
     """Agrega un nuevo tipo de datos personalizado."""
-    try:
-        # Verificar que el nombre no exista
-        if data_type_manager.get_custom_type(request.name):
-            raise HTTPException(status_code=400, detail=f"El tipo de datos '{request.name}' ya existe")
-        
-        # Crear el tipo de datos
-        data_type = CustomDataType(
-            name=request.name,
-            description=request.description,
-            pattern=request.pattern,
-            validation_function=request.validation_function,
-            confidence_threshold=request.confidence_threshold,
-            priority=request.priority,
-            examples=request.examples
-        )
-        
-        # Agregar el tipo
-        success = data_type_manager.add_custom_type(data_type)
-        if not success:
-            raise HTTPException(status_code=400, detail="Error al agregar el tipo de datos")
-        
-        logger.info(f"Tipo de datos agregado: {request.name}")
-        return CustomDataTypeResponse(
-            success=True,
-            message=f"Tipo de datos '{request.name}' agregado correctamente",
-            data_type=data_type.__dict__
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error agregando tipo de datos: {e}")
-        raise HTTPException(status_code=500, detail="Error interno del servidor")
-
-@router.put("/types/{type_name}", response_model=CustomDataTypeResponse)
-async def update_custom_type(type_name: str, request: CustomDataTypeRequest):
+    request = await _validate_json_body(raw_request, CustomDataTypeRequest.model_validate_json)
+    
+    # Verificar que el nombre no exista
+    if data_type_manager.get_custom_type(request.name):
+        raise HTTPException(status_code=400, detail=f"El tipo de datos '{request.name}' ya existe")
+    
+    # Crear el tipo de datos
+    data_type = _build_type(request)
+    
+    # Agregar el tipo
+    success = data_type_manager.add_custom_type(data_type)
+    if not success:
+        raise HTTPException(status_code=400, detail="Error al agregar el tipo de datos")
+    
+    logger.info("Tipo de datos agregado: %s", request.name)
+    return FastJSONResponse({
+        "success": True,
+        "message": f"Tipo de datos '{request.name}' agregado correctamente",
+        "data_type": data_type.__dict__
+    })
+
+@router.put(
+    "/types/{type_name}",
+    responses={200: {"model": CustomDataTypeResponse}},
+    openapi_extra=_json_body_doc(_TYPE_REQUEST_SCHEMA)
+)
+async def update_custom_type(type_name: str, raw_request: Request):
     """Actualiza un tipo de datos existente."""
-    try:
-        # Verificar que el tipo existe
-        if not data_type_manager.get_custom_type(type_name):
-            raise HTTPException(status_code=404, detail=f"Tipo de datos '{type_name}' no encontrado")
-        
-        # Eliminar el tipo existente
-        data_type_manager.remove_custom_type(type_name)
-        
-        # Crear el nuevo tipo
-        data_type = CustomDataType(
-            name=request.name,
-            description=request.description,
-            pattern=request.pattern,
-            validation_function=request.validation_function,
-            confidence_threshold=request.confidence_threshold,
-            priority=request.priority,
-            examples=request.examples
-        )
-        
-        # Agregar el tipo actualizado
-        success = data_type_manager.add_custom_type(data_type)
-        if not success:
-            raise HTTPException(status_code=400, detail="Error al actualizar el tipo de datos")
-        
-        logger.info(f"Tipo de datos actualizado: {type_name}")
-        return CustomDataTypeResponse(
-            success=True,
-            message=f"Tipo de datos '{type_name}' actualizado correctamente",
-            data_type=data_type.__dict__
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error actualizando tipo de datos: {e}")
-        raise HTTPException(status_code=500, detail="Error interno del servidor")
+    request = await _validate_json_body(raw_request, CustomDataTypeRequest.model_validate_json)
+    
+    # Verificar que el tipo existe
+    if not data_type_manager.get_custom_type(type_name):
+        return _not_found(type_name)
+    
+    # Eliminar el tipo existente
+    data_type_manager.remove_custom_type(type_name)
+    
+    # Crear el nuevo tipo
+    data_type = _build_type(request)
+    
+    # Agregar el tipo actualizado
+    success = data_type_manager.add_custom_type(data_type)
+    if not success:
+        raise HTTPException(status_code=400, detail="Error al actualizar el tipo de datos")
+    
+    logger.info("Tipo de datos actualizado: %s", type_name)
+    return FastJSONResponse({
+        "success": True,
+        "message": f"Tipo de datos '{type_name}' actualizado correctamente",
+        "data_type": data_type.__dict__
+    })
 
-@router.delete("/types/{type_name}", response_model=CustomDataTypeResponse)
+@router.delete("/types/{type_name}", responses={200: {"model": CustomDataTypeResponse}})
 async def delete_custom_type(type_name: str):
     """Elimina un tipo de datos personalizado."""
-    try:
-        success = data_type_manager.remove_custom_type(type_name)
-        if not success:
-            raise HTTPException(status_code=404, detail=f"Tipo de datos '{type_name}' no encontrado")
-        
-        logger.info(f"Tipo de datos eliminado: {type_name}")
-        return CustomDataTypeResponse(
-            success=True,
-            message=f"Tipo de datos '{type_name}' eliminado correctamente"
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error eliminando tipo de datos: {e}")
-        raise HTTPException(status_code=500, detail="Error interno del servidor")
+    success = data_type_manager.remove_custom_type(type_name)
+    if not success:
+        return _not_found(type_name)
+    
+    logger.info("Tipo de datos eliminado: %s", type_name)
+    return FastJSONResponse({
+        "success": True,
+        "message": f"Tipo de datos '{type_name}' eliminado correctamente",
+        "data_type": None
+    })
 
-@router.post("/types/validate", response_model=Dict[str, Any])
+@router.post("/types/validate", responses={200: {"model": Dict[str, Any]}})
 async def validate_value(value: str = Body(...), type_name: str = Body(...)):
     """Valida un valor contra un tipo de datos específico."""
-    try:
-        is_valid = data_type_manager.validate_value(value, type_name)
-        return {
-            "success": True,
-            "value": value,
-            "type": type_name,
-            "is_valid": is_valid
-        }
-    except Exception as e:
-        logger.error(f"Error validando valor: {e}")
-        raise HTTPException(status_code=500, detail="Error interno del servidor")
-
-@router.post("/types/batch", response_model=CustomDataTypeResponse)
-async def add_multiple_types(types: List[CustomDataTypeRequest]):
+    is_valid = data_type_manager.validate_value(value, type_name)
+    return FastJSONResponse({
+        "success": True,
+        "value": value,
+        "type": type_name,
+        "is_valid": is_valid
+    })
+
+@router.post("/types/validate-batch", responses={200: {"model": Dict[str, Any]}})
+async def validate_values(values: List[str] = Body(...), type_name: str = Body(...)):
+    """Valida varios valores contra un tipo de datos específico en una sola solicitud."""
+    results = data_type_manager.validate_values(values, type_name)
+    return FastJSONResponse({
+        "success": True,
+        "type": type_name,
+        "total_values": len(results),
+        "valid_count": sum(results),
+        "results": results
+    })
+
+@router.post(
+    "/types/batch",
+    responses={200: {"model": CustomDataTypeResponse}},
+    openapi_extra=_json_body_doc({"title": "Types", "type": "array", "items": _TYPE_REQUEST_SCHEMA})
+)
+async def add_multiple_types(raw_request: Request):
     """Agrega múltiples tipos de datos de una vez."""
-    try:
-        added_count = 0
-        errors = []
-        
-        for request in types:
-            try:
-                # Verificar que el nombre no exista
-                if data_type_manager.get_custom_type(request.name):
-                    errors.append(f"El tipo '{request.name}' ya existe")
-                    continue
-                
-                # Crear y agregar el tipo
-                data_type = CustomDataType(
-                    name=request.name,
-                    description=request.description,
-                    pattern=request.pattern,
-                    validation_function=request.validation_function,
-                    confidence_threshold=request.confidence_threshold,
-                    priority=request.priority,
-                    examples=request.examples
-                )
+    types = await _validate_json_body(raw_request, _BATCH_ADAPTER.validate_json)
+    
+    added_count = 0
+    errors = []
+    # Nombres existentes tomados una sola vez; incluye los agregados en este lote
+    existing_names = data_type_manager.get_type_names()
+    
+    for request in types:
+        try:
+            # Verificar que el nombre no exista
+            if request.name in existing_names:
+                errors.append(f"El tipo '{request.name}' ya existe")
+                continue
+            
+            # Crear y agregar el tipo
+            data_type = _build_type(request)
+            
+            if data_type_manager.add_custom_type(data_type):
+                existing_names.add(request.name)
+                added_count += 1
+            else:
+                errors.append(f"Error agregando '{request.name}'")
                 
-                if data_type_manager.add_custom_type(data_type):
-                    added_count += 1
-                else:
-                    errors.append(f"Error agregando '{request.name}'")
-                    
-            except Exception as e:
-                errors.append(f"Error con '{request.name}': {str(e)}")
-        
-        message = f"Agregados {added_count} tipos de datos"
-        if errors:
-            message += f". Errores: {', '.join(errors)}"
-        
-        logger.info(f"Agregados {added_count} tipos de datos en lote")
-        return CustomDataTypeResponse(
-            success=added_count > 0,
-            message=message
-        )
-    except Exception as e:
-        logger.error(f"Error agregando tipos en lote: {e}")
-        raise HTTPException(status_code=500, detail="Error interno del servidor") 
\ No newline at end of file
+        except Exception as e:
+            errors.append(f"Error con '{request.name}': {str(e)}")
+    
+    message = f"Agregados {added_count} tipos de datos"
+    if errors:
+        message += f". Errores: {', '.join(errors)}"
+    
+    logger.info("Agregados %d tipos de datos en lote", added_count)
+    return FastJSONResponse({
+        "success": added_count > 0,
+        "message": message,
+        "data_type": None
+    }) 
\ No newline at end of file
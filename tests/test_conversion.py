@@ -0,0 +1,244 @@
+"""
+Tests para los endpoints de conversión de separadores de CSV.
+"""
+
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import zipfile
+
+import pytest
+from fastapi import HTTPException
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes import conversion
+from routes.conversion import csv_a_otro_separador_upload_simple, router
+
+# Crear aplicación de prueba
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+URL_SIMPLE = "/api/v1/csv-a-otro-separador-upload-simple/"
+
+
+def _convertir_simple(contenido: bytes, antiguo_separador: str = "|@", nuevo_separador: str = "|"):
+    return client.post(
+        URL_SIMPLE,
+        files={"files": ("datos.txt", contenido)},
+        data={"antiguo_separador": antiguo_separador, "nuevo_separador": nuevo_separador},
+    )
+
+
+class TestCSVSeparadorSimple:
+    """Tests para csv-a-otro-separador-upload-simple."""
+
+    def test_cambia_separador_y_omite_lineas_vacias(self):
+        """Test cambio de separador y líneas vacías omitidas."""
+        response = _convertir_simple(b"a|@b\r\n\r\n1|@2\n")
+
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zipf:
+            assert zipf.read("datos.csv").decode("utf-8") == "a|b\n1|2\n"
+
+    def test_quita_espacios_unicode(self):
+        """Test espacios Unicode (no ASCII) al inicio y final de línea."""
+        contenido = " a|@b　\n  \n1|@2 \n".encode("utf-8")
+        response = _convertir_simple(contenido)
+
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zipf:
+            assert zipf.read("datos.csv").decode("utf-8") == "a|b\n1|2\n"
+
+    def test_separador_vacio(self):
+        """Test separador antiguo vacío: 400 sin procesar los archivos."""
+        # Un campo de formulario vacío llega como el valor por defecto, así
+        # que se llama al endpoint directamente
+        response = asyncio.run(
+            csv_a_otro_separador_upload_simple(files=[], antiguo_separador="", nuevo_separador="|")
+        )
+
+        assert response.status_code == 400
+
+
+def _duplicar(valor: int) -> int:
+    return valor * 2
+
+
+def _terminar_proceso(valor: int) -> int:
+    os._exit(1)
+
+
+class TestPoolProcesos:
+    """Tests para el pool de procesos compartido."""
+
+    def teardown_method(self):
+        conversion.cerrar_pool_procesos()
+
+    def test_procesar_en_procesos(self):
+        """Test resultados en orden, sin los vacíos."""
+        resultados = asyncio.run(conversion._procesar_en_procesos(_duplicar, [(1,), (0,), (3,)]))
+        assert resultados == [2, 6]
+
+    def test_pool_roto_se_reemplaza(self):
+        """Test proceso caído: 503 y la siguiente conversión usa un pool nuevo."""
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(conversion._procesar_en_procesos(_terminar_proceso, [(1,)]))
+        assert error.value.status_code == 503
+        assert conversion._pool_procesos is None
+
+        resultados = asyncio.run(conversion._procesar_en_procesos(_duplicar, [(2,)]))
+        assert resultados == [4]
+
+    def test_cerrar_pool_procesos(self):
+        """Test cierre del pool al apagar la aplicación."""
+        asyncio.run(conversion._procesar_en_procesos(_duplicar, [(1,)]))
+        conversion.cerrar_pool_procesos()
+        assert conversion._pool_procesos is None
+
+
+class TestDirectorioPeticion:
+    """El directorio temporal se elimina aunque la petición falle."""
+
+    @pytest.fixture(autouse=True)
+    def directorio_temporal(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        return tmp_path
+
+    @pytest.mark.parametrize("url", [
+        "/api/v1/csv-a-otro-separador-upload/",
+        "/api/v1/sav-a-csv-upload/",
+        "/api/v1/xlsx-a-csv-upload/",
+        "/api/v1/xlsx-a-csv-con-columna-mes-de-reporte-upload/",
+        "/api/v1/pdf-a-word-upload/",
+        "/api/v1/pdf-a-word-ocr-upload/",
+    ])
+    def test_pool_no_disponible(self, url, directorio_temporal, monkeypatch):
+        """Test 503 del pool de procesos: sin directorios ni archivos huérfanos."""
+        async def pool_roto(funcion, lista_argumentos):
+            raise HTTPException(status_code=503, detail="pool roto")
+
+        monkeypatch.setattr(conversion, "_procesar_en_procesos", pool_roto)
+        response = client.post(url, files={"files": ("datos.pdf", b"contenido")})
+
+        assert response.status_code == 503
+        assert os.listdir(directorio_temporal) == []
+
+    def test_error_al_guardar_upload(self, directorio_temporal, monkeypatch):
+        """Test excepción al guardar un archivo subido."""
+        def disco_lleno(file, ruta):
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(conversion, "_guardar_upload", disco_lleno)
+        with pytest.raises(OSError):
+            client.post("/api/v1/sav-a-csv-upload/", files={"files": ("datos.sav", b"contenido")})
+
+        assert os.listdir(directorio_temporal) == []
+
+
+class TestOCRPaginas:
+    """Tests para el paralelismo del OCR dentro del pool de procesos."""
+
+    @pytest.fixture
+    def tesseract_falso(self, monkeypatch):
+        """pytesseract falso que registra la concurrencia y el entorno."""
+        registro = {"activos": 0, "maximo": 0, "omp": set()}
+        lock = threading.Lock()
+
+        def image_to_string(imagen, lang=None):
+            with lock:
+                registro["activos"] += 1
+                registro["maximo"] = max(registro["maximo"], registro["activos"])
+                registro["omp"].add(os.environ.get("OMP_THREAD_LIMIT"))
+            time.sleep(0.01)
+            with lock:
+                registro["activos"] -= 1
+            return f"pagina {imagen}"
+
+        monkeypatch.setitem(sys.modules, "pytesseract", types.SimpleNamespace(image_to_string=image_to_string))
+        monkeypatch.delenv("OMP_THREAD_LIMIT", raising=False)
+        return registro
+
+    def test_hilos_con_el_pool_por_defecto(self):
+        """Test con el pool real (un proceso por núcleo): un PDF usa todos los núcleos."""
+        nucleos = os.cpu_count() or 1
+
+        assert conversion.TAMANO_POOL_PROCESOS == nucleos
+        assert conversion._hilos_ocr(1) == nucleos
+        assert conversion._hilos_ocr(nucleos) == 1
+        assert conversion._hilos_ocr(nucleos * 3) == 1
+
+    def test_hilos_repartidos_entre_pdfs(self, monkeypatch):
+        """Test núcleos repartidos entre los PDF que se convierten a la vez."""
+        monkeypatch.setattr(conversion.os, "cpu_count", lambda: 8)
+        monkeypatch.setattr(conversion, "TAMANO_POOL_PROCESOS", 8)
+
+        assert [conversion._hilos_ocr(n) for n in (0, 1, 2, 3, 8, 20)] == [8, 8, 4, 2, 1, 1]
+
+    def test_paginas_en_orden_y_concurrencia_limitada(self, tesseract_falso):
+        """Test textos en orden sin superar el número de hilos."""
+        textos = conversion._ocr_paginas(range(10), num_hilos=2)
+
+        assert textos == [f"pagina {i}" for i in range(10)]
+        assert tesseract_falso["maximo"] <= 2
+
+    def test_omp_solo_con_varios_hilos(self, tesseract_falso):
+        """Test tesseract limitado a un hilo solo si hay varias páginas a la vez."""
+        conversion._ocr_paginas(range(4), num_hilos=3)
+        assert tesseract_falso["omp"] == {"1"}
+        assert "OMP_THREAD_LIMIT" not in os.environ
+
+        tesseract_falso["omp"].clear()
+        conversion._ocr_paginas(range(4), num_hilos=1)
+        assert tesseract_falso["omp"] == {None}
+
+    def test_respeta_omp_configurado(self, tesseract_falso, monkeypatch):
+        """Test OMP_THREAD_LIMIT definido por el operador no se sobrescribe."""
+        monkeypatch.setenv("OMP_THREAD_LIMIT", "2")
+
+        conversion._ocr_paginas(range(2), num_hilos=2)
+
+        assert tesseract_falso["omp"] == {"2"}
+        assert os.environ["OMP_THREAD_LIMIT"] == "2"
+
+    def test_un_pdf_procesa_paginas_a_la_vez(self, tmp_path, monkeypatch):
+        """Test con el pool por defecto (un proceso por núcleo) un PDF aplica OCR a varias páginas a la vez."""
+        monkeypatch.setattr(conversion.os, "cpu_count", lambda: 4)
+        monkeypatch.setattr(conversion, "TAMANO_POOL_PROCESOS", 4)
+        # Cada página espera a que otras tres estén en curso: sin OCR
+        # concurrente la barrera vence y la conversión registra el error
+        barrera = threading.Barrier(4, timeout=5)
+        hilos_render = []
+
+        def image_to_string(imagen, lang=None):
+            barrera.wait()
+            return f"texto {imagen}"
+
+        def imagenes_paginas(ruta, num_hilos=1):
+            hilos_render.append(num_hilos)
+            return iter(range(8))
+
+        monkeypatch.setitem(sys.modules, "pytesseract", types.SimpleNamespace(image_to_string=image_to_string))
+        # Sin python-docx la salida es un .txt que se puede leer directamente
+        monkeypatch.setitem(sys.modules, "docx", None)
+        monkeypatch.setattr(conversion, "_extraer_texto_pdf", lambda ruta: "")
+        monkeypatch.setattr(conversion, "_imagenes_paginas_pdf", imagenes_paginas)
+
+        hilos_ocr = conversion._hilos_ocr(1)
+        salida = conversion._convertir_pdf_a_word_ocr(
+            str(tmp_path / "escaneado.pdf"), "escaneado.pdf", str(tmp_path), hilos_ocr
+        )
+
+        assert hilos_ocr == 4
+        assert hilos_render == [4]
+        with open(salida, encoding="utf-8") as archivo:
+            contenido = archivo.read()
+        assert "Error en OCR" not in contenido
+        assert "--- PÁGINA 8 ---\ntexto 7" in contenido
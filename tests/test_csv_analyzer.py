@@ -5,6 +5,7 @@ Pruebas unitarias y de integración para el sistema
 de análisis automático de archivos CSV.
 """
 
+import asyncio
 import pytest
 import pandas as pd
 import tempfile
@@ -13,6 +14,7 @@ from pathlib import Path
 from io import BytesIO
 from unittest.mock import Mock, patch
 
+from routes import csv_analyzer
 from routes.csv_analyzer import DataTypeDetector, router
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
@@ -410,5 +412,147 @@ def test_detector_edge_cases():
     assert result['type'] == 'string'
     assert result['confidence'] == 0.5
 
+class TestCSVAnalyzerLectura:
+    """Tests de lectura: los valores se conservan como texto, sin inferir tipos."""
+    
+    CSV_CODIGOS = "codigo,valor\n00001,1.50\n00002,2.00\n00010,10.10\n"
+    
+    def setup_method(self):
+        """Vaciar la caché de DataFrames entre tests."""
+        csv_analyzer._DATAFRAME_CACHE.clear()
+    
+    def test_read_csv_pyarrow_conserva_texto(self, tmp_path):
+        """Test ceros a la izquierda y decimales con ceros finales."""
+        pytest.importorskip("pyarrow")
+        ruta = tmp_path / "codigos.csv"
+        ruta.write_text('codigo,valor,nulo,"a,b"\n00001,1.50,NA,"x,y"\n00002,2.00,, z \n')
+        
+        df = csv_analyzer._read_csv_pyarrow(str(ruta), ",", "utf-8")
+        esperado = pd.read_csv(ruta, dtype=str)
+        
+        assert list(df.columns) == list(esperado.columns)
+        assert df["codigo"].tolist() == ["00001", "00002"]
+        assert df["valor"].tolist() == ["1.50", "2.00"]
+        for columna in esperado.columns:
+            assert df[columna].isna().tolist() == esperado[columna].isna().tolist()
+            assert df[columna].dropna().tolist() == esperado[columna].dropna().tolist()
+    
+    def test_valores_nulos_iguales_a_pandas(self, tmp_path):
+        """Test los nulos por defecto coinciden con los de pd.read_csv."""
+        pytest.importorskip("pyarrow")
+        tokens = [token for token in csv_analyzer._DEFAULT_NA_VALUES if token]
+        ruta = tmp_path / "nulos.csv"
+        ruta.write_text("valor\n" + "".join(f"{token}\n" for token in tokens + ["NONE", "-", "0"]))
+        
+        esperado = pd.read_csv(ruta, dtype=str, skip_blank_lines=False)
+        df = csv_analyzer._read_csv_pyarrow(str(ruta), ",", "utf-8")
+        
+        assert esperado["valor"].isna().tolist() == [True] * len(tokens) + [False] * 3
+        assert df["valor"].isna().tolist() == esperado["valor"].isna().tolist()
+    
+    def test_analyze_choices_conservan_texto(self):
+        """Test choices de /analyze y de /get-column-choices con la caché."""
+        files = {'file': ('codigos.csv', self.CSV_CODIGOS, 'text/csv')}
+        response = client.post('/csv-analyzer/analyze', files=files)
+        
+        assert response.status_code == 200
+        choices = response.json()['column_choices']
+        assert choices['CODIGO'] == ['00001', '00002', '00010']
+        assert choices['VALOR'] == ['1.50', '10.10', '2.00']
+        
+        files = {'file': ('codigos.csv', self.CSV_CODIGOS, 'text/csv')}
+        response = client.post('/csv-analyzer/get-column-choices', files=files, data={'column_name': 'codigo'})
+        
+        assert response.status_code == 200
+        assert response.json()['unique_values'] == ['00001', '00002', '00010']
+    
+    def test_get_column_choices_conserva_texto(self):
+        """Test /get-column-choices sin lectura previa."""
+        files = {'file': ('codigos.csv', self.CSV_CODIGOS, 'text/csv')}
+        response = client.post('/csv-analyzer/get-column-choices', files=files, data={'column_name': 'valor'})
+        
+        assert response.status_code == 200
+        assert response.json()['unique_values'] == ['1.50', '10.10', '2.00']
+
+    def test_latin1_despues_de_la_muestra(self):
+        """Test byte latin-1 después de los primeros 64 KB: se conserva."""
+        contenido = ("nombre,codigo\n" + "Juan,00001\n" * 10000 + "Peña,00002\n").encode("latin-1")
+        
+        files = {'file': ('latin1.csv', contenido, 'text/csv')}
+        response = client.post('/csv-analyzer/get-column-choices', files=files, data={'column_name': 'nombre'})
+        
+        assert response.status_code == 200
+        assert response.json()['unique_values'] == ['Juan', 'Peña']
+        
+        csv_analyzer._DATAFRAME_CACHE.clear()
+        files = {'file': ('latin1.csv', contenido, 'text/csv')}
+        response = client.post('/csv-analyzer/analyze', files=files)
+        
+        assert response.status_code == 200
+        assert response.json()['column_choices']['NOMBRE'] == ['Juan', 'Peña']
+
+class TestCSVAnalyzerCache:
+    """Tests para la caché de DataFrames leídos."""
+    
+    def setup_method(self):
+        """Vaciar la caché de DataFrames entre tests."""
+        csv_analyzer._DATAFRAME_CACHE.clear()
+    
+    def teardown_method(self):
+        csv_analyzer._DATAFRAME_CACHE.clear()
+    
+    def _dataframe(self, filas: int) -> pd.DataFrame:
+        return pd.DataFrame({'columna': [str(i) for i in range(filas)]})
+    
+    def test_limite_de_memoria(self, monkeypatch):
+        """Test se descartan las entradas más antiguas al superar el límite."""
+        df = self._dataframe(1000)
+        nbytes = int(df.memory_usage(deep=True).sum())
+        monkeypatch.setattr(csv_analyzer, '_DATAFRAME_CACHE_MAX_BYTES', nbytes * 2)
+        
+        for digest in ('a', 'b', 'c'):
+            csv_analyzer._cache_dataframe(digest, ',', self._dataframe(1000), nbytes)
+        
+        assert csv_analyzer._get_cached_dataframe('a', ',') is None
+        assert csv_analyzer._get_cached_dataframe('b', ',') is not None
+        assert csv_analyzer._get_cached_dataframe('c', ',') is not None
+    
+    def test_dataframe_mayor_que_el_limite(self, monkeypatch):
+        """Test un DataFrame que supera el límite por sí solo no se cachea."""
+        monkeypatch.setattr(csv_analyzer, '_DATAFRAME_CACHE_MAX_BYTES', 100)
+        df = self._dataframe(1000)
+        
+        assert csv_analyzer._dataframe_nbytes(df, 10) is None
+        assert csv_analyzer._dataframe_nbytes(df, 1000) is None
+        csv_analyzer._cache_dataframe('a', ',', df, None)
+        assert csv_analyzer._get_cached_dataframe('a', ',') is None
+    
+    def test_expiracion(self, monkeypatch):
+        """Test las entradas vencidas no se devuelven."""
+        monkeypatch.setattr(csv_analyzer, '_DATAFRAME_CACHE_TTL_SECONDS', 0)
+        csv_analyzer._cache_dataframe('a', ',', self._dataframe(10), 100)
+        
+        assert csv_analyzer._get_cached_dataframe('a', ',') is None
+        assert len(csv_analyzer._DATAFRAME_CACHE) == 0
+    
+    def test_medicion_fuera_del_event_loop(self, monkeypatch):
+        """Test /analyze mide el DataFrame dentro del threadpool de la lectura."""
+        llamadas = []
+        dataframe_nbytes = csv_analyzer._dataframe_nbytes
+        
+        def medir(df, file_size):
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            llamadas.append(file_size)
+            return dataframe_nbytes(df, file_size)
+        
+        monkeypatch.setattr(csv_analyzer, '_dataframe_nbytes', medir)
+        files = {'file': ('datos.csv', BytesIO(b'CODIGO,NOMBRE\n00001,Juan\n00002,Ana\n'), 'text/csv')}
+        response = client.post('/csv-analyzer/analyze', files=files)
+        
+        assert response.status_code == 200
+        assert len(llamadas) == 1
+        assert len(csv_analyzer._DATAFRAME_CACHE) == 1
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"]) 
\ No newline at end of file
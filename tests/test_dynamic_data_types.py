@@ -0,0 +1,128 @@
+"""
+Tests para el gestor de tipos de datos dinámicos.
+"""
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes.dynamic_types import router
+from utils.dynamic_data_types import CustomDataType, DynamicDataTypeManager
+
+# Crear aplicación de prueba
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+@pytest.fixture
+def manager():
+    """Gestor con los tipos por defecto más uno por función y uno por nombre."""
+    manager = DynamicDataTypeManager()
+    manager.add_custom_type(CustomDataType(
+        name="correo",
+        description="Correo validado con función",
+        validation_function="validate_email",
+        confidence_threshold=0.8,
+        priority=20
+    ))
+    manager.add_custom_type(CustomDataType(
+        name="codigo",
+        description="Columna reconocida por su nombre",
+        confidence_threshold=0.9,
+        priority=15
+    ))
+    return manager
+
+
+COLUMNAS = [
+    ("NIT", ["900123456", "800987654", None, "", "  ", "1234567890"]),
+    ("TELEFONO", ["3001234567", "+573001234567", "6012345", None]),
+    ("PORCENTAJE", ["25%", "12.5%", "", "100%"]),
+    ("CORREO", ["usuario@empresa.com", " contacto@dominio.co ", None, "sin arroba"]),
+    ("CONTACTO", ["usuario@empresa.com", "no es correo", "otro texto", "x"]),
+    ("CODIGO_DEPENDENCIA", ["A1", "B2", None, ""]),
+    ("MIXTA", ["900123456", "texto", "25%", "3001234567"]),
+    ("NULOS", [None, "", "   ", None]),
+    ("VACIA", []),
+]
+
+
+class TestDetectTypeSeries:
+    """detect_type_series debe dar el mismo resultado que detect_type."""
+
+    @pytest.mark.parametrize("column_name,values", COLUMNAS)
+    def test_igual_que_detect_type(self, manager, column_name, values):
+        """Test mismo tipo, confianza y razón con listas y series."""
+        esperado = manager.detect_type(values, column_name)
+
+        assert manager.detect_type_series(pd.Series(values, dtype=object), column_name) == esperado
+        assert manager.detect_type_series(pd.Series(values, dtype="string"), column_name) == esperado
+
+    def test_tipo_por_funcion(self, manager):
+        """Test tipo definido solo por función de validación."""
+        values = ["usuario@empresa.com", "contacto@dominio.co", None, ""]
+
+        assert manager.detect_type_series(pd.Series(values), "CORREO")["type"] == "correo"
+
+    def test_tipo_por_nombre_de_columna(self, manager):
+        """Test tipo sin patrón ni función, reconocido por el nombre."""
+        values = ["A1", "B2"]
+
+        assert manager.detect_type_series(pd.Series(values), "CODIGO_DEPENDENCIA")["type"] == "codigo"
+        assert manager.detect_type_series(pd.Series(values), "OTRA")["type"] == "string"
+
+
+class TestValidateValues:
+    """validate_values debe equivaler a validate_value por cada valor."""
+
+    def test_tipo_por_patron(self, manager):
+        """Test tipo con patrón, en el orden de entrada."""
+        values = ["900123456", "abc", " 800987654 ", "12", ""]
+
+        assert manager.validate_values(values, "nit") == [True, False, True, False, False]
+        assert manager.validate_values(values, "nit") == [manager.validate_value(v, "nit") for v in values]
+
+    def test_tipo_por_funcion(self, manager):
+        """Test tipo validado solo con función."""
+        values = ["usuario@empresa.com", "sin arroba", "a@b", "contacto@dominio.co"]
+
+        assert manager.validate_values(values, "correo") == [True, False, False, True]
+        assert manager.validate_values(values, "correo") == [manager.validate_value(v, "correo") for v in values]
+
+    def test_tipo_desconocido(self, manager):
+        """Test tipo inexistente: todos los valores son inválidos."""
+        assert manager.validate_values(["1", "2", "3"], "no_existe") == [False, False, False]
+
+    def test_sin_valores(self, manager):
+        """Test lista vacía."""
+        assert manager.validate_values([], "nit") == []
+
+
+class TestValidateBatchEndpoint:
+    """Tests para POST /dynamic-types/types/validate-batch."""
+
+    def _validar(self, values, type_name):
+        return client.post(
+            "/dynamic-types/types/validate-batch", json={"values": values, "type_name": type_name}
+        )
+
+    def test_tipo_por_patron(self):
+        """Test resultados en el orden de entrada y conteo de válidos."""
+        response = self._validar(["25%", "abc", "12.5%", "30"], "porcentaje")
+
+        assert response.status_code == 200
+        result = response.json()
+        assert result["results"] == [True, False, True, False]
+        assert result["total_values"] == 4
+        assert result["valid_count"] == 2
+        assert result["type"] == "porcentaje"
+
+    def test_tipo_desconocido(self):
+        """Test tipo inexistente: todos False."""
+        response = self._validar(["1", "2"], "no_existe")
+
+        assert response.status_code == 200
+        assert response.json()["results"] == [False, False]
+        assert response.json()["valid_count"] == 0
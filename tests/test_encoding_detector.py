@@ -0,0 +1,107 @@
+"""
+Tests para el detector de codificación y para las conversiones de CSV que
+lo usan cuando hay bytes no UTF-8 después de la muestra inicial.
+"""
+
+import codecs
+import os
+import tempfile
+
+import pytest
+
+from routes.conversion import (
+    _convertir_csv_con_columnas,
+    _convertir_csv_simple,
+    _convertir_csv_upload,
+)
+from utils.encoding_detector import EncodingDetector, encoding_detector
+
+# Contenido ASCII más largo que la muestra del detector (64 KB)
+RELLENO_ASCII = "codigo|@nombre\n" + "00001|@Juan\n" * 8000
+
+
+@pytest.fixture
+def temp_dir():
+    """Directorio temporal para los archivos de cada test."""
+    with tempfile.TemporaryDirectory() as directorio:
+        yield directorio
+
+
+def _escribir(directorio: str, nombre: str, contenido: bytes) -> str:
+    ruta = os.path.join(directorio, nombre)
+    with open(ruta, "wb") as archivo:
+        archivo.write(contenido)
+    return ruta
+
+
+class TestEncodingDetector:
+    """Tests para EncodingDetector."""
+
+    def test_detect_utf8_bom(self):
+        """Test BOM UTF-8."""
+        muestra = codecs.BOM_UTF8 + "Año|Niño\n".encode("utf-8")
+        assert encoding_detector.detect_from_bytes(muestra) == ("utf-8-sig", 1.0)
+
+    def test_detect_utf8(self):
+        """Test UTF-8 válido, incluso con un carácter cortado al final."""
+        muestra = "Año|Niño\nPeña|Acción\n".encode("utf-8")
+        assert encoding_detector.detect_from_bytes(muestra) == ("utf-8", 1.0)
+        assert encoding_detector.detect_from_bytes(muestra[:-2])[0] == "utf-8"
+
+    def test_detect_cp1252(self):
+        """Test texto occidental de un byte."""
+        muestra = "Año de la señal, acción común, niño. ".encode("cp1252") * 20
+        encoding, _ = encoding_detector.detect_from_bytes(muestra)
+        assert codecs.lookup(encoding).name in {"cp1252", "iso8859-1", "iso8859-15"}
+
+    def test_fallback(self):
+        """Test propuesta de chardet no occidental: se usa el fallback."""
+        detector = EncodingDetector(fallback_encoding="latin-1")
+        muestra = "Привет мир, это тест. ".encode("koi8-r") * 20
+        assert detector.detect_from_bytes(muestra) == ("latin-1", 0.0)
+
+    def test_candidate_encodings(self, temp_dir):
+        """Test candidatas en orden y sin repetir."""
+        ruta = _escribir(temp_dir, "utf8.csv", "Peña\n".encode("utf-8"))
+        assert encoding_detector.candidate_encodings(ruta) == ["utf-8", "latin-1"]
+
+        ruta = _escribir(temp_dir, "bom.csv", codecs.BOM_UTF8 + b"a\n")
+        assert encoding_detector.candidate_encodings(ruta) == ["utf-8-sig", "utf-8", "latin-1"]
+
+
+class TestConversionCodificacion:
+    """Bytes latin-1 después de la muestra: se conservan sin reemplazos."""
+
+    def _contenido(self) -> bytes:
+        return (RELLENO_ASCII + "00002|@Peña\n").encode("latin-1")
+
+    def test_convertir_csv_simple(self, temp_dir):
+        """Test cambio de separador sin columnas adicionales."""
+        ruta = _escribir(temp_dir, "entrada.txt", self._contenido())
+        salida = _convertir_csv_simple(ruta, "datos.csv", temp_dir, "|@", "|")
+
+        with open(salida, encoding="utf-8") as archivo:
+            lineas = archivo.read().splitlines()
+        assert lineas[-1] == "00002|Peña"
+        assert "�" not in "".join(lineas)
+
+    def test_convertir_csv_upload(self, temp_dir):
+        """Test cambio de separador con NOMBRE_ARCHIVO y MES_REPORTE."""
+        ruta = _escribir(temp_dir, "entrada.txt", self._contenido())
+        salida = _convertir_csv_upload(ruta, "datos_I20240131.csv", temp_dir, "|@", "|")
+
+        with open(salida, encoding="utf-8") as archivo:
+            lineas = archivo.read().splitlines()
+        assert lineas[0] == "NOMBRE_ARCHIVO|MES_REPORTE|codigo|nombre"
+        assert lineas[-1] == "datos_I20240131.csv|01_2024|00002|Peña"
+
+    def test_convertir_csv_con_columnas(self, temp_dir):
+        """Test conversión de un CSV del servidor."""
+        ruta = _escribir(temp_dir, "datos_I20240131.txt", self._contenido())
+        salida_dir = os.path.join(temp_dir, "salida")
+        os.makedirs(salida_dir)
+        salida = _convertir_csv_con_columnas(ruta, salida_dir, "|@", "|")
+
+        with open(salida, encoding="utf-8") as archivo:
+            lineas = archivo.read().splitlines()
+        assert lineas[-1] == "datos_I20240131.txt|01_2024|00002|Peña"
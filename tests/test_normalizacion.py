@@ -0,0 +1,128 @@
+"""
+Tests para los endpoints de normalización de columnas.
+"""
+
+import io
+import os
+import zipfile
+
+import pytest
+from fastapi import FastAPI, UploadFile
+from fastapi.testclient import TestClient
+
+from routes import normalizacion
+from routes.normalizacion import router
+
+# Crear aplicación de prueba
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+URL_BPM = "/api/v1/normalizar-columnas/BPM/upload/"
+
+CSV_LIMPIO = "Expediente;Estado\n001;ACTIVO\n002;CERRADO\n"
+# La última fila tiene una columna de más: error de estructura
+CSV_CON_ERRORES = CSV_LIMPIO + "003;ACTIVO;sobra\n"
+
+
+@pytest.fixture(autouse=True)
+def proc_tmpdir(tmp_path, monkeypatch):
+    """Directorio temporal propio para verificar que cada petición lo limpia."""
+    monkeypatch.setattr(normalizacion, "PROC_TMPDIR", str(tmp_path))
+    return tmp_path
+
+
+def _normalizar(contenido: str, **form):
+    data = {"nombre_archivo_salida": "salida.csv", "nombre_archivo_errores": "errores.csv"}
+    data.update(form)
+    return client.post(
+        URL_BPM,
+        files={"file": ("datos.csv", io.BytesIO(contenido.encode("utf-8")), "text/csv")},
+        data=data,
+    )
+
+
+def _miembros_zip(response) -> dict:
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zipf:
+        return {nombre: zipf.read(nombre).decode("utf-8") for nombre in zipf.namelist()}
+
+
+class TestEmpaquetarSiempre:
+    """Tests para el parámetro empaquetar_siempre."""
+
+    def test_por_defecto_sin_errores(self, proc_tmpdir):
+        """Test por defecto: ZIP aunque no haya errores."""
+        response = _normalizar(CSV_LIMPIO)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        assert list(_miembros_zip(response)) == ["salida.csv"]
+        assert os.listdir(proc_tmpdir) == []
+
+    def test_true_con_errores(self, proc_tmpdir):
+        """Test ZIP con el CSV normalizado y el de errores."""
+        response = _normalizar(CSV_CON_ERRORES, empaquetar_siempre="true")
+
+        assert response.status_code == 200
+        miembros = _miembros_zip(response)
+        assert sorted(miembros) == ["errores.csv", "salida.csv"]
+        assert "ESTRUCTURA" in miembros["errores.csv"]
+        assert os.listdir(proc_tmpdir) == []
+
+    def test_false_sin_errores(self, proc_tmpdir):
+        """Test CSV directo, sin ZIP, cuando no hay errores."""
+        response = _normalizar(CSV_LIMPIO, empaquetar_siempre="false")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="salida.csv"' in response.headers["content-disposition"]
+        assert response.text.splitlines() == ["EXPEDIENTE|ESTADO", "001|ACTIVO", "002|CERRADO"]
+        assert os.listdir(proc_tmpdir) == []
+
+    def test_false_con_errores(self, proc_tmpdir):
+        """Test con errores se devuelve el ZIP aunque no se pida."""
+        response = _normalizar(CSV_CON_ERRORES, empaquetar_siempre="false")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        assert sorted(_miembros_zip(response)) == ["errores.csv", "salida.csv"]
+        assert os.listdir(proc_tmpdir) == []
+
+
+class TestTamanoMaximo:
+    """Tests para el límite NORMALIZACION_MAX_FILE_SIZE."""
+
+    def test_archivo_demasiado_grande(self, proc_tmpdir, monkeypatch):
+        """Test 413 sin procesar el archivo."""
+        monkeypatch.setattr(normalizacion, "NORMALIZACION_MAX_FILE_SIZE", 10)
+
+        response = _normalizar(CSV_LIMPIO)
+
+        assert response.status_code == 413
+        assert "máximo 10" in response.json()["error"]
+        assert os.listdir(proc_tmpdir) == []
+
+    def test_dentro_del_limite(self, monkeypatch):
+        """Test archivo del tamaño exacto del límite."""
+        monkeypatch.setattr(normalizacion, "NORMALIZACION_MAX_FILE_SIZE", len(CSV_LIMPIO.encode("utf-8")))
+
+        assert _normalizar(CSV_LIMPIO).status_code == 200
+
+    def test_sin_tamano_informado(self, proc_tmpdir, monkeypatch):
+        """Test subida sin tamaño (por partes): se mide el archivo recibido."""
+        monkeypatch.setattr(normalizacion, "NORMALIZACION_MAX_FILE_SIZE", 10)
+        upload = UploadFile(io.BytesIO(CSV_LIMPIO.encode("utf-8")), filename="datos.csv")
+        assert upload.size is None
+
+        response = normalizacion._normalizar_upload("BPM", "default", upload, "salida.csv", "errores.csv")
+
+        assert response.status_code == 413
+        assert f"{len(CSV_LIMPIO)} bytes" in response.body.decode("utf-8")
+        assert os.listdir(proc_tmpdir) == []
+
+    def test_medir_no_mueve_la_posicion(self):
+        """Test el archivo queda listo para leerse desde donde estaba."""
+        upload = UploadFile(io.BytesIO(b"abcdef"), filename="datos.csv")
+
+        assert normalizacion._tamano_upload(upload) == 6
+        assert upload.file.read() == b"abcdef"
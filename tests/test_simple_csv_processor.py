@@ -0,0 +1,119 @@
+"""
+Tests para CSVProcessor: el procesamiento desde un stream debe producir el
+mismo CSV limpio, el mismo archivo de errores y las mismas estadísticas que
+el procesamiento desde un archivo en disco.
+"""
+
+import io
+import os
+import tempfile
+
+import pytest
+
+from repository.proyectos.simple_csv_processor import CSVProcessor
+
+HEADERS_REFERENCIA = ["NIT", "FECHA", "NOMBRE"]
+TIPOS = {"nit": ["NIT"], "date": ["FECHA"], "string": ["NOMBRE"]}
+
+CONTENIDO_LIMPIO = (
+    "Nombre;Fecha;NIT;Observacion\n"
+    "Juan;2024-01-31;900.123.456;ninguna\n"
+    "Ana ;NULL;800987654;\n"
+    "\"Peña; Luis\";2023-12-01;1234567890;N.A\n"
+)
+
+CONTENIDO_CON_ERRORES = (
+    "Nombre;Fecha;NIT;Observacion\n"
+    "Juan;2024-01-31;900.123.456;ninguna\n"
+    "Ana;31/01/2024;123;\n"
+    "Sobra;2024-01-31;900123456;x;y\n"
+    "Falta;2024-01-31\n"
+    "Luis;2024-02-29;800987654;ok\n"
+)
+
+
+@pytest.fixture
+def temp_dir():
+    """Directorio temporal para los archivos de cada test."""
+    with tempfile.TemporaryDirectory() as directorio:
+        yield directorio
+
+
+def _leer(ruta: str) -> str:
+    with open(ruta, encoding="utf-8", newline="") as archivo:
+        return archivo.read()
+
+
+def _procesar_ambos(directorio: str, contenido: str):
+    """Procesa el mismo contenido desde disco y desde stream."""
+    entrada = os.path.join(directorio, "entrada.csv")
+    with open(entrada, "w", encoding="utf-8", newline="") as archivo:
+        archivo.write(contenido)
+
+    resultados = {}
+    for modo in ("archivo", "stream"):
+        salida = os.path.join(directorio, f"{modo}_salida.csv")
+        errores = os.path.join(directorio, f"{modo}_errores.csv")
+        processor = CSVProcessor(HEADERS_REFERENCIA, TIPOS)
+        if modo == "archivo":
+            stats = processor.process_csv(entrada, salida, errores)
+        else:
+            with open(entrada, "rb") as archivo:
+                stats = processor.process_stream(archivo, salida, errores)
+        resultados[modo] = (stats, salida, errores)
+    return resultados["archivo"], resultados["stream"]
+
+
+class TestProcessStream:
+    """process_stream frente a process_csv sobre la misma entrada."""
+
+    def test_archivo_limpio(self, temp_dir):
+        """Test sin errores: mismo CSV, mismas estadísticas y sin archivo de errores."""
+        (stats, salida, errores), (stats_stream, salida_stream, errores_stream) = _procesar_ambos(
+            temp_dir, CONTENIDO_LIMPIO
+        )
+
+        assert stats_stream == stats
+        assert stats["total_errores"] == 0
+        assert stats["filas_procesadas"] == 3
+        assert _leer(salida_stream) == _leer(salida)
+        assert _leer(salida).splitlines()[0] == "NIT|FECHA|NOMBRE|OBSERVACION"
+        assert _leer(salida).splitlines()[3] == "1234567890|2023-12-01|Peña; Luis|"
+        assert not os.path.exists(errores)
+        assert not os.path.exists(errores_stream)
+
+    def test_errores_de_validacion_y_estructura(self, temp_dir):
+        """Test filas inválidas y con columnas de más o de menos."""
+        (stats, salida, errores), (stats_stream, salida_stream, errores_stream) = _procesar_ambos(
+            temp_dir, CONTENIDO_CON_ERRORES
+        )
+
+        assert stats_stream == stats
+        assert stats["filas_procesadas"] == 3
+        assert stats["filas_con_errores"] == 2
+        assert stats["errores_estructura"] == 2
+        assert stats["total_errores"] == 4
+        assert _leer(salida_stream) == _leer(salida)
+        assert _leer(errores_stream) == _leer(errores)
+
+        lineas_errores = _leer(errores).splitlines()
+        assert lineas_errores[0] == "columna,valor,fila,tipo_esperado,mensaje"
+        assert [linea.split(",")[0] for linea in lineas_errores[1:]] == [
+            "FECHA", "NIT", "ESTRUCTURA", "ESTRUCTURA"
+        ]
+
+    def test_stream_no_se_cierra(self, temp_dir):
+        """Test el archivo del llamador sigue abierto después de procesar."""
+        stream = io.BytesIO(CONTENIDO_LIMPIO.encode("utf-8"))
+        salida = os.path.join(temp_dir, "salida.csv")
+
+        CSVProcessor(HEADERS_REFERENCIA, TIPOS).process_stream(stream, salida)
+
+        assert not stream.closed
+
+    def test_stream_vacio(self, temp_dir):
+        """Test archivo sin headers."""
+        salida = os.path.join(temp_dir, "salida.csv")
+
+        with pytest.raises(ValueError):
+            CSVProcessor(HEADERS_REFERENCIA, TIPOS).process_stream(io.BytesIO(b""), salida)
@@ -0,0 +1,74 @@
+"""
+Tests para los ZIP generados mientras se transmiten y para la validación de
+ZIP_COMPRESSLEVEL.
+"""
+
+import io
+import os
+import zipfile
+
+import pytest
+
+from config.settings import _leer_nivel_compresion_zip
+from utils import zip_stream
+from utils.zip_stream import iterar_zip
+
+CONTENIDO_CSV = b"codigo|nombre\n" + b"00001|Juan\n" * 5000
+CONTENIDO_XLSX = os.urandom(4096)
+
+
+@pytest.fixture
+def archivos(tmp_path):
+    """Un CSV y un xlsx a empaquetar."""
+    rutas = []
+    for nombre, contenido in (("datos.csv", CONTENIDO_CSV), ("datos.xlsx", CONTENIDO_XLSX)):
+        ruta = tmp_path / nombre
+        ruta.write_bytes(contenido)
+        rutas.append(str(ruta))
+    return rutas
+
+
+def _abrir_zip(archivos) -> zipfile.ZipFile:
+    return zipfile.ZipFile(io.BytesIO(b"".join(iterar_zip(archivos))))
+
+
+class TestIterarZip:
+    """Tests para iterar_zip."""
+
+    def test_sin_compresion(self, archivos, monkeypatch):
+        """Test por defecto todos los miembros se guardan sin comprimir."""
+        monkeypatch.setattr(zip_stream, "ZIP_COMPRESSLEVEL", None)
+
+        with _abrir_zip(archivos) as zipf:
+            assert zipf.testzip() is None
+            assert [info.compress_type for info in zipf.infolist()] == [zipfile.ZIP_STORED] * 2
+            assert zipf.read("datos.csv") == CONTENIDO_CSV
+            assert zipf.read("datos.xlsx") == CONTENIDO_XLSX
+
+    def test_con_compresion(self, archivos, monkeypatch):
+        """Test con nivel configurado solo el CSV se comprime."""
+        monkeypatch.setattr(zip_stream, "ZIP_COMPRESSLEVEL", 6)
+
+        with _abrir_zip(archivos) as zipf:
+            assert zipf.testzip() is None
+            csv_info, xlsx_info = zipf.infolist()
+            assert csv_info.compress_type == zipfile.ZIP_DEFLATED
+            assert csv_info.compress_size < csv_info.file_size
+            assert xlsx_info.compress_type == zipfile.ZIP_STORED
+            assert zipf.read("datos.csv") == CONTENIDO_CSV
+            assert zipf.read("datos.xlsx") == CONTENIDO_XLSX
+
+
+class TestNivelCompresionZip:
+    """Tests para la lectura de ZIP_COMPRESSLEVEL."""
+
+    @pytest.mark.parametrize("valor,esperado", [(None, None), ("", None), ("1", 1), ("9", 9)])
+    def test_valores_validos(self, valor, esperado):
+        """Test vacío o un entero entre 1 y 9."""
+        assert _leer_nivel_compresion_zip(valor) == esperado
+
+    @pytest.mark.parametrize("valor", ["0", "10", "-1", "alto", "6.5"])
+    def test_valores_invalidos(self, valor):
+        """Test error claro fuera de rango o no numérico."""
+        with pytest.raises(ValueError, match="ZIP_COMPRESSLEVEL"):
+            _leer_nivel_compresion_zip(valor)
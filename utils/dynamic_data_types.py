@@ -7,15 +7,20 @@ antes del análisis de CSV.
 
 import re
 import json
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Pattern, Set, Literal
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
 
+import pandas as pd
+
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Nombres de las funciones de validación registradas en el gestor
+ValidationFunctionName = Literal["validate_nit", "validate_email", "validate_phone", "validate_percentage"]
+
 @dataclass
 class CustomDataType:
     """Define un tipo de datos personalizado."""
@@ -36,6 +41,10 @@ class DynamicDataTypeManager:
     
     def __init__(self):
         self.custom_types: Dict[str, CustomDataType] = {}
+        # Se incrementa con cada cambio en los tipos registrados
+        self.version = 0
+        # Patrones ya compilados por tipo, para no recompilarlos en cada validación
+        self._compiled_patterns: Dict[str, Pattern] = {}
         self.validation_functions: Dict[str, Callable] = {}
         self._load_default_types()
         self._load_custom_functions()
@@ -101,10 +110,14 @@ class DynamicDataTypeManager:
         """
         try:
             # Validar que el patrón sea válido si se proporciona
-            if data_type.pattern:
-                re.compile(data_type.pattern)
+            compiled_pattern = re.compile(data_type.pattern) if data_type.pattern else None
             
             self.custom_types[data_type.name] = data_type
+            self.version += 1
+            if compiled_pattern is not None:
+                self._compiled_patterns[data_type.name] = compiled_pattern
+            else:
+                self._compiled_patterns.pop(data_type.name, None)
             logger.info(f"Tipo de datos personalizado agregado: {data_type.name}")
             return True
         except re.error as e:
@@ -123,6 +136,8 @@ class DynamicDataTypeManager:
         """
         if type_name in self.custom_types:
             del self.custom_types[type_name]
+            self.version += 1
+            self._compiled_patterns.pop(type_name, None)
             logger.info(f"Tipo de datos eliminado: {type_name}")
             return True
         return False
@@ -131,13 +146,18 @@ class DynamicDataTypeManager:
         """Obtiene un tipo de datos personalizado."""
         return self.custom_types.get(type_name)
     
+    def get_type_names(self) -> Set[str]:
+        """Obtiene los nombres de los tipos de datos registrados."""
+        return set(self.custom_types)
+    
     def get_all_types(self) -> List[Dict[str, Any]]:
         """Obtiene todos los tipos de datos disponibles."""
-        types = []
-        for name, data_type in self.custom_types.items():
-            type_dict = asdict(data_type)
-            type_dict['name'] = name
-            types.append(type_dict)
+        # Copia plana de los campos (todos son escalares salvo la lista de
+        # ejemplos), más barata que la copia recursiva de asdict()
+        types = [
+            {**vars(data_type), 'name': name, 'examples': list(data_type.examples)}
+            for name, data_type in self.custom_types.items()
+        ]
         
         # Ordenar por prioridad (mayor primero)
         types.sort(key=lambda x: x['priority'], reverse=True)
@@ -193,6 +213,59 @@ class DynamicDataTypeManager:
         # Si no se detecta ningún tipo personalizado, retornar string
         return {"type": "string", "confidence": 0.5, "reason": "Tipo no detectado"}
     
+    def detect_type_series(self, column_data: pd.Series, column_name: str = "") -> Dict[str, Any]:
+        """
+        Detecta el tipo de datos de una columna de pandas usando tipos personalizados.
+        
+        Equivale a detect_type, pero los patrones se evalúan con operaciones
+        vectorizadas sobre la serie en lugar de convertirla a una lista de Python.
+        Los valores nulos se ignoran.
+        
+        Args:
+            column_data: Serie con los valores de la columna
+            column_name: Nombre de la columna
+            
+        Returns:
+            Diccionario con información del tipo detectado
+        """
+        if column_data.empty:
+            return {"type": "string", "confidence": 0.0, "reason": "Sin datos"}
+        
+        # Los valores no vacíos se calculan una sola vez para todos los tipos
+        values = column_data.dropna()
+        text = values.astype(str).str.strip()
+        valid_mask = text != ''
+        total_valid = int(valid_mask.sum())
+        if total_valid == 0:
+            return {"type": "string", "confidence": 0.5, "reason": "Tipo no detectado"}
+        valid_text = text[valid_mask]
+        
+        # Ordenar tipos por prioridad
+        sorted_types = sorted(self.custom_types.values(), key=lambda x: x.priority, reverse=True)
+        
+        for data_type in sorted_types:
+            # Si no hay patrón, usar función de validación
+            if data_type.pattern:
+                matches = int(valid_text.str.match(data_type.pattern).sum())
+            elif data_type.validation_function and data_type.validation_function in self.validation_functions:
+                validation_function = self.validation_functions[data_type.validation_function]
+                matches = int(values[valid_mask].map(validation_function).sum())
+            else:
+                # Si no hay patrón ni función, considerar como match si el nombre coincide
+                matches = total_valid if data_type.name.lower() in column_name.lower() else 0
+            
+            confidence = matches / total_valid
+            if confidence >= data_type.confidence_threshold:
+                return {
+                    "type": data_type.name,
+                    "confidence": confidence,
+                    "reason": data_type.description,
+                    "examples": data_type.examples
+                }
+        
+        # Si no se detecta ningún tipo personalizado, retornar string
+        return {"type": "string", "confidence": 0.5, "reason": "Tipo no detectado"}
+    
     def validate_value(self, value: str, type_name: str) -> bool:
         """
         Valida un valor contra un tipo de datos específico.
@@ -209,15 +282,48 @@ class DynamicDataTypeManager:
             return False
         
         # Validar con patrón regex si existe
-        if data_type.pattern and not re.match(data_type.pattern, str(value).strip()):
+        compiled_pattern = self._compiled_patterns.get(type_name)
+        if compiled_pattern is not None and not compiled_pattern.match(str(value).strip()):
             return False
         
         # Validar con función personalizada si existe
-        if data_type.validation_function and data_type.validation_function in self.validation_functions:
-            return self.validation_functions[data_type.validation_function](value)
+        validation_function = self.validation_functions.get(data_type.validation_function)
+        if validation_function is not None:
+            return validation_function(value)
         
         return True
     
+    def validate_values(self, values: List[str], type_name: str) -> List[bool]:
+        """
+        Valida varios valores contra un tipo de datos específico.
+        
+        Equivale a llamar validate_value por cada valor, pero el tipo, el
+        patrón compilado y la función de validación se resuelven una sola vez.
+        
+        Args:
+            values: Valores a validar
+            type_name: Nombre del tipo de datos
+            
+        Returns:
+            Lista con el resultado de cada valor, en el mismo orden
+        """
+        data_type = self.get_custom_type(type_name)
+        if not data_type:
+            return [False] * len(values)
+        
+        compiled_pattern = self._compiled_patterns.get(type_name)
+        validation_function = self.validation_functions.get(data_type.validation_function)
+        
+        results = []
+        for value in values:
+            if compiled_pattern is not None and not compiled_pattern.match(str(value).strip()):
+                results.append(False)
+            elif validation_function is not None:
+                results.append(bool(validation_function(value)))
+            else:
+                results.append(True)
+        return results
+    
     # Funciones de validación personalizadas
     def _validate_nit(self, value: str) -> bool:
         """Valida NIT colombiano."""
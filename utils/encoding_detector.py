@@ -0,0 +1,105 @@
+"""
+Utilidad para detectar la codificación de archivos de texto.
+
+La detección se hace sobre una muestra del inicio del archivo. Como un byte
+inválido puede aparecer después de la muestra, candidate_encodings da además
+las codificaciones a probar, en orden, para leer el archivo completo en modo
+estricto sin reemplazar caracteres.
+"""
+
+import codecs
+from typing import List, Tuple
+
+import chardet
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EncodingDetector:
+    """Detector de codificación a partir de los primeros bytes del archivo."""
+
+    def __init__(self, sample_size: int = 64 * 1024, fallback_encoding: str = 'latin-1'):
+        self.sample_size = sample_size
+        self.fallback_encoding = fallback_encoding
+        # Codificaciones de un byte aceptadas cuando la muestra no es UTF-8;
+        # cualquier otra propuesta de chardet se descarta a favor del fallback
+        self.single_byte_encodings = {'cp1252', 'iso8859-1', 'iso8859-15'}
+
+    def detect_encoding(self, file_path: str) -> str:
+        """
+        Detecta la codificación del archivo leyendo solo una muestra inicial.
+
+        Args:
+            file_path: Ruta al archivo
+
+        Returns:
+            Nombre de la codificación a usar para abrir el archivo
+        """
+        with open(file_path, 'rb') as file:
+            sample = file.read(self.sample_size)
+        return self.detect_from_bytes(sample)[0]
+
+    def candidate_encodings(self, file_path: str) -> List[str]:
+        """
+        Codificaciones a probar, en orden, para leer el archivo completo.
+
+        Primero la detectada con la muestra, luego UTF-8 y por último el
+        fallback (latin-1 acepta cualquier byte, así que la última siempre
+        decodifica el archivo).
+
+        Args:
+            file_path: Ruta al archivo
+
+        Returns:
+            Lista de codificaciones sin repetir
+        """
+        candidates = [self.detect_encoding(file_path)]
+        names = {codecs.lookup(candidates[0]).name}
+        for encoding in ('utf-8', self.fallback_encoding):
+            name = codecs.lookup(encoding).name
+            if name not in names:
+                candidates.append(encoding)
+                names.add(name)
+        return candidates
+
+    def detect_from_bytes(self, sample: bytes) -> Tuple[str, float]:
+        """
+        Detecta la codificación de una muestra de bytes.
+
+        Orden: BOM UTF-8, UTF-8 válido, chardet (solo codificaciones
+        occidentales de un byte) y por último el fallback.
+
+        Args:
+            sample: Bytes del inicio del archivo
+
+        Returns:
+            Tupla con (codificacion, confianza)
+        """
+        if sample.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig', 1.0
+
+        try:
+            # final=False tolera un carácter multibyte cortado al final de la muestra
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8', 1.0
+        except UnicodeDecodeError:
+            pass
+
+        result = chardet.detect(sample)
+        encoding = result.get('encoding')
+        confidence = result.get('confidence') or 0.0
+        if encoding:
+            try:
+                if codecs.lookup(encoding).name in self.single_byte_encodings:
+                    return encoding, confidence
+            except LookupError:
+                pass
+
+        logger.debug(f"Codificación no concluyente ({encoding}), usando {self.fallback_encoding}")
+        return self.fallback_encoding, 0.0
+
+
+# Instancia global del detector
+encoding_detector = EncodingDetector()
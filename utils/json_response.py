@@ -0,0 +1,28 @@
+"""
+Respuesta JSON con serializador rápido.
+
+Usa orjson si está instalado; si no, un JSONEncoder de la librería estándar
+con la misma configuración que Starlette. El serializador se elige una sola
+vez al importar el módulo.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    dumps = orjson.dumps
+except ImportError:
+    _JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+    
+    def dumps(content: Any) -> bytes:
+        return _JSON_ENCODER.encode(content).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Respuesta JSON que usa el serializador del módulo."""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,101 @@
+"""
+Respuestas ZIP generadas mientras se transmiten.
+
+Los endpoints que devuelven varios archivos los empaquetan bloque a bloque
+directamente en la respuesta, sin escribir el ZIP en disco. El directorio
+temporal de la petición se elimina en segundo plano al terminar el envío.
+
+Por defecto los archivos se guardan sin comprimir. Con ZIP_COMPRESSLEVEL
+configurado, los CSV y TXT se comprimen con deflate a ese nivel; los demás
+(xlsx, docx) ya vienen comprimidos y se guardan tal cual.
+"""
+
+import io
+import os
+import shutil
+import zipfile
+from typing import Iterator, List
+
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from config.settings import ZIP_COMPRESSLEVEL
+
+# Tamaño de los bloques leídos de cada archivo al armar el ZIP
+TAMANO_BLOQUE_ZIP = 1024 * 1024  # 1 MB
+
+# Extensiones de texto que vale la pena comprimir dentro del ZIP
+EXTENSIONES_COMPRIMIBLES = {".csv", ".txt"}
+
+
+class BufferZip(io.RawIOBase):
+    """Destino no posicionable para ZipFile: acumula lo escrito hasta vaciarlo"""
+
+    def __init__(self):
+        self._partes = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, datos) -> int:
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def vaciar(self) -> bytes:
+        datos = b"".join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+def _abrir_miembro(zipf: zipfile.ZipFile, archivo: str):
+    """Abre el miembro del ZIP para escritura, con deflate solo para archivos de texto"""
+    nombre = os.path.basename(archivo)
+    extension = os.path.splitext(archivo)[1].lower()
+    if zipf.compression == zipfile.ZIP_DEFLATED and extension in EXTENSIONES_COMPRIMIBLES:
+        # Abierto por nombre, el miembro toma la compresión y el nivel del
+        # ZipFile. Sin tamaño conocido de antemano, zip64 se fuerza con el
+        # mismo margen que usa zipfile cuando lo conoce
+        zip64 = os.path.getsize(archivo) * 1.05 > zipfile.ZIP64_LIMIT
+        return zipf.open(nombre, "w", force_zip64=zip64)
+    # Los demás (xlsx, docx) ya vienen comprimidos: se guardan tal cual
+    return zipf.open(zipfile.ZipInfo.from_file(archivo, nombre), "w")
+
+
+def iterar_zip(archivos: List[str]) -> Iterator[bytes]:
+    """
+    Genera un ZIP (zip64) con los archivos indicados bloque a bloque, sin
+    escribirlo completo en disco ni en memoria.
+
+    Como el destino no es posicionable, zipfile escribe descriptores de
+    datos al final de cada miembro en lugar de volver a la cabecera.
+    """
+    buffer = BufferZip()
+    compresion = zipfile.ZIP_DEFLATED if ZIP_COMPRESSLEVEL is not None else zipfile.ZIP_STORED
+    with zipfile.ZipFile(
+        buffer, "w", compresion, allowZip64=True, compresslevel=ZIP_COMPRESSLEVEL
+    ) as zipf:
+        for archivo in archivos:
+            with open(archivo, "rb") as origen, _abrir_miembro(zipf, archivo) as destino:
+                while bloque := origen.read(TAMANO_BLOQUE_ZIP):
+                    destino.write(bloque)
+                    yield buffer.vaciar()
+            yield buffer.vaciar()
+    yield buffer.vaciar()
+
+
+def eliminar_directorio(temp_dir: str) -> None:
+    """Elimina el directorio temporal de una petición y todo su contenido"""
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def respuesta_zip(archivos: List[str], nombre_zip: str, temp_dir: str) -> StreamingResponse:
+    """
+    Envía los archivos como un ZIP generado mientras se transmite.
+    El directorio temporal se elimina en segundo plano al terminar el envío.
+    """
+    return StreamingResponse(
+        iterar_zip(archivos),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{nombre_zip}"'},
+        background=BackgroundTask(eliminar_directorio, temp_dir),
+    )